@@ -4,6 +4,8 @@ Supabase SQL schema (run in Supabase SQL editor)
 -- Enable UUID generation
 create extension if not exists pgcrypto;
 
+-- issue_trending_score(), used by issues.trending_score, is defined in schema.sql.
+
 create table if not exists public.issues (
   id text primary key,
   title text not null,
@@ -27,12 +29,36 @@ create table if not exists public.issues (
   resolution_confirmations integer not null default 0,
   resolved_at timestamptz,
   resolved_by text check (resolved_by in ('community','reporter','official')),
-  metadata jsonb not null default '{}'::jsonb
+  district text,
+  metadata jsonb not null default '{}'::jsonb,
+  version bigint not null default 0,
+  counts_version bigint not null default 0,
+  trending_score double precision generated always as (
+    public.issue_trending_score(upvotes, comment_count, severity_score, created_at)
+  ) stored
 );
 
+-- Added after the first release; brings older databases up to date.
+alter table public.issues add column if not exists district text;
+alter table public.issues add column if not exists version bigint not null default 0;
+alter table public.issues add column if not exists counts_version bigint not null default 0;
+alter table public.issues add column if not exists trending_score double precision generated always as (
+  public.issue_trending_score(upvotes, comment_count, severity_score, created_at)
+) stored;
+
+-- schema.sql also backfills district on older rows (nearest centroid, as district_for()).
+
 create index if not exists idx_issues_status on public.issues(status);
 create index if not exists idx_issues_created_at on public.issues(created_at desc);
 create index if not exists idx_issues_category on public.issues(category);
+create index if not exists idx_issues_upvotes on public.issues(upvotes desc);
+create index if not exists idx_issues_status_upvotes on public.issues(status, upvotes desc);
+create index if not exists idx_issues_district_status_upvotes on public.issues(district, status, upvotes desc);
+create index if not exists idx_issues_resolved_at on public.issues(resolved_at);
+create index if not exists idx_issues_version on public.issues(version);
+create index if not exists idx_issues_counts_version on public.issues(counts_version);
+create index if not exists idx_issues_trending on public.issues(trending_score desc);
+create index if not exists idx_issues_status_trending on public.issues(status, trending_score desc);
 
 create table if not exists public.issue_votes (
   id uuid primary key default gen_random_uuid(),
@@ -59,13 +85,22 @@ create table if not exists public.comments (
   author text not null default 'Anonymous',
   is_anonymous boolean not null default true,
   session_hash text,
-  created_at timestamptz not null default now()
+  created_at timestamptz not null default now(),
+  version bigint not null default 0
 );
 
+alter table public.comments add column if not exists version bigint not null default 0;
+
 create index if not exists idx_comments_issue_id on public.comments(issue_id);
 create index if not exists idx_comments_created_at on public.comments(created_at desc);
+create index if not exists idx_comments_version on public.comments(version);
+
+-- Analytics functions (issue_trends, issue_resolution_times,
+-- top_open_issues_by_district), the change_seq triggers that stamp
+-- version/counts_version for /api/changes and current_change_version()
+-- are defined in schema.sql.
 
--- Optional read-only contacts table if you want DB-backed contacts/hotlines.
+-- Emergency contacts for /api/contacts (the built-in list is served while it is empty).
 create table if not exists public.emergency_contacts (
   id text primary key,
   organization text not null,
@@ -74,35 +109,61 @@ create table if not exists public.emergency_contacts (
   service_type text not null check (service_type in ('police','medical','utilities','government')),
   is_247 boolean not null default false
 );
+
+create index if not exists idx_emergency_contacts_district_type on public.emergency_contacts(district, service_type);
+create index if not exists idx_emergency_contacts_service_type on public.emergency_contacts(service_type);
 """
 
 from __future__ import annotations
 
+import bisect
+import contextvars
+import cProfile
+import csv
+import gzip
 import hashlib
+import hmac
+import importlib.util
+import io
+import itertools
 import json
+import math
 import os
+import pstats
+import queue
 import random
+import sqlite3
 import threading
+import time
+import uuid
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
 from copy import deepcopy
-from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from dotenv import load_dotenv
-from flask import Flask, jsonify, request
+from flask import Flask, Response, g, has_request_context, jsonify, request, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from sortedcontainers import SortedList
 
 # Load environment variables from .env file
 load_dotenv()
 
 try:
-    from supabase import create_client
+    import orjson
 except Exception:
-    create_client = None
+    orjson = None
 
 try:
-    import google.generativeai as genai
+    import brotli
 except Exception:
-    genai = None
+    brotli = None
 
 
 GEMINI_PROMPT = (
@@ -131,23 +192,232 @@ _demo_mode_override: Optional[bool] = None
 _demo_lock = threading.Lock()
 
 
-def is_demo_mode() -> bool:
+def demo_mode_override() -> Optional[bool]:
+    # Under multiple workers the switch lives in SharedState so it flips every process.
+    shared = SHARED_STATE.get()
+    if shared is not None:
+        return shared.setting("demo_mode_override")
     with _demo_lock:
-        if _demo_mode_override is not None:
-            return _demo_mode_override
-    return DEMO_MODE_ENV_DEFAULT
+        return _demo_mode_override
+
+
+def is_demo_mode() -> bool:
+    override = demo_mode_override()
+    return DEMO_MODE_ENV_DEFAULT if override is None else override
 
 
 def set_demo_mode_override(enabled: Optional[bool]) -> None:
     global _demo_mode_override
+    shared = SHARED_STATE.get()
+    if shared is not None:
+        shared.set_setting("demo_mode_override", enabled)
+        return
     with _demo_lock:
         _demo_mode_override = enabled
 
 
+class Lazy:
+    """A value built on first ``get()`` rather than at import.
+
+    Keeps cold starts cheap: heavy SDK imports, client construction and the
+    demo data copy only happen once a request actually needs them. Safe to
+    call from any thread; the factory runs at most once.
+    """
+
+    def __init__(self, factory: Callable[[], Any]) -> None:
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._value: Any = None
+        self.loaded = False
+
+    def get(self) -> Any:
+        if not self.loaded:
+            with self._lock:
+                if not self.loaded:
+                    self._value = self._factory()
+                    self.loaded = True
+        return self._value
+
+
 def now_iso() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
 
+class Metrics:
+    """Process-local counters, histograms and gauges.
+
+    ``render()`` produces the Prometheus text exposition format served by
+    /api/metrics. Gauges are callbacks evaluated at scrape time so store
+    sizes are never tracked on the hot path.
+    """
+
+    BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._meta: Dict[str, Tuple[str, str]] = {}
+        self._counters: Dict[str, Dict[Tuple[Tuple[str, str], ...], float]] = {}
+        self._histograms: Dict[str, Dict[Tuple[Tuple[str, str], ...], List[float]]] = {}
+        self._gauges: Dict[str, Any] = {}
+
+    def describe(self, name: str, kind: str, help_text: str) -> None:
+        self._meta[name] = (kind, help_text)
+
+    def inc(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        idx = bisect.bisect_left(self.BUCKETS, value)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            # Per-bucket counts, then sum and count.
+            state = series.get(key)
+            if state is None:
+                state = series[key] = [0.0] * (len(self.BUCKETS) + 3)
+            state[idx] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    @contextmanager
+    def timer(self, name: str, **labels: Any) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def gauge(self, name: str, fn: Any) -> None:
+        """Register ``fn`` returning a number or a ``{labels_dict_items: value}`` mapping."""
+        self._gauges[name] = fn
+
+    @staticmethod
+    def _labels(key: Tuple[Tuple[str, str], ...], extra: str = "") -> str:
+        parts = [f'{k}="{v}"' for k, v in key]
+        if extra:
+            parts.append(extra)
+        return "{" + ",".join(parts) + "}" if parts else ""
+
+    def render(self) -> str:
+        lines: List[str] = []
+
+        def header(name: str, default_kind: str) -> None:
+            kind, help_text = self._meta.get(name, (default_kind, ""))
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            counters = {n: dict(s) for n, s in self._counters.items()}
+            histograms = {n: {k: list(v) for k, v in s.items()} for n, s in self._histograms.items()}
+
+        for name, series in sorted(counters.items()):
+            header(name, "counter")
+            for key, value in series.items():
+                lines.append(f"{name}{self._labels(key)} {value:g}")
+
+        for name, series in sorted(histograms.items()):
+            header(name, "histogram")
+            for key, state in series.items():
+                cumulative = 0.0
+                for bound, count in zip(self.BUCKETS, state):
+                    cumulative += count
+                    le = self._labels(key, 'le="%g"' % bound)
+                    lines.append(f"{name}_bucket{le} {cumulative:g}")
+                cumulative += state[len(self.BUCKETS)]
+                le = self._labels(key, 'le="+Inf"')
+                lines.append(f"{name}_bucket{le} {cumulative:g}")
+                lines.append(f"{name}_sum{self._labels(key)} {state[-2]:.6f}")
+                lines.append(f"{name}_count{self._labels(key)} {state[-1]:g}")
+
+        for name, fn in sorted(self._gauges.items()):
+            try:
+                value = fn()
+            except Exception:
+                continue
+            header(name, "gauge")
+            if isinstance(value, dict):
+                for key, v in value.items():
+                    lines.append(f"{name}{self._labels(tuple(key))} {v:g}")
+            else:
+                lines.append(f"{name} {value:g}")
+
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
+METRICS.describe("http_requests_total", "counter", "HTTP requests by route, method and status.")
+METRICS.describe("http_request_duration_seconds", "histogram", "Time to produce a response, per route.")
+METRICS.describe("dependency_call_duration_seconds", "histogram", "Outbound call latency (Supabase, Gemini).")
+METRICS.describe("dependency_errors_total", "counter", "Outbound calls that raised.")
+METRICS.describe("lock_wait_seconds", "histogram", "Time spent waiting to acquire store locks.")
+METRICS.describe("analytics_cache_total", "counter", "Analytics cache lookups by result (hit/miss).")
+METRICS.describe("cache_requests_total", "counter", "Cache lookups by cache and result.")
+METRICS.describe("votes_total", "counter", "Upvotes and resolve votes, split by duplicate.")
+METRICS.describe("photo_classifications_total", "counter", "Per-photo Gemini classifications by result (ok/failed/timeout).")
+
+
+MAX_SPANS_PER_REQUEST = 200
+
+
+def record_span(name: str, started: float, duration: float, **attrs: Any) -> None:
+    """Attach a timing span to the current request's trace (no-op outside a request)."""
+    if not has_request_context():
+        return
+    spans = g.get("spans")
+    if spans is None or len(spans) >= MAX_SPANS_PER_REQUEST:
+        return
+    origin = g.get("request_started", started)
+    spans.append(
+        {"name": name, "startMs": round((started - origin) * 1000, 3), "durationMs": round(duration * 1000, 3), **attrs}
+    )
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, start, time.perf_counter() - start, **attrs)
+
+
+@contextmanager
+def track_dependency(dependency: str, operation: str) -> Iterator[None]:
+    start = time.perf_counter()
+    error = False
+    try:
+        yield
+    except Exception:
+        error = True
+        METRICS.inc("dependency_errors_total", dependency=dependency, operation=operation)
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        METRICS.observe("dependency_call_duration_seconds", duration, dependency=dependency, operation=operation)
+        record_span(f"{dependency}.{operation}", start, duration, error=error)
+
+
+OUTBOUND_WORKERS = int(os.getenv("OUTBOUND_WORKERS", "16"))
+OUTBOUND_POOL = Lazy(lambda: ThreadPoolExecutor(max_workers=OUTBOUND_WORKERS, thread_name_prefix="civiclens-outbound"))
+
+
+def run_concurrently(calls: Dict[str, Callable[[], Any]]) -> Dict[str, Any]:
+    """Run independent backend calls on the outbound pool; results by name.
+
+    Each call runs in a copy of the caller's context, so its dependency
+    spans still land in the current request's trace. The first exception
+    is re-raised once every call has finished.
+    """
+    pool = OUTBOUND_POOL.get()
+    futures = {name: pool.submit(contextvars.copy_context().run, fn) for name, fn in calls.items()}
+    wait(futures.values())
+    return {name: future.result() for name, future in futures.items()}
+
+
 def normalize_category(value: str) -> str:
     mapping = {
         "pothole": "potholes",
@@ -168,39 +438,147 @@ def normalize_category(value: str) -> str:
     return mapping.get(key, "other")
 
 
-def to_issue_shape(row: Dict[str, Any]) -> Dict[str, Any]:
-    coords = None
-    lat = row.get("lat")
-    lng = row.get("lng")
-    if lat is not None and lng is not None:
-        coords = {"lat": lat, "lng": lng}
+# Approximate centroids of Sri Lanka's 25 administrative districts.
+DISTRICT_CENTROIDS: Tuple[Tuple[str, float, float], ...] = (
+    ("Colombo", 6.927, 79.861), ("Gampaha", 7.091, 79.999), ("Kalutara", 6.585, 79.960),
+    ("Kandy", 7.291, 80.636), ("Matale", 7.467, 80.623), ("Nuwara Eliya", 6.970, 80.783),
+    ("Galle", 6.053, 80.221), ("Matara", 5.949, 80.546), ("Hambantota", 6.124, 81.119),
+    ("Jaffna", 9.662, 80.025), ("Kilinochchi", 9.380, 80.400), ("Mannar", 8.977, 79.904),
+    ("Vavuniya", 8.751, 80.498), ("Mullaitivu", 9.267, 80.814), ("Batticaloa", 7.731, 81.674),
+    ("Ampara", 7.298, 81.672), ("Trincomalee", 8.587, 81.215), ("Kurunegala", 7.487, 80.365),
+    ("Puttalam", 8.036, 79.828), ("Anuradhapura", 8.311, 80.403), ("Polonnaruwa", 7.940, 81.000),
+    ("Badulla", 6.990, 81.055), ("Monaragala", 6.873, 81.350), ("Ratnapura", 6.683, 80.399),
+    ("Kegalle", 7.251, 80.346),
+)
 
-    created_at = row.get("created_at") or now_iso()
-    resolved_at = row.get("resolved_at")
 
-    return {
-        "id": row.get("id"),
-        "title": row.get("title", ""),
-        "description": row.get("description", ""),
-        "category": row.get("category", "other"),
-        "severity": row.get("severity", "medium"),
-        "status": row.get("status", "open"),
-        "location": row.get("location", ""),
-        "coordinates": coords,
-        "photos": row.get("photos", []) or [],
-        "upvotes": int(row.get("upvotes", 0) or 0),
-        "commentCount": int(row.get("comment_count", 0) or 0),
-        "reporter": row.get("reporter", "Anonymous"),
-        "isAnonymous": bool(row.get("is_anonymous", True)),
-        "createdAt": created_at,
-        "aiConfidence": row.get("ai_confidence"),
-        "aiCategory": row.get("ai_category"),
-        "severityScore": row.get("severity_score"),
-        "severityText": row.get("severity_text"),
-        "resolutionConfirmations": int(row.get("resolution_confirmations", 0) or 0),
-        "resolvedAt": resolved_at,
-        "resolvedBy": row.get("resolved_by"),
-    }
+def district_for(lat: Optional[float], lng: Optional[float]) -> Optional[str]:
+    """Nearest district centroid to a point, or None without coordinates."""
+    if lat is None or lng is None:
+        return None
+    return min(DISTRICT_CENTROIDS, key=lambda d: (d[1] - lat) ** 2 + (d[2] - lng) ** 2)[0]
+
+
+ISSUE_COLUMNS = (
+    "id", "title", "description", "category", "severity", "status", "location", "lat", "lng",
+    "photos", "upvotes", "comment_count", "reporter", "is_anonymous", "created_at", "ai_confidence",
+    "ai_category", "severity_score", "severity_text", "resolution_confirmations", "resolved_at", "resolved_by",
+    "district",
+)
+
+
+class Issue:
+    """Compact issue record shared by every repository.
+
+    Attributes mirror the ``issues`` table columns. ``__slots__`` keeps each
+    cached issue a fixed-size object rather than a 21-key dict, and the JSON
+    provider calls ``to_dict()`` while encoding, so list responses are
+    written straight from these objects.
+    """
+
+    __slots__ = ISSUE_COLUMNS
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "Issue":
+        get = row.get
+        issue = cls.__new__(cls)
+        issue.id = get("id")
+        issue.title = get("title", "")
+        issue.description = get("description", "")
+        issue.category = get("category", "other")
+        issue.severity = get("severity", "medium")
+        issue.status = get("status", "open")
+        issue.location = get("location", "")
+        issue.lat = get("lat")
+        issue.lng = get("lng")
+        issue.photos = get("photos") or []
+        issue.upvotes = int(get("upvotes") or 0)
+        issue.comment_count = int(get("comment_count") or 0)
+        issue.reporter = get("reporter", "Anonymous")
+        issue.is_anonymous = bool(get("is_anonymous", True))
+        issue.created_at = get("created_at") or now_iso()
+        issue.ai_confidence = get("ai_confidence")
+        issue.ai_category = get("ai_category")
+        issue.severity_score = get("severity_score")
+        issue.severity_text = get("severity_text")
+        issue.resolution_confirmations = int(get("resolution_confirmations") or 0)
+        issue.resolved_at = get("resolved_at")
+        issue.resolved_by = get("resolved_by")
+        issue.district = get("district") or district_for(issue.lat, issue.lng)
+        return issue
+
+    @classmethod
+    def from_api(cls, data: Dict[str, Any]) -> "Issue":
+        """Build from the camelCase API shape (mock data, request payloads)."""
+        coords = data.get("coordinates") or {}
+        return cls.from_row(
+            {
+                "id": data.get("id"),
+                "title": data.get("title", ""),
+                "description": data.get("description", ""),
+                "category": data.get("category", "other"),
+                "severity": data.get("severity", "medium"),
+                "status": data.get("status", "open"),
+                "location": data.get("location", ""),
+                "lat": coords.get("lat"),
+                "lng": coords.get("lng"),
+                "photos": data.get("photos"),
+                "upvotes": data.get("upvotes"),
+                "comment_count": data.get("commentCount"),
+                "reporter": data.get("reporter", "Anonymous"),
+                "is_anonymous": data.get("isAnonymous", True),
+                "created_at": data.get("createdAt"),
+                "ai_confidence": data.get("aiConfidence"),
+                "ai_category": data.get("aiCategory"),
+                "severity_score": data.get("severityScore"),
+                "severity_text": data.get("severityText"),
+                "resolution_confirmations": data.get("resolutionConfirmations"),
+                "resolved_at": data.get("resolvedAt"),
+                "resolved_by": data.get("resolvedBy"),
+                "district": data.get("district"),
+            }
+        )
+
+    def copy(self) -> "Issue":
+        clone = Issue.__new__(Issue)
+        for name in ISSUE_COLUMNS:
+            setattr(clone, name, getattr(self, name))
+        return clone
+
+    @property
+    def coordinates(self) -> Optional[Dict[str, Any]]:
+        if self.lat is None or self.lng is None:
+            return None
+        return {"lat": self.lat, "lng": self.lng}
+
+    def to_row(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in ISSUE_COLUMNS}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "category": self.category,
+            "severity": self.severity,
+            "status": self.status,
+            "location": self.location,
+            "coordinates": self.coordinates,
+            "photos": self.photos,
+            "upvotes": self.upvotes,
+            "commentCount": self.comment_count,
+            "reporter": self.reporter,
+            "isAnonymous": self.is_anonymous,
+            "createdAt": self.created_at,
+            "aiConfidence": self.ai_confidence,
+            "aiCategory": self.ai_category,
+            "severityScore": self.severity_score,
+            "severityText": self.severity_text,
+            "resolutionConfirmations": self.resolution_confirmations,
+            "resolvedAt": self.resolved_at,
+            "resolvedBy": self.resolved_by,
+            "district": self.district,
+        }
 
 
 def to_comment_shape(row: Dict[str, Any]) -> Dict[str, Any]:
@@ -214,6 +592,138 @@ def to_comment_shape(row: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+def to_contact_shape(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": row.get("id"),
+        "organization": row.get("organization", ""),
+        "district": row.get("district", ""),
+        "phone": row.get("phone", ""),
+        "serviceType": row.get("service_type", ""),
+        "is247": bool(row.get("is_247", False)),
+    }
+
+
+def to_comment_row(comment: Dict[str, Any], sid_hash: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "id": comment.get("id"),
+        "issue_id": comment.get("issueId"),
+        "text": comment.get("text", ""),
+        "author": comment.get("author", "Anonymous"),
+        "is_anonymous": bool(comment.get("isAnonymous", True)),
+        "session_hash": sid_hash,
+        "created_at": comment.get("createdAt") or now_iso(),
+    }
+
+
+def parse_iso(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except Exception:
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+# Trending feed weights. public.issue_trending_score in schema.sql uses the same values.
+TRENDING_HALF_LIFE_HOURS = 48
+TRENDING_COMMENT_WEIGHT = 2
+TRENDING_SEVERITY_WEIGHT = 1
+FEED_SORTS = ("upvotes", "recent", "trending")
+
+
+def trending_score(upvotes: Any, comment_count: Any, severity_score: Any, created_epoch: float) -> float:
+    """Time-decayed engagement score for ``sort=trending``.
+
+    Ranking by ``weight * 2 ** (-age / half_life)`` is the same as ranking by
+    ``log2(weight) + created / half_life``, and the latter does not change as
+    time passes. Scores therefore only need recomputing when an issue's own
+    counters change, never across the whole table.
+    """
+    weight = (
+        1
+        + int(upvotes or 0)
+        + TRENDING_COMMENT_WEIGHT * int(comment_count or 0)
+        + TRENDING_SEVERITY_WEIGHT * int(severity_score or 0)
+    )
+    return math.log2(weight) + created_epoch / (TRENDING_HALF_LIFE_HOURS * 3600)
+
+
+def issue_trending_score(upvotes: Any, comment_count: Any, severity_score: Any, created_at: Any) -> float:
+    created = parse_iso(created_at)
+    return trending_score(upvotes, comment_count, severity_score, created.timestamp() if created else 0.0)
+
+
+def build_stats(rows: List[Tuple[Any, Any, Any]]) -> Dict[str, Any]:
+    """Summarise (status, category, resolved_at) tuples into the /api/stats payload."""
+    now = datetime.now(timezone.utc)
+    total_reports = 0
+    active_issues = 0
+    resolved_this_week = 0
+    category_counts: Dict[str, int] = {}
+
+    for status, category, resolved_at in rows:
+        total_reports += 1
+        if status != "resolved":
+            active_issues += 1
+        category = category or "other"
+        category_counts[category] = category_counts.get(category, 0) + 1
+        dt = parse_iso(resolved_at)
+        if dt and (now - dt).days <= 7:
+            resolved_this_week += 1
+
+    # Ties go to the alphabetically first category, the same in every backend.
+    top_category = min(category_counts.items(), key=lambda x: (-x[1], x[0]))[0] if category_counts else "other"
+    return {
+        "totalReports": total_reports,
+        "resolvedThisWeek": resolved_this_week,
+        "activeIssues": active_issues,
+        "topCategory": top_category,
+    }
+
+
+ANALYTICS_BUCKETS = ("day", "week")
+ANALYTICS_GROUPS = ("none", "category", "district")
+
+
+def bucket_start(day: str, bucket: str) -> str:
+    """Map an ISO date to the first day of its bucket (weeks start on Monday)."""
+    if bucket == "day":
+        return day
+    d = datetime.strptime(day, "%Y-%m-%d").date()
+    return (d - timedelta(days=d.weekday())).isoformat()
+
+
+def rollup_trends(
+    created: Iterable[Tuple[Tuple[str, str, str], int]],
+    resolved: Iterable[Tuple[Tuple[str, str, str], int]],
+    bucket: str,
+    group_by: str,
+) -> List[Dict[str, Any]]:
+    """Fold daily (day, category, district) counts into trend rows for ``bucket``/``group_by``."""
+    totals: Dict[Tuple[str, str], List[int]] = {}
+    for column, items in ((0, created), (1, resolved)):
+        for (day, category, district), count in items:
+            key = category if group_by == "category" else district if group_by == "district" else "all"
+            totals.setdefault((bucket_start(day, bucket), key), [0, 0])[column] += count
+    return [
+        {"bucketStart": start, "key": key, "created": c, "resolved": r}
+        for (start, key), (c, r) in sorted(totals.items())
+    ]
+
+
+def summarize_durations(groups: Dict[str, List[float]]) -> List[Dict[str, Any]]:
+    """Median (interpolated) and p90 (nearest rank) hours per group key."""
+    items = []
+    for key in sorted(groups):
+        hours = sorted(groups[key])
+        n = len(hours)
+        median = (hours[(n - 1) // 2] + hours[n // 2]) / 2
+        p90 = hours[-(-9 * n // 10) - 1]
+        items.append({"key": key, "resolved": n, "medianHours": round(median, 2), "p90Hours": round(p90, 2)})
+    return items
+
+
 def round_coordinates(lat: Optional[float], lng: Optional[float]) -> Tuple[Optional[float], Optional[float]]:
     if lat is None or lng is None:
         return None, None
@@ -541,59 +1051,2083 @@ MOCK_NATIONAL_HOTLINES: List[Dict[str, Any]] = [
 ]
 
 
-class DemoStore:
+class RWLock:
+    """Many concurrent readers or a single writer.
+
+    Waiting writers block new readers so a steady stream of reads cannot
+    starve writes. Not reentrant: never nest ``read()``/``write()`` calls.
+    """
+
+    def __init__(self, name: str = "rw") -> None:
+        self.name = name
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    def _record_wait(self, start: float, mode: str) -> None:
+        waited = time.perf_counter() - start
+        METRICS.observe("lock_wait_seconds", waited, lock=self.name, mode=mode)
+        if waited >= 0.0005:
+            record_span(f"lock.{self.name}.{mode}", start, waited)
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        start = time.perf_counter()
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        self._record_wait(start, "read")
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        start = time.perf_counter()
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        self._record_wait(start, "write")
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+class FeedIndex:
+    """Issue ids kept in feed order for every (status, category) partition.
+
+    Each issue sits in four partitions (any/any, status/any, any/category,
+    status/category), each with an ordering per ``FEED_SORTS``, so a
+    filtered top-N request is a slice of a sorted list rather than a sort of
+    the whole store. Ties go to the most recently indexed issue. Trending
+    keys are time-invariant (see ``trending_score``), so re-keying the one
+    issue that changed keeps every ordering current.
+    """
+
     def __init__(self) -> None:
         self.lock = threading.Lock()
-        self.issues = deepcopy(MOCK_ISSUES)
-        self.resolved_issues = deepcopy(MOCK_RESOLVED_ISSUES)
-        self.comments = deepcopy(MOCK_COMMENTS)
-        self.upvote_sessions: set[str] = set()
-        self.resolve_sessions: set[str] = set()
+        self._orders: Dict[Tuple[Optional[str], Optional[str], str], SortedList] = {}
+        self._entries: Dict[str, Tuple[Optional[str], Optional[str], Tuple[Tuple[Any, ...], ...]]] = {}
+        self._seq = 0
+
+    @staticmethod
+    def _partitions(status: Optional[str], category: Optional[str]) -> Tuple[Tuple[Optional[str], Optional[str]], ...]:
+        return ((None, None), (status, None), (None, category), (status, category))
+
+    def _insert(self, issue: Issue, seq: int) -> None:
+        issue_id = issue.id
+        status = issue.status
+        category = issue.category
+        created = parse_iso(issue.created_at)
+        created_epoch = created.timestamp() if created else 0.0
+        trending = trending_score(issue.upvotes, issue.comment_count, issue.severity_score, created_epoch)
+        # One key per FEED_SORTS entry, in that order.
+        keys = ((-issue.upvotes, -seq, issue_id), (-created_epoch, -seq, issue_id), (-trending, -seq, issue_id))
+        for part in self._partitions(status, category):
+            for order, key in zip(FEED_SORTS, keys):
+                self._orders.setdefault(part + (order,), SortedList()).add(key)
+        self._entries[issue_id] = (status, category, keys)
+
+    def _discard(self, issue_id: str) -> Optional[int]:
+        entry = self._entries.pop(issue_id, None)
+        if entry is None:
+            return None
+        status, category, keys = entry
+        for part in self._partitions(status, category):
+            for order, key in zip(FEED_SORTS, keys):
+                self._orders[part + (order,)].discard(key)
+        return -keys[0][1]
+
+    def add(self, issue: Issue) -> None:
+        with self.lock:
+            self._discard(issue.id)
+            self._seq += 1
+            self._insert(issue, self._seq)
+
+    def update(self, issue: Issue) -> None:
+        """Re-key an issue after its votes or comments changed."""
+        with self.lock:
+            seq = self._discard(issue.id)
+            if seq is None:
+                self._seq += 1
+                seq = self._seq
+            self._insert(issue, seq)
+
+    def top(self, status: Optional[str], category: Optional[str], sort_by: str, limit: Optional[int]) -> List[str]:
+        order = sort_by if sort_by in FEED_SORTS else "upvotes"
+        with self.lock:
+            keys = self._orders.get((status, category, order))
+            if not keys:
+                return []
+            return [key[2] for key in keys.islice(0, limit)]
+
+
+class DemoStore:
+    """In-memory store for demo mode.
+
+    ``lock`` guards the structure of the store: which issues exist and the
+    keys of every dict below. Adding or importing issues takes it for
+    writing, and holding it for reading means that structure is stable.
+
+    Each issue owns its comment list, upvoter set, resolve votes and resolve
+    tally, created with the issue under the write lock. Votes and comments
+    change only those containers and the issue's counters, under a read
+    lock plus the issue's stripe lock, so activity on different issues
+    proceeds in parallel and never waits behind list reads. Read an issue's
+    sets and dicts under its stripe too. Comment lists are append-only
+    between writes, so a read lock alone is enough to scan them.
+    """
+
+    STRIPES = 64
+
+    def __init__(self) -> None:
+        self.lock = RWLock("demo_store")
+        self.stripes = [threading.Lock() for _ in range(self.STRIPES)]
+        self.issues_by_id: Dict[str, Issue] = {
+            i["id"]: Issue.from_api(i) for i in MOCK_ISSUES + MOCK_RESOLVED_ISSUES
+        }
+        self.feed = FeedIndex()
+        # Per-issue containers, keyed by issue id (see the class docstring):
+        # comments, upvoting session hashes, session hash -> resolve vote, and
+        # the yes/no resolve tally.
+        self.comments_by_issue: Dict[str, List[Dict[str, Any]]] = {}
+        self.upvote_sessions: Dict[str, set[str]] = {}
+        self.resolve_sessions: Dict[str, Dict[str, str]] = {}
         self.resolve_vote_counts: Dict[str, Dict[str, int]] = {}
+        self.category_counts: Dict[str, int] = {}
+        self.status_counts: Dict[str, int] = {}
+        # Analytics rollups, maintained alongside the counters above:
+        # issues created/resolved per (UTC day, category, district), and every
+        # resolution as (resolved epoch, hours to resolve, category, district, id)
+        # in time order for the resolved-this-week window and median windows.
+        self.created_daily: Dict[Tuple[str, str, str], int] = {}
+        self.resolved_daily: Dict[Tuple[str, str, str], int] = {}
+        self.resolutions: SortedList = SortedList()
+        # Delta sync log for /api/changes: the latest change to each issue,
+        # issue counter set and comment as (version, kind, key). Superseded
+        # entries are dropped, so the log holds one entry per object at most.
+        self.change_lock = threading.Lock()
+        self.change_version = 0
+        self.changes: SortedList = SortedList()
+        self.change_versions: Dict[Tuple[str, Tuple[str, ...]], int] = {}
 
         for issue in self.all_issues():
-            yes_votes = int(issue.get("resolutionConfirmations", 0) or 0)
-            self.resolve_vote_counts[issue.get("id")] = {"yes": yes_votes, "no": 0}
+            self._add_containers(issue)
+            self._track(issue, 1)
+        for comment in deepcopy(MOCK_COMMENTS):
+            if comment["issueId"] in self.issues_by_id:
+                self.comments_by_issue[comment["issueId"]].append(comment)
 
-    def all_issues(self) -> List[Dict[str, Any]]:
-        return self.issues + self.resolved_issues
+        for issue in self.all_issues():
+            self.record_change("issue", issue.id)
+        for issue_id, comments in self.comments_by_issue.items():
+            for comment in comments:
+                self.record_change("comment", issue_id, comment["id"])
+
+        for issue in reversed(self.all_issues()):
+            self.feed.add(issue)
+
+    def all_issues(self) -> List[Issue]:
+        return list(self.issues_by_id.values())
+
+    def find_issue(self, issue_id: str) -> Optional[Issue]:
+        return self.issues_by_id.get(issue_id)
+
+    def stripe(self, issue_id: str) -> threading.Lock:
+        return self.stripes[hash(issue_id) % self.STRIPES]
+
+    @staticmethod
+    def _bump(counts: Dict[Tuple[str, str, str], int], key: Tuple[str, str, str], delta: int) -> None:
+        value = counts.get(key, 0) + delta
+        if value:
+            counts[key] = value
+        else:
+            counts.pop(key, None)
+
+    def _track(self, issue: Issue, delta: int) -> None:
+        category = issue.category
+        status = issue.status
+        district = issue.district or "Unknown"
+        self.category_counts[category] = self.category_counts.get(category, 0) + delta
+        self.status_counts[status] = self.status_counts.get(status, 0) + delta
+        created_at = parse_iso(issue.created_at)
+        if created_at:
+            day = created_at.astimezone(timezone.utc).date().isoformat()
+            self._bump(self.created_daily, (day, category, district), delta)
+        resolved_at = parse_iso(issue.resolved_at)
+        if resolved_at:
+            day = resolved_at.astimezone(timezone.utc).date().isoformat()
+            self._bump(self.resolved_daily, (day, category, district), delta)
+            hours = (resolved_at - created_at).total_seconds() / 3600 if created_at else 0.0
+            entry = (resolved_at.timestamp(), hours, category, district, issue.id)
+            if delta > 0:
+                self.resolutions.add(entry)
+            else:
+                self.resolutions.discard(entry)
+
+    def record_change(self, kind: str, *key: str) -> None:
+        """Stamp ``kind`` ("issue", "counts" or "comment") at ``key`` with the next change version.
+
+        Callers hold ``lock`` (either mode); ``change_lock`` orders the log
+        itself, so vote handlers on different stripes can record concurrently.
+        """
+        with self.change_lock:
+            previous = self.change_versions.get((kind, key))
+            if previous is not None:
+                self.changes.discard((previous, kind, key))
+            self.change_version += 1
+            self.change_versions[(kind, key)] = self.change_version
+            self.changes.add((self.change_version, kind, key))
+
+    # The mutators below expect the caller to hold ``lock`` for writing.
+
+    def _add_containers(self, issue: Issue) -> None:
+        self.comments_by_issue.setdefault(issue.id, [])
+        self.upvote_sessions.setdefault(issue.id, set())
+        self.resolve_sessions.setdefault(issue.id, {})
+        self.resolve_vote_counts[issue.id] = {"yes": issue.resolution_confirmations, "no": 0}
+
+    def add_issue(self, issue: Issue) -> None:
+        """Add or replace an issue; a replaced issue keeps its comments and votes but restarts its resolve tally."""
+        existing = self.issues_by_id.get(issue.id)
+        if existing is not None:
+            self._track(existing, -1)
+        self.issues_by_id[issue.id] = issue
+        self._add_containers(issue)
+        self._track(issue, 1)
+        self.feed.add(issue)
+        self.record_change("issue", issue.id)
+
+    def stats(self) -> Dict[str, Any]:
+        """O(1) /api/stats payload from the maintained counters (caller holds a read lock)."""
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=8)).timestamp()
+        resolved_this_week = len(self.resolutions) - self.resolutions.bisect_right((cutoff, float("inf")))
+        total_reports = len(self.issues_by_id)
+        category_counts = {k: v for k, v in self.category_counts.items() if v > 0}
+        top_category = min(category_counts.items(), key=lambda x: (-x[1], x[0]))[0] if category_counts else "other"
+        return {
+            "totalReports": total_reports,
+            "resolvedThisWeek": resolved_this_week,
+            "activeIssues": total_reports - self.status_counts.get("resolved", 0),
+            "topCategory": top_category,
+        }
 
 
-DEMO_STORE = DemoStore()
+DEMO_STORE = Lazy(DemoStore)
 
 
 SUPABASE_URL = os.getenv("SUPABASE_URL", "")
 SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
 
-supabase = None
-if create_client and SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY:
+
+def sdk_available(module: str) -> bool:
+    """Whether an optional SDK is installed, without paying for its import."""
     try:
-        supabase = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+        return importlib.util.find_spec(module) is not None
     except Exception:
-        supabase = None
+        return False
+
 
-if genai and GEMINI_API_KEY:
+def _create_supabase() -> Any:
+    if not (SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY):
+        return None
     try:
-        genai.configure(api_key=GEMINI_API_KEY)
+        from supabase import create_client
+
+        with span("supabase.init"):
+            return create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
     except Exception:
-        pass
+        return None
 
 
-def classify_image_with_gemini(photo_bytes: bytes, mime_type: str = "image/jpeg") -> Dict[str, Any]:
-    default_result = {
-        "category": "other",
-        "confidence": 0.5,
-        "severity_score": 5,
-        "severity_text": "Severity appears moderate based on visible evidence.",
+def _configure_genai() -> Any:
+    if not GEMINI_API_KEY:
+        return None
+    try:
+        import google.generativeai as genai
+
+        with span("gemini.init"):
+            # REST rather than gRPC, whose blocking calls would stall a gevent worker.
+            genai.configure(api_key=GEMINI_API_KEY, transport="rest")
+        return genai
+    except Exception:
+        return None
+
+
+SUPABASE_CLIENT = Lazy(_create_supabase)
+GENAI = Lazy(_configure_genai)
+
+
+def resolve_tally(issue_id: str, yes: int, no: int, duplicate: bool) -> Dict[str, Any]:
+    return {"issueId": issue_id, "yes": yes, "no": no, "total": yes + no, "duplicate": duplicate}
+
+
+def issue_detail_payload(
+    issue: Issue,
+    comments: List[Dict[str, Any]],
+    comment_limit: int,
+    yes: int,
+    no: int,
+    viewer: Dict[str, Any],
+) -> Dict[str, Any]:
+    """The /api/issues/<id>/full body; ``comments`` may hold one extra to signal another page."""
+    return {
+        "issue": issue,
+        "comments": comments[:comment_limit],
+        "hasMoreComments": len(comments) > comment_limit,
+        "resolveTally": {"issueId": issue.id, "yes": yes, "no": no, "total": yes + no},
+        "viewer": viewer,
     }
-    if not genai or not GEMINI_API_KEY or not photo_bytes:
-        return default_result
+
+
+def count_change(row: Dict[str, Any]) -> Dict[str, Any]:
+    """The counters of an issue row, as sent for vote- and comment-only changes."""
+    return {
+        "issueId": row["id"],
+        "upvotes": int(row["upvotes"] or 0),
+        "commentCount": int(row["comment_count"] or 0),
+        "resolutionConfirmations": int(row["resolution_confirmations"] or 0),
+    }
+
+
+def merge_changes(
+    since: int,
+    limit: int,
+    streams: Dict[str, List[Tuple[int, Any]]],
+    current: Optional[int] = None,
+    reset: bool = False,
+) -> Dict[str, Any]:
+    """Assemble one /api/changes page from per-kind ``(version, item)`` lists.
+
+    Each stream is in version order and holds at most ``limit + 1`` items,
+    so the first ``limit`` of the merged order are exactly the oldest
+    changes overall. The returned ``version`` is the cursor for the next
+    call: the last change included, or ``current`` once the caller is
+    fully caught up.
+    """
+    merged = sorted(
+        ((version, name, item) for name, items in streams.items() for version, item in items), key=lambda c: c[0]
+    )
+    page = merged[:limit]
+    has_more = len(merged) > limit
+    result: Dict[str, Any] = {"version": since, "reset": reset}
+    result.update({name: [] for name in streams})
+    for version, name, item in page:
+        result[name].append(item)
+        result["version"] = version
+    if not has_more and current is not None:
+        result["version"] = current
+    result["hasMore"] = has_more
+    return result
+
+
+# Bulk import/export. Rows use table column names; compound keys order the
+# export so a run can resume after the last key it wrote.
+COMMENT_COLUMNS = ("id", "issue_id", "text", "author", "is_anonymous", "session_hash", "created_at")
+VOTE_COLUMNS = ("issue_id", "session_hash")
+BULK_COLUMNS = {"issues": ISSUE_COLUMNS, "comments": COMMENT_COLUMNS, "votes": VOTE_COLUMNS}
+BULK_TABLES = {"issues": "issues", "comments": "comments", "votes": "issue_votes"}
+BULK_KEYS = {"issues": ("id",), "comments": ("issue_id", "id"), "votes": ("issue_id", "session_hash")}
+BULK_REQUIRED = {"issues": ("id", "title", "description"), "comments": ("id", "issue_id", "text"), "votes": VOTE_COLUMNS}
+BULK_INT_FIELDS = {"upvotes", "comment_count", "ai_confidence", "severity_score", "resolution_confirmations"}
+BULK_FLOAT_FIELDS = {"lat", "lng"}
+BULK_BOOL_FIELDS = {"is_anonymous"}
+BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", "500"))
+BULK_MAX_ERRORS = 20
+CATEGORIES = ("potholes", "streetLights", "garbage", "waterSupply", "roadDamage", "drainage", "publicSafety", "other")
+SEVERITIES = ("low", "medium", "high", "critical")
+STATUSES = ("open", "in-progress", "resolved")
+
+
+def bulk_key(kind: str, row: Dict[str, Any]) -> Tuple[str, ...]:
+    return tuple(row[name] for name in BULK_KEYS[kind])
+
+
+def parse_bulk_key(kind: str, value: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Parse an ``after`` cursor: a plain id for issues, a JSON array for compound keys."""
+    if not value:
+        return None
+    parts = json.loads(value) if value.startswith("[") else [value]
+    if len(parts) != len(BULK_KEYS[kind]):
+        raise ValueError(f"after must have {len(BULK_KEYS[kind])} part(s) for {kind}")
+    return tuple(str(p) for p in parts)
+
+
+def format_bulk_key(key: Tuple[str, ...]) -> str:
+    return key[0] if len(key) == 1 else json.dumps(list(key))
+
+
+def decode_bulk_row(kind: str, raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Coerce an NDJSON object or CSV record into a table row, raising ValueError if invalid."""
+    if not isinstance(raw, dict):
+        raise ValueError("expected an object")
+    row: Dict[str, Any] = {}
+    for name in BULK_COLUMNS[kind]:
+        value = raw.get(name)
+        if value == "":
+            value = None
+        if value is not None:
+            if name in BULK_INT_FIELDS:
+                value = int(float(value))
+            elif name in BULK_FLOAT_FIELDS:
+                value = float(value)
+            elif name in BULK_BOOL_FIELDS and not isinstance(value, bool):
+                value = str(value).strip().lower() in ("true", "t", "1", "yes")
+            elif name == "photos" and isinstance(value, str):
+                value = json.loads(value)
+        row[name] = value
+    missing = [name for name in BULK_REQUIRED[kind] if not row.get(name)]
+    if missing:
+        raise ValueError(f"missing {', '.join(missing)}")
+    if kind == "comments":
+        row["author"] = row["author"] or "Anonymous"
+        row["is_anonymous"] = True if row["is_anonymous"] is None else row["is_anonymous"]
+        row["created_at"] = row["created_at"] or now_iso()
+    if kind != "issues":
+        return row
+
+    if row["category"] not in CATEGORIES:
+        row["category"] = normalize_category(row["category"] or "other")
+    if row["severity"] not in (None, *SEVERITIES):
+        raise ValueError(f"invalid severity {row['severity']!r}")
+    if row["status"] not in (None, *STATUSES):
+        raise ValueError(f"invalid status {row['status']!r}")
+    if row["resolved_by"] not in (None, "community", "reporter", "official"):
+        raise ValueError(f"invalid resolved_by {row['resolved_by']!r}")
+    # Fill defaults for omitted columns the same way stored rows are read.
+    return Issue.from_row({k: v for k, v in row.items() if v is not None}).to_row()
+
+
+def encode_csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, separators=(",", ":"))
+    return value
+
+
+def iter_bulk_records(lines: Iterable[str], fmt: str) -> Iterator[Any]:
+    """Yield raw records from NDJSON or CSV text lines.
+
+    NDJSON lines are yielded undecoded so a malformed line only skips that
+    row. The CSV reader pulls exactly the lines each record needs, which lets
+    callers track byte offsets for checkpoints.
+    """
+    if fmt == "csv":
+        yield from csv.DictReader(lines)
+        return
+    for line in lines:
+        if line.strip():
+            yield line
+
+
+def iter_bulk_export(kind: str, rows: Iterable[Dict[str, Any]], fmt: str, header: bool = True) -> Iterator[str]:
+    """Encode exported rows as NDJSON or CSV text, one chunk per batch."""
+    columns = BULK_COLUMNS[kind]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer and header:
+        writer.writerow(columns)
+    pending = 0
+    for row in rows:
+        if writer:
+            writer.writerow([encode_csv_value(row.get(name)) for name in columns])
+        else:
+            buffer.write(app.json.dumps(row))
+            buffer.write("\n")
+        pending += 1
+        if pending >= BULK_BATCH_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def import_bulk(
+    repo: "IssueRepository",
+    kind: str,
+    records: Iterable[Any],
+    batch_size: int = BULK_BATCH_SIZE,
+    on_batch: Optional[Any] = None,
+) -> Dict[str, Any]:
+    """Decode ``records`` and upsert them in batches, skipping rows that fail.
+
+    A batch that the backend rejects is retried row by row, so one bad row
+    (say, a comment on an unknown issue) does not lose the rest. ``on_batch``
+    is called with the running summary after each batch is committed.
+    """
+    summary: Dict[str, Any] = {"kind": kind, "rows": 0, "imported": 0, "skipped": 0, "errors": [], "lastKey": None}
+    batch: List[Tuple[int, Dict[str, Any]]] = []
+
+    def skip(row_number: int, exc: Exception) -> None:
+        summary["skipped"] += 1
+        if len(summary["errors"]) < BULK_MAX_ERRORS:
+            summary["errors"].append(f"row {row_number}: {exc}")
+
+    def flush() -> None:
+        if not batch:
+            return
+        try:
+            repo.import_rows(kind, [row for _, row in batch])
+            summary["imported"] += len(batch)
+            summary["lastKey"] = format_bulk_key(bulk_key(kind, batch[-1][1]))
+        except Exception:
+            for row_number, row in batch:
+                try:
+                    repo.import_rows(kind, [row])
+                    summary["imported"] += 1
+                    summary["lastKey"] = format_bulk_key(bulk_key(kind, row))
+                except Exception as exc:
+                    skip(row_number, exc)
+        batch.clear()
+        if on_batch:
+            on_batch(summary)
+
+    for record in records:
+        summary["rows"] += 1
+        try:
+            raw = json.loads(record) if isinstance(record, str) else record
+            batch.append((summary["rows"], decode_bulk_row(kind, raw)))
+        except (ValueError, TypeError) as exc:
+            skip(summary["rows"], exc)
+            continue
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+    return summary
+
+
+ISSUE_ID_ATTEMPTS = 8
+
+
+def new_issue_id() -> str:
+    return f"CL-{datetime.now(timezone.utc).year}-{str(random.randint(1, 9999)).zfill(4)}"
+
+
+class IssueIdTaken(Exception):
+    """``insert_issue`` found an existing issue with the same id."""
+
+
+class IssueRepository(ABC):
+    """Storage operations behind the API handlers.
+
+    Issues are passed around as ``Issue`` records; votes, comments and stats
+    use API-shaped dicts (camelCase keys). Handlers never need to know which
+    backend is serving the request.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def list_issues(
+        self,
+        status: Optional[str] = None,
+        category: Optional[str] = None,
+        sort_by: str = "upvotes",
+        limit: Optional[int] = None,
+    ) -> List[Issue]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_issue(self, issue_id: str) -> Optional[Issue]:
+        raise NotImplementedError
+
+    def create_issue(self, issue: Issue) -> Issue:
+        """Store a new report under a freshly allocated id, which replaces ``issue.id``.
+
+        Ids are random, so every backend retries through ``insert_issue``
+        until one is free rather than overwriting or failing on a collision.
+        """
+        for _ in range(ISSUE_ID_ATTEMPTS):
+            issue.id = new_issue_id()
+            try:
+                return self.insert_issue(issue)
+            except IssueIdTaken:
+                continue
+        raise RuntimeError(f"no free issue id after {ISSUE_ID_ATTEMPTS} attempts")
+
+    @abstractmethod
+    def insert_issue(self, issue: Issue) -> Issue:
+        """Store ``issue`` under its own id; raise ``IssueIdTaken`` if that id is already used."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def upvote(self, issue_id: str, sid_hash: str) -> Optional[Dict[str, Any]]:
+        """Return ``{"issueId", "upvotes", "duplicate"}`` or None if the issue is unknown."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def resolve_vote(self, issue_id: str, sid_hash: str, vote: str) -> Optional[Dict[str, Any]]:
+        """Return the yes/no tally after voting, or None if the issue is unknown."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_comments(self, issue_id: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Comments on an issue, newest first."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def resolve_counts(self, issue_id: str) -> Tuple[int, int]:
+        """The (yes, no) resolve-vote tally."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def vote_state(self, issue_id: str, sid_hash: str) -> Dict[str, Any]:
+        """``{"upvoted", "resolveVote"}`` for one session; resolveVote is "yes", "no" or None."""
+        raise NotImplementedError
+
+    def issue_detail(self, issue_id: str, sid_hash: str, comment_limit: int) -> Optional[Dict[str, Any]]:
+        """Everything the issue page shows, or None if the issue is unknown.
+
+        Local backends answer each part in microseconds, so this runs them in
+        turn; the Supabase backend overrides it to overlap the round trips.
+        """
+        issue = self.get_issue(issue_id)
+        if issue is None:
+            return None
+        comments = self.list_comments(issue_id, comment_limit + 1)
+        yes, no = self.resolve_counts(issue_id)
+        return issue_detail_payload(issue, comments, comment_limit, yes, no, self.vote_state(issue_id, sid_hash))
+
+    @abstractmethod
+    def add_comment(self, comment: Dict[str, Any], sid_hash: str) -> Optional[Dict[str, Any]]:
+        """Store a comment and bump the issue's comment count; None if the issue is unknown."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_contacts(self) -> List[Dict[str, Any]]:
+        """Every emergency contact; the built-in list while the table is empty."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def trends(self, bucket: str, since: datetime, group_by: str) -> List[Dict[str, Any]]:
+        """Issues created and resolved per ``bucket`` and group key since ``since``.
+
+        Rows are ``{"bucketStart", "key", "created", "resolved"}`` ordered by
+        bucket then key; ``group_by`` is one of ``ANALYTICS_GROUPS``.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def resolution_times(self, since: datetime, group_by: str) -> List[Dict[str, Any]]:
+        """Median and p90 hours to resolve per group key, for issues resolved since ``since``."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def top_open_by_district(self, per_district: int) -> Dict[str, List[Issue]]:
+        """The most upvoted unresolved issues in each district."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def changes_since(self, since: int, limit: int) -> Dict[str, Any]:
+        """Issues, counter updates and comments changed after change version ``since``.
+
+        ``issues`` holds issues whose content changed (with their current
+        counters), ``counts`` the counters of issues that only gained votes or
+        comments, and ``comments`` new comments; see ``merge_changes``.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def export_rows(self, kind: str, after: Optional[Tuple[str, ...]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield every ``kind`` row (see ``BULK_COLUMNS``) in key order, starting after ``after``."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def import_rows(self, kind: str, rows: List[Dict[str, Any]]) -> None:
+        """Upsert decoded rows in one batch.
+
+        Issue counters (upvotes, comment_count) are taken from the imported
+        issue rows; importing comments or votes does not bump them again.
+        """
+        raise NotImplementedError
+
+
+class InMemoryIssueRepository(IssueRepository):
+    name = "memory"
+
+    def __init__(self, store: DemoStore) -> None:
+        self.store = store
+
+    def list_issues(self, status=None, category=None, sort_by="upvotes", limit=None):
+        with self.store.lock.read():
+            with span("feed.top"):
+                ids = self.store.feed.top(status, category, sort_by, limit)
+            with span("store.copy", count=len(ids)):
+                return [self.store.issues_by_id[issue_id].copy() for issue_id in ids]
+
+    def get_issue(self, issue_id):
+        with self.store.lock.read():
+            issue = self.store.find_issue(issue_id)
+            return issue.copy() if issue else None
+
+    def insert_issue(self, issue):
+        stored = issue.copy()
+        with self.store.lock.write():
+            # add_issue replaces, which only bulk import wants.
+            if issue.id in self.store.issues_by_id:
+                raise IssueIdTaken(issue.id)
+            self.store.add_issue(stored)
+        return issue
+
+    def upvote(self, issue_id, sid_hash):
+        with self.store.lock.read(), self.store.stripe(issue_id):
+            issue = self.store.find_issue(issue_id)
+            if not issue:
+                return None
+            upvoters = self.store.upvote_sessions[issue_id]
+            if sid_hash in upvoters:
+                return {"issueId": issue_id, "upvotes": issue.upvotes, "duplicate": True}
+            upvoters.add(sid_hash)
+            issue.upvotes += 1
+            self.store.feed.update(issue)
+            self.store.record_change("counts", issue_id)
+            return {"issueId": issue_id, "upvotes": issue.upvotes, "duplicate": False}
+
+    def resolve_vote(self, issue_id, sid_hash, vote):
+        with self.store.lock.read(), self.store.stripe(issue_id):
+            issue = self.store.find_issue(issue_id)
+            if not issue:
+                return None
+
+            counts = self.store.resolve_vote_counts[issue_id]
+            voters = self.store.resolve_sessions[issue_id]
+            if sid_hash in voters:
+                return resolve_tally(issue_id, counts["yes"], counts["no"], True)
+
+            voters[sid_hash] = vote
+            counts[vote] = int(counts.get(vote, 0)) + 1
+            issue.resolution_confirmations = counts["yes"]
+            if vote == "yes":
+                self.store.record_change("counts", issue_id)
+            return resolve_tally(issue_id, counts["yes"], counts["no"], False)
+
+    def list_comments(self, issue_id, limit=None):
+        with self.store.lock.read():
+            comments = sorted(
+                self.store.comments_by_issue.get(issue_id, []), key=lambda c: c.get("createdAt", ""), reverse=True
+            )
+            return deepcopy(comments[:limit])
+
+    def resolve_counts(self, issue_id):
+        with self.store.lock.read(), self.store.stripe(issue_id):
+            counts = self.store.resolve_vote_counts.get(issue_id, {"yes": 0, "no": 0})
+            return counts["yes"], counts["no"]
+
+    def vote_state(self, issue_id, sid_hash):
+        with self.store.lock.read(), self.store.stripe(issue_id):
+            return {
+                "upvoted": sid_hash in self.store.upvote_sessions.get(issue_id, ()),
+                "resolveVote": self.store.resolve_sessions.get(issue_id, {}).get(sid_hash),
+            }
+
+    def list_contacts(self):
+        return deepcopy(MOCK_EMERGENCY_CONTACTS)
+
+    def add_comment(self, comment, sid_hash):
+        issue_id = comment.get("issueId")
+        stored = deepcopy(comment)
+        with self.store.lock.read(), self.store.stripe(issue_id):
+            issue = self.store.find_issue(issue_id)
+            if issue is None:
+                return None
+            self.store.comments_by_issue[issue_id].append(stored)
+            self.store.record_change("comment", issue_id, stored.get("id"))
+            issue.comment_count += 1
+            self.store.feed.update(issue)
+            self.store.record_change("counts", issue_id)
+        return comment
+
+    def stats(self):
+        with self.store.lock.read():
+            return self.store.stats()
+
+    def trends(self, bucket, since, group_by):
+        day = since.date().isoformat()
+        with self.store.lock.read():
+            created = [item for item in self.store.created_daily.items() if item[0][0] >= day]
+            resolved = [item for item in self.store.resolved_daily.items() if item[0][0] >= day]
+        return rollup_trends(created, resolved, bucket, group_by)
+
+    def resolution_times(self, since, group_by):
+        groups: Dict[str, List[float]] = {}
+        with self.store.lock.read():
+            for _, hours, category, district, _ in self.store.resolutions.irange((since.timestamp(),)):
+                key = category if group_by == "category" else district if group_by == "district" else "all"
+                groups.setdefault(key, []).append(hours)
+        return summarize_durations(groups)
+
+    def top_open_by_district(self, per_district):
+        top: Dict[str, List[Issue]] = {}
+        remaining = len(DISTRICT_CENTROIDS) + 1
+        with self.store.lock.read():
+            for issue_id in self.store.feed.top(None, None, "upvotes", None):
+                issue = self.store.issues_by_id[issue_id]
+                if issue.status == "resolved":
+                    continue
+                bucket = top.setdefault(issue.district or "Unknown", [])
+                if len(bucket) < per_district:
+                    bucket.append(issue.copy())
+                    if len(bucket) == per_district:
+                        remaining -= 1
+                        if not remaining:
+                            break
+        return top
+
+    def changes_since(self, since, limit):
+        store = self.store
+        streams: Dict[str, List[Tuple[int, Any]]] = {"issues": [], "counts": [], "comments": []}
+        with store.lock.read(), store.change_lock:
+            current = store.change_version
+            # A cursor from before a restart is ahead of the new log; start the client over.
+            reset = since > current
+            if reset:
+                since = 0
+            taken = 0
+            for version, kind, key in store.changes.irange((since + 1,)):
+                issue = store.find_issue(key[0])
+                if issue is None:
+                    continue
+                if kind == "issue":
+                    streams["issues"].append((version, issue.copy()))
+                elif kind == "counts":
+                    if store.change_versions[("issue", key)] > since:
+                        continue  # the issue itself is in this sync, counters included
+                    streams["counts"].append((version, count_change(issue.to_row())))
+                else:
+                    comment = next((c for c in store.comments_by_issue.get(key[0], []) if c.get("id") == key[1]), None)
+                    if comment is None:
+                        continue
+                    streams["comments"].append((version, deepcopy(comment)))
+                taken += 1
+                if taken > limit:
+                    break
+        return merge_changes(since, limit, streams, current=current, reset=reset)
+
+    def export_rows(self, kind, after=None):
+        # Snapshot the keys once, then copy rows a batch at a time so a slow
+        # download never holds the store lock. The read lock fixes the set of
+        # issues; each issue's stripe fixes its comments and upvoters while
+        # they are copied. Sorting happens after both are released.
+        with self.store.lock.read():
+            if kind == "issues":
+                keys = [(issue_id,) for issue_id in self.store.issues_by_id]
+            else:
+                containers = self.store.comments_by_issue if kind == "comments" else self.store.upvote_sessions
+                keys = []
+                for issue_id, entries in containers.items():
+                    with self.store.stripe(issue_id):
+                        if kind == "comments":
+                            keys.extend((issue_id, c["id"]) for c in entries)
+                        else:
+                            keys.extend((issue_id, sid) for sid in entries)
+        keys.sort()
+        start = bisect.bisect_right(keys, after) if after else 0
+        for offset in range(start, len(keys), BULK_BATCH_SIZE):
+            rows = []
+            with self.store.lock.read():
+                for key in keys[offset : offset + BULK_BATCH_SIZE]:
+                    if kind == "issues":
+                        issue = self.store.find_issue(key[0])
+                        if issue:
+                            rows.append(issue.to_row())
+                    elif kind == "comments":
+                        for comment in self.store.comments_by_issue.get(key[0], []):
+                            if comment["id"] == key[1]:
+                                rows.append(to_comment_row(comment))
+                                break
+                    else:
+                        rows.append({"issue_id": key[0], "session_hash": key[1]})
+            yield from rows
+
+    def import_rows(self, kind, rows):
+        with self.store.lock.write():
+            for row in rows:
+                if kind == "issues":
+                    self.store.add_issue(Issue.from_row(row))
+                    continue
+                issue_id = row["issue_id"]
+                if issue_id not in self.store.issues_by_id:
+                    raise KeyError(f"unknown issue {issue_id}")
+                if kind == "comments":
+                    comment = to_comment_shape(row)
+                    comments = self.store.comments_by_issue[issue_id]
+                    comments[:] = [c for c in comments if c["id"] != comment["id"]]
+                    comments.append(comment)
+                    self.store.record_change("comment", issue_id, comment["id"])
+                else:
+                    self.store.upvote_sessions[issue_id].add(row["session_hash"])
+
+
+class SupabaseIssueRepository(IssueRepository):
+    name = "supabase"
+
+    def __init__(self, client: Any) -> None:
+        self.client = client
+
+    @staticmethod
+    def _run(query: Any, operation: str) -> Any:
+        """Execute a PostgREST query, recording its round trip under ``operation``."""
+        with track_dependency("supabase", operation):
+            return query.execute()
+
+    def list_issues(self, status=None, category=None, sort_by="upvotes", limit=None):
+        query = self.client.table("issues").select("*")
+        if status:
+            query = query.eq("status", status)
+        if category:
+            query = query.eq("category", category)
+        column = {"recent": "created_at", "trending": "trending_score"}.get(sort_by, "upvotes")
+        query = query.order(column, desc=True)
+        if limit:
+            query = query.limit(limit)
+        data = self._run(query, "issues.select").data or []
+        with span("issues.from_row", count=len(data)):
+            return [Issue.from_row(row) for row in data]
+
+    def get_issue(self, issue_id):
+        data = self._run(self.client.table("issues").select("*").eq("id", issue_id).limit(1), "issues.select").data
+        return Issue.from_row(data[0]) if data else None
+
+    def insert_issue(self, issue):
+        row = issue.to_row()
+        # Let the database stamp created_at and leave optional columns at their defaults.
+        row.pop("created_at", None)
+        row.pop("resolved_at", None)
+        row.pop("resolved_by", None)
+        try:
+            created = self._run(self.client.table("issues").insert(row), "issues.insert").data
+        except Exception as exc:
+            # PostgREST reports Postgres' unique_violation code on a primary key clash.
+            if getattr(exc, "code", None) == "23505":
+                raise IssueIdTaken(issue.id) from exc
+            raise
+        if not created:
+            raise RuntimeError("insert returned no rows")
+        return Issue.from_row(created[0])
+
+    def _upvote_count(self, issue_id: str) -> Optional[int]:
+        query = self.client.table("issues").select("upvotes").eq("id", issue_id).limit(1)
+        issue = self._run(query, "issues.select").data
+        return int(issue[0].get("upvotes", 0)) if issue else None
+
+    def upvote(self, issue_id, sid_hash):
+        query = (
+            self.client.table("issue_votes")
+            .select("id")
+            .eq("issue_id", issue_id)
+            .eq("session_hash", sid_hash)
+            .eq("vote_type", "upvote")
+            .limit(1)
+        )
+        if self._run(query, "issue_votes.select").data:
+            return {"issueId": issue_id, "upvotes": self._upvote_count(issue_id) or 0, "duplicate": True}
+
+        self._run(
+            self.client.table("issue_votes").insert({"issue_id": issue_id, "session_hash": sid_hash, "vote_type": "upvote"}),
+            "issue_votes.insert",
+        )
+        current = self._upvote_count(issue_id)
+        if current is None:
+            return None
+        new_count = current + 1
+        query = self.client.table("issues").update({"upvotes": new_count}).eq("id", issue_id)
+        updated = self._run(query, "issues.update").data
+        final_count = int(updated[0].get("upvotes", new_count)) if updated else new_count
+        return {"issueId": issue_id, "upvotes": final_count, "duplicate": False}
+
+    def _resolve_count(self, issue_id: str, vote: str) -> int:
+        query = self.client.table("resolve_votes").select("id", count="exact").eq("issue_id", issue_id).eq("vote", vote)
+        return self._run(query, "resolve_votes.count").count or 0
+
+    def resolve_counts(self, issue_id):
+        return self._resolve_count(issue_id, "yes"), self._resolve_count(issue_id, "no")
+
+    def _has_upvoted(self, issue_id: str, sid_hash: str) -> bool:
+        query = (
+            self.client.table("issue_votes")
+            .select("id")
+            .eq("issue_id", issue_id)
+            .eq("session_hash", sid_hash)
+            .eq("vote_type", "upvote")
+            .limit(1)
+        )
+        return bool(self._run(query, "issue_votes.select").data)
+
+    def _resolve_vote_of(self, issue_id: str, sid_hash: str) -> Optional[str]:
+        query = self.client.table("resolve_votes").select("vote").eq("issue_id", issue_id).eq("session_hash", sid_hash)
+        data = self._run(query.limit(1), "resolve_votes.select").data
+        return data[0]["vote"] if data else None
+
+    def vote_state(self, issue_id, sid_hash):
+        return {"upvoted": self._has_upvoted(issue_id, sid_hash), "resolveVote": self._resolve_vote_of(issue_id, sid_hash)}
+
+    def issue_detail(self, issue_id, sid_hash, comment_limit):
+        # Six independent PostgREST round trips, overlapped: the page costs one round trip instead of six.
+        parts = run_concurrently(
+            {
+                "issue": lambda: self.get_issue(issue_id),
+                "comments": lambda: self.list_comments(issue_id, comment_limit + 1),
+                "yes": lambda: self._resolve_count(issue_id, "yes"),
+                "no": lambda: self._resolve_count(issue_id, "no"),
+                "upvoted": lambda: self._has_upvoted(issue_id, sid_hash),
+                "resolveVote": lambda: self._resolve_vote_of(issue_id, sid_hash),
+            }
+        )
+        if parts["issue"] is None:
+            return None
+        viewer = {"upvoted": parts["upvoted"], "resolveVote": parts["resolveVote"]}
+        return issue_detail_payload(parts["issue"], parts["comments"], comment_limit, parts["yes"], parts["no"], viewer)
+
+    def resolve_vote(self, issue_id, sid_hash, vote):
+        query = (
+            self.client.table("resolve_votes")
+            .select("id")
+            .eq("issue_id", issue_id)
+            .eq("session_hash", sid_hash)
+            .limit(1)
+        )
+        if self._run(query, "resolve_votes.select").data:
+            return resolve_tally(issue_id, *self.resolve_counts(issue_id), True)
+
+        self._run(
+            self.client.table("resolve_votes").insert({"issue_id": issue_id, "session_hash": sid_hash, "vote": vote}),
+            "resolve_votes.insert",
+        )
+        yes_count, no_count = self.resolve_counts(issue_id)
+        self._run(
+            self.client.table("issues").update({"resolution_confirmations": yes_count}).eq("id", issue_id),
+            "issues.update",
+        )
+        return resolve_tally(issue_id, yes_count, no_count, False)
+
+    def list_comments(self, issue_id, limit=None):
+        query = self.client.table("comments").select("*").eq("issue_id", issue_id).order("created_at", desc=True)
+        if limit:
+            query = query.limit(limit)
+        data = self._run(query, "comments.select").data or []
+        return [to_comment_shape(c) for c in data]
+
+    def list_contacts(self):
+        query = self.client.table("emergency_contacts").select("*").order("district").order("id")
+        data = self._run(query, "emergency_contacts.select").data or []
+        return [to_contact_shape(row) for row in data] or deepcopy(MOCK_EMERGENCY_CONTACTS)
+
+    def add_comment(self, comment, sid_hash):
+        issue_id = comment.get("issueId")
+        query = self.client.table("issues").select("comment_count").eq("id", issue_id).limit(1)
+        existing_issue = self._run(query, "issues.select").data
+        if not existing_issue:
+            return None
+        row = to_comment_row(comment, sid_hash)
+        row.pop("created_at", None)
+        created = self._run(self.client.table("comments").insert(row), "comments.insert").data
+        count = int(existing_issue[0].get("comment_count", 0)) + 1
+        self._run(self.client.table("issues").update({"comment_count": count}).eq("id", issue_id), "issues.update")
+        return to_comment_shape(created[0]) if created else comment
+
+    def stats(self):
+        rows = self._run(self.client.table("issues").select("status,category,resolved_at"), "issues.select").data or []
+        return build_stats([(r.get("status"), r.get("category"), r.get("resolved_at")) for r in rows])
+
+    def trends(self, bucket, since, group_by):
+        params = {"bucket": bucket, "since": since.isoformat(), "group_by": group_by}
+        rows = self._run(self.client.rpc("issue_trends", params), "rpc.issue_trends").data or []
+        return [
+            {"bucketStart": str(r["bucket_start"]), "key": r["key"], "created": r["created"], "resolved": r["resolved"]}
+            for r in rows
+        ]
+
+    def resolution_times(self, since, group_by):
+        params = {"since": since.isoformat(), "group_by": group_by}
+        rows = self._run(self.client.rpc("issue_resolution_times", params), "rpc.issue_resolution_times").data or []
+        return [
+            {
+                "key": r["key"],
+                "resolved": r["resolved"],
+                "medianHours": round(r["median_hours"], 2),
+                "p90Hours": round(r["p90_hours"], 2),
+            }
+            for r in rows
+        ]
+
+    def top_open_by_district(self, per_district):
+        query = self.client.rpc("top_open_issues_by_district", {"per_district": per_district})
+        top: Dict[str, List[Issue]] = {}
+        for row in self._run(query, "rpc.top_open_issues_by_district").data or []:
+            issue = Issue.from_row(row)
+            top.setdefault(issue.district or "Unknown", []).append(issue)
+        return top
+
+    def changes_since(self, since, limit):
+        # Read the sequence first: anything stamped later is past the cursor this call can return.
+        current = int(self._run(self.client.rpc("current_change_version", {}), "rpc.current_change_version").data or 0)
+        reset = since > current
+        if reset:
+            since = 0
+        issues = self.client.table("issues").select("*").gt("version", since).order("version").limit(limit + 1)
+        counts = (
+            self.client.table("issues")
+            .select("id,upvotes,comment_count,resolution_confirmations,counts_version")
+            .gt("counts_version", since)
+            .lte("version", since)
+            .order("counts_version")
+            .limit(limit + 1)
+        )
+        comments = self.client.table("comments").select("*").gt("version", since).order("version").limit(limit + 1)
+        issue_rows = self._run(issues, "issues.changes").data or []
+        count_rows = self._run(counts, "issues.changes").data or []
+        comment_rows = self._run(comments, "comments.changes").data or []
+        streams = {
+            "issues": [(row["version"], Issue.from_row(row)) for row in issue_rows],
+            "counts": [(row["counts_version"], count_change(row)) for row in count_rows],
+            "comments": [(row["version"], to_comment_shape(row)) for row in comment_rows],
+        }
+        return merge_changes(since, limit, streams, current=current, reset=reset)
+
+    @staticmethod
+    def _quote(value: str) -> str:
+        return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+    def export_rows(self, kind, after=None):
+        table = BULK_TABLES[kind]
+        keys = BULK_KEYS[kind]
+        while True:
+            query = self.client.table(table).select(",".join(BULK_COLUMNS[kind]))
+            if kind == "votes":
+                query = query.eq("vote_type", "upvote")
+            if after and len(keys) == 1:
+                query = query.gt(keys[0], after[0])
+            elif after:
+                first, second = (self._quote(v) for v in after)
+                query = query.or_(f"{keys[0]}.gt.{first},and({keys[0]}.eq.{first},{keys[1]}.gt.{second})")
+            for key in keys:
+                query = query.order(key)
+            data = self._run(query.limit(BULK_BATCH_SIZE), f"{table}.export").data or []
+            yield from data
+            if len(data) < BULK_BATCH_SIZE:
+                return
+            after = bulk_key(kind, data[-1])
+
+    def import_rows(self, kind, rows):
+        table = BULK_TABLES[kind]
+        if kind == "votes":
+            rows = [{**row, "vote_type": "upvote"} for row in rows]
+            query = self.client.table(table).upsert(
+                rows, on_conflict="issue_id,session_hash,vote_type", ignore_duplicates=True
+            )
+        else:
+            query = self.client.table(table).upsert(rows)
+        self._run(query, f"{table}.upsert")
+
+
+SQLITE_SCHEMA = """
+create table if not exists issues (
+  id text primary key,
+  title text not null,
+  description text not null,
+  category text not null check (category in ('potholes','streetLights','garbage','waterSupply','roadDamage','drainage','publicSafety','other')),
+  severity text not null check (severity in ('low','medium','high','critical')),
+  status text not null default 'open' check (status in ('open','in-progress','resolved')),
+  location text not null,
+  lat real,
+  lng real,
+  photos text not null default '[]',
+  upvotes integer not null default 0,
+  comment_count integer not null default 0,
+  reporter text not null default 'Anonymous',
+  is_anonymous integer not null default 1,
+  created_at text not null default (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
+  ai_confidence integer,
+  ai_category text,
+  severity_score integer,
+  severity_text text,
+  resolution_confirmations integer not null default 0,
+  resolved_at text,
+  resolved_by text check (resolved_by in ('community','reporter','official')),
+  district text,
+  metadata text not null default '{}',
+  version integer not null default 0,
+  counts_version integer not null default 0,
+  trending_score real not null default 0
+);
+
+create index if not exists idx_issues_status on issues(status);
+create index if not exists idx_issues_created_at on issues(created_at desc);
+create index if not exists idx_issues_category on issues(category);
+create index if not exists idx_issues_upvotes on issues(upvotes desc);
+create index if not exists idx_issues_status_upvotes on issues(status, upvotes desc);
+create index if not exists idx_issues_district_status_upvotes on issues(district, status, upvotes desc);
+create index if not exists idx_issues_resolved_at on issues(resolved_at);
+create index if not exists idx_issues_version on issues(version);
+create index if not exists idx_issues_counts_version on issues(counts_version);
+create index if not exists idx_issues_trending on issues(trending_score desc);
+create index if not exists idx_issues_status_trending on issues(status, trending_score desc);
+
+create table if not exists issue_votes (
+  id integer primary key autoincrement,
+  issue_id text not null references issues(id) on delete cascade,
+  session_hash text not null,
+  vote_type text not null check (vote_type in ('upvote')),
+  created_at text not null default (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
+  unique(issue_id, session_hash, vote_type)
+);
+
+create table if not exists resolve_votes (
+  id integer primary key autoincrement,
+  issue_id text not null references issues(id) on delete cascade,
+  session_hash text not null,
+  vote text not null check (vote in ('yes','no')),
+  created_at text not null default (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
+  unique(issue_id, session_hash)
+);
+
+create table if not exists comments (
+  id text primary key,
+  issue_id text not null references issues(id) on delete cascade,
+  text text not null,
+  author text not null default 'Anonymous',
+  is_anonymous integer not null default 1,
+  session_hash text,
+  created_at text not null default (strftime('%Y-%m-%dT%H:%M:%fZ', 'now')),
+  version integer not null default 0
+);
+
+create index if not exists idx_comments_issue_id on comments(issue_id);
+create index if not exists idx_comments_created_at on comments(created_at desc);
+create index if not exists idx_comments_version on comments(version);
+
+create table if not exists emergency_contacts (
+  id text primary key,
+  organization text not null,
+  district text not null,
+  phone text not null,
+  service_type text not null check (service_type in ('police','medical','utilities','government')),
+  is_247 integer not null default 0
+);
+
+create index if not exists idx_emergency_contacts_district_type on emergency_contacts(district, service_type);
+create index if not exists idx_emergency_contacts_service_type on emergency_contacts(service_type);
+"""
+
+# Delta sync versions, the SQLite counterpart of the change_seq triggers in
+# schema.sql: every insert or real change stamps the row from one counter.
+# The trending triggers keep issues.trending_score current the same way.
+ISSUE_COUNTER_COLUMNS = ("upvotes", "comment_count", "resolution_confirmations")
+ISSUE_CONTENT_COLUMNS = tuple(c for c in ISSUE_COLUMNS if c != "id" and c not in ISSUE_COUNTER_COLUMNS)
+
+
+def _sqlite_changed(columns: Iterable[str]) -> str:
+    return " or ".join(f"old.{c} is not new.{c}" for c in columns)
+
+
+SQLITE_CHANGE_TRIGGERS = f"""
+create table if not exists change_sequence (id integer primary key check (id = 1), value integer not null);
+insert or ignore into change_sequence (id, value) values (1, 0);
+
+create trigger if not exists issues_version_insert after insert on issues
+begin
+  update change_sequence set value = value + 1;
+  update issues set version = (select value from change_sequence), counts_version = (select value from change_sequence)
+  where id = new.id;
+end;
+
+create trigger if not exists issues_version_update after update on issues
+when {_sqlite_changed(ISSUE_CONTENT_COLUMNS)}
+begin
+  update change_sequence set value = value + 1;
+  update issues set version = (select value from change_sequence) where id = new.id;
+end;
+
+create trigger if not exists issues_counts_version_update after update on issues
+when {_sqlite_changed(ISSUE_COUNTER_COLUMNS)}
+begin
+  update change_sequence set value = value + 1;
+  update issues set counts_version = (select value from change_sequence) where id = new.id;
+end;
+
+-- trending_score() is issue_trending_score, registered on every connection.
+create trigger if not exists issues_trending_insert after insert on issues
+begin
+  update issues set trending_score = trending_score(new.upvotes, new.comment_count, new.severity_score, new.created_at)
+  where id = new.id;
+end;
+
+create trigger if not exists issues_trending_update after update of upvotes, comment_count, severity_score, created_at on issues
+begin
+  update issues set trending_score = trending_score(new.upvotes, new.comment_count, new.severity_score, new.created_at)
+  where id = new.id;
+end;
+
+create trigger if not exists comments_version_insert after insert on comments
+begin
+  update change_sequence set value = value + 1;
+  update comments set version = (select value from change_sequence) where id = new.id;
+end;
+
+create trigger if not exists comments_version_update after update on comments
+when {_sqlite_changed(COMMENT_COLUMNS)}
+begin
+  update change_sequence set value = value + 1;
+  update comments set version = (select value from change_sequence) where id = new.id;
+end;
+"""
+
+
+class SqliteDatabase:
+    """Per-thread connections to one SQLite file.
+
+    The database runs in WAL mode so readers never block the single writer.
+    ``transaction()`` opens ``BEGIN IMMEDIATE`` so read-modify-write
+    sequences take the write lock up front instead of failing on upgrade.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._local = threading.local()
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("pragma journal_mode = wal")
+            conn.execute("pragma synchronous = normal")
+            conn.execute("pragma foreign_keys = on")
+            conn.execute("pragma busy_timeout = 5000")
+            self.prepare(conn)
+            self._local.conn = conn
+        return conn
+
+    def prepare(self, conn: sqlite3.Connection) -> None:
+        """Hook for subclasses to register functions on each new connection."""
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self.connection()
+        conn.execute("begin immediate")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("rollback")
+            raise
+        conn.execute("commit")
+
+    @contextmanager
+    def snapshot(self) -> Iterator[sqlite3.Connection]:
+        """A read transaction: every query inside sees the database as of the first one."""
+        conn = self.connection()
+        conn.execute("begin")
+        try:
+            yield conn
+        finally:
+            conn.execute("commit")
+
+
+class SqliteIssueRepository(SqliteDatabase, IssueRepository):
+    """Embedded SQLite backend mirroring schema.sql.
+
+    Each thread keeps its own connection, and writes run in immediate
+    transactions so vote and comment counters are updated atomically with
+    the rows that justify them.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str) -> None:
+        super().__init__(path)
+        conn = self.connection()
+        # Databases created before the district column need it before the indexes on it.
+        columns = {row[1] for row in conn.execute("pragma table_info(issues)")}
+        if columns and "district" not in columns:
+            with self.transaction() as tx:
+                tx.execute("alter table issues add column district text")
+                located = tx.execute("select id, lat, lng from issues where lat is not null and lng is not null")
+                tx.executemany(
+                    "update issues set district = ? where id = ?",
+                    [(district_for(lat, lng), issue_id) for issue_id, lat, lng in located.fetchall()],
+                )
+        # Likewise the delta sync versions; existing rows are numbered once the counter exists.
+        add_versions = bool(columns) and "version" not in columns
+        if add_versions:
+            with self.transaction() as tx:
+                tx.execute("alter table issues add column version integer not null default 0")
+                tx.execute("alter table issues add column counts_version integer not null default 0")
+                tx.execute("alter table comments add column version integer not null default 0")
+        # And the trending score, backfilled through the function the triggers use.
+        add_trending = bool(columns) and "trending_score" not in columns
+        if add_trending:
+            conn.execute("alter table issues add column trending_score real not null default 0")
+        conn.executescript(SQLITE_SCHEMA)
+        conn.executescript(SQLITE_CHANGE_TRIGGERS)
+        if add_trending:
+            with self.transaction() as tx:
+                tx.execute(
+                    "update issues set trending_score = "
+                    "trending_score(upvotes, comment_count, severity_score, created_at)"
+                )
+        if add_versions:
+            with self.transaction() as tx:
+                tx.execute("update issues set version = rowid, counts_version = rowid")
+                offset = tx.execute("select coalesce(max(rowid), 0) from issues").fetchone()[0]
+                tx.execute("update comments set version = rowid + ?", (offset,))
+                tx.execute(
+                    "update change_sequence set value = ? + (select coalesce(max(rowid), 0) from comments)", (offset,)
+                )
+
+    def prepare(self, conn):
+        conn.create_function("trending_score", 4, issue_trending_score, deterministic=True)
+
+    @staticmethod
+    def _row_to_issue(row: sqlite3.Row) -> Issue:
+        data = dict(row)
+        data["photos"] = json.loads(data.get("photos") or "[]")
+        return Issue.from_row(data)
+
+    def list_issues(self, status=None, category=None, sort_by="upvotes", limit=None):
+        clauses: List[str] = []
+        params: List[Any] = []
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if category:
+            clauses.append("category = ?")
+            params.append(category)
+        sql = "select * from issues"
+        if clauses:
+            sql += " where " + " and ".join(clauses)
+        column = {"recent": "created_at", "trending": "trending_score"}.get(sort_by, "upvotes")
+        sql += f" order by {column} desc"
+        if limit:
+            sql += " limit ?"
+            params.append(limit)
+        return [self._row_to_issue(row) for row in self.connection().execute(sql, params)]
+
+    def get_issue(self, issue_id):
+        row = self.connection().execute("select * from issues where id = ?", (issue_id,)).fetchone()
+        return self._row_to_issue(row) if row else None
+
+    def insert_issue(self, issue):
+        row = issue.to_row()
+        row["photos"] = json.dumps(row["photos"])
+        placeholders = ", ".join("?" for _ in ISSUE_COLUMNS)
+        with self.transaction() as conn:
+            inserted = conn.execute(
+                f"insert into issues ({', '.join(ISSUE_COLUMNS)}) values ({placeholders}) on conflict (id) do nothing",
+                [row[column] for column in ISSUE_COLUMNS],
+            ).rowcount
+        if not inserted:
+            raise IssueIdTaken(issue.id)
+        return self.get_issue(issue.id) or issue
+
+    def upvote(self, issue_id, sid_hash):
+        with self.transaction() as conn:
+            if conn.execute("select 1 from issues where id = ?", (issue_id,)).fetchone() is None:
+                return None
+            inserted = conn.execute(
+                "insert or ignore into issue_votes (issue_id, session_hash, vote_type) values (?, ?, 'upvote')",
+                (issue_id, sid_hash),
+            ).rowcount
+            if inserted:
+                conn.execute("update issues set upvotes = upvotes + 1 where id = ?", (issue_id,))
+            upvotes = conn.execute("select upvotes from issues where id = ?", (issue_id,)).fetchone()[0]
+        return {"issueId": issue_id, "upvotes": int(upvotes), "duplicate": not inserted}
+
+    def resolve_vote(self, issue_id, sid_hash, vote):
+        with self.transaction() as conn:
+            if conn.execute("select 1 from issues where id = ?", (issue_id,)).fetchone() is None:
+                return None
+            inserted = conn.execute(
+                "insert or ignore into resolve_votes (issue_id, session_hash, vote) values (?, ?, ?)",
+                (issue_id, sid_hash, vote),
+            ).rowcount
+            yes_count, no_count = conn.execute(
+                "select coalesce(sum(vote = 'yes'), 0), coalesce(sum(vote = 'no'), 0) from resolve_votes where issue_id = ?",
+                (issue_id,),
+            ).fetchone()
+            if inserted:
+                conn.execute("update issues set resolution_confirmations = ? where id = ?", (yes_count, issue_id))
+        return resolve_tally(issue_id, int(yes_count), int(no_count), not inserted)
+
+    def list_comments(self, issue_id, limit=None):
+        rows = self.connection().execute(
+            "select * from comments where issue_id = ? order by created_at desc limit ?",
+            (issue_id, -1 if limit is None else limit),
+        )
+        return [to_comment_shape(dict(row)) for row in rows]
+
+    def resolve_counts(self, issue_id):
+        yes_count, no_count = self.connection().execute(
+            "select coalesce(sum(vote = 'yes'), 0), coalesce(sum(vote = 'no'), 0) from resolve_votes where issue_id = ?",
+            (issue_id,),
+        ).fetchone()
+        return int(yes_count), int(no_count)
+
+    def vote_state(self, issue_id, sid_hash):
+        conn = self.connection()
+        upvoted = conn.execute(
+            "select 1 from issue_votes where issue_id = ? and session_hash = ? and vote_type = 'upvote'",
+            (issue_id, sid_hash),
+        ).fetchone()
+        vote = conn.execute(
+            "select vote from resolve_votes where issue_id = ? and session_hash = ?", (issue_id, sid_hash)
+        ).fetchone()
+        return {"upvoted": upvoted is not None, "resolveVote": vote[0] if vote else None}
+
+    def list_contacts(self):
+        rows = self.connection().execute("select * from emergency_contacts order by district, id")
+        return [to_contact_shape(dict(row)) for row in rows] or deepcopy(MOCK_EMERGENCY_CONTACTS)
+
+    def add_comment(self, comment, sid_hash):
+        row = to_comment_row(comment, sid_hash)
+        with self.transaction() as conn:
+            if conn.execute("select 1 from issues where id = ?", (row["issue_id"],)).fetchone() is None:
+                return None
+            conn.execute(
+                "insert into comments (id, issue_id, text, author, is_anonymous, session_hash, created_at) "
+                "values (:id, :issue_id, :text, :author, :is_anonymous, :session_hash, :created_at)",
+                row,
+            )
+            conn.execute("update issues set comment_count = comment_count + 1 where id = ?", (row["issue_id"],))
+        return to_comment_shape(row)
+
+    def stats(self):
+        conn = self.connection()
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=8)).isoformat().replace("+00:00", "Z")
+        total_reports, active_issues, resolved_this_week = conn.execute(
+            "select count(*), coalesce(sum(status != 'resolved'), 0), coalesce(sum(resolved_at > ?), 0) from issues",
+            (cutoff,),
+        ).fetchone()
+        top = conn.execute(
+            "select category from issues group by category order by count(*) desc, category limit 1"
+        ).fetchone()
+        return {
+            "totalReports": int(total_reports),
+            "resolvedThisWeek": int(resolved_this_week),
+            "activeIssues": int(active_issues),
+            "topCategory": top[0] if top else "other",
+        }
+
+    ANALYTICS_KEYS = {"none": "'all'", "category": "category", "district": "coalesce(district, 'Unknown')"}
+
+    def trends(self, bucket, since, group_by):
+        key = self.ANALYTICS_KEYS[group_by]
+        # date(x, 'weekday 0', '-6 days') is the Monday starting x's week.
+        modifiers = ", 'weekday 0', '-6 days'" if bucket == "week" else ""
+        cutoff = since.isoformat().replace("+00:00", "Z")
+        rows = self.connection().execute(
+            f"""
+            select bucket_start, key, sum(created), sum(resolved) from (
+              select date(created_at{modifiers}) as bucket_start, {key} as key, 1 as created, 0 as resolved
+              from issues where created_at >= ?
+              union all
+              select date(resolved_at{modifiers}), {key}, 0, 1 from issues where resolved_at >= ?
+            )
+            group by 1, 2
+            order by 1, 2
+            """,
+            (cutoff, cutoff),
+        )
+        return [{"bucketStart": b, "key": k, "created": c, "resolved": r} for b, k, c, r in rows]
+
+    def resolution_times(self, since, group_by):
+        key = self.ANALYTICS_KEYS[group_by]
+        cutoff = since.isoformat().replace("+00:00", "Z")
+        # SQLite has no percentile functions; rank durations per key with window
+        # functions and pick the middle row(s) and the p90 nearest rank.
+        rows = self.connection().execute(
+            f"""
+            with durations as (
+              select {key} as key, (julianday(resolved_at) - julianday(created_at)) * 24 as hours
+              from issues where resolved_at >= ?
+            ),
+            ranked as (
+              select key, hours,
+                     row_number() over (partition by key order by hours) as rn,
+                     count(*) over (partition by key) as n
+              from durations
+            )
+            select key, max(n),
+                   avg(case when rn in ((n + 1) / 2, (n + 2) / 2) then hours end),
+                   max(case when rn = (9 * n + 9) / 10 then hours end)
+            from ranked
+            group by key
+            order by key
+            """,
+            (cutoff,),
+        )
+        return [
+            {"key": k, "resolved": n, "medianHours": round(median, 2), "p90Hours": round(p90, 2)}
+            for k, n, median, p90 in rows
+        ]
+
+    def top_open_by_district(self, per_district):
+        rows = self.connection().execute(
+            """
+            select * from (
+              select *, row_number() over (
+                partition by coalesce(district, 'Unknown') order by upvotes desc, created_at desc
+              ) as rn
+              from issues where status != 'resolved'
+            )
+            where rn <= ?
+            order by district, upvotes desc
+            """,
+            (per_district,),
+        )
+        top: Dict[str, List[Issue]] = {}
+        for row in rows:
+            issue = self._row_to_issue(row)
+            top.setdefault(issue.district or "Unknown", []).append(issue)
+        return top
+
+    def changes_since(self, since, limit):
+        # One snapshot, so a write between the queries can neither split nor skip a page.
+        with self.snapshot() as conn:
+            current = conn.execute("select value from change_sequence").fetchone()[0]
+            reset = since > current
+            if reset:
+                since = 0
+            issues = conn.execute(
+                "select * from issues where version > ? order by version limit ?", (since, limit + 1)
+            ).fetchall()
+            counts = conn.execute(
+                "select id, upvotes, comment_count, resolution_confirmations, counts_version from issues "
+                "where counts_version > ? and version <= ? order by counts_version limit ?",
+                (since, since, limit + 1),
+            ).fetchall()
+            comments = conn.execute(
+                "select * from comments where version > ? order by version limit ?", (since, limit + 1)
+            ).fetchall()
+        streams = {
+            "issues": [(row["version"], self._row_to_issue(row)) for row in issues],
+            "counts": [(row["counts_version"], count_change(row)) for row in counts],
+            "comments": [(row["version"], to_comment_shape(dict(row))) for row in comments],
+        }
+        return merge_changes(since, limit, streams, current=current, reset=reset)
+
+    def export_rows(self, kind, after=None):
+        keys = ", ".join(BULK_KEYS[kind])
+        sql = f"select {', '.join(BULK_COLUMNS[kind])} from {BULK_TABLES[kind]} where 1 = 1"
+        if kind == "votes":
+            sql += " and vote_type = 'upvote'"
+        conn = self.connection()
+        while True:
+            params: Tuple[Any, ...] = ()
+            query = sql
+            if after:
+                query += f" and ({keys}) > ({', '.join('?' * len(after))})"
+                params = after
+            rows = [dict(row) for row in conn.execute(f"{query} order by {keys} limit {BULK_BATCH_SIZE}", params)]
+            for row in rows:
+                if "photos" in row:
+                    row["photos"] = json.loads(row["photos"] or "[]")
+                if "is_anonymous" in row:
+                    row["is_anonymous"] = bool(row["is_anonymous"])
+            yield from rows
+            if len(rows) < BULK_BATCH_SIZE:
+                return
+            after = bulk_key(kind, rows[-1])
+
+    @staticmethod
+    def import_statement(kind: str, rows: List[Dict[str, Any]]) -> Tuple[str, List[Tuple[Any, ...]]]:
+        """The upsert and its parameters for ``import_rows``, for callers already inside a transaction."""
+        if kind == "votes":
+            sql = "insert or ignore into issue_votes (issue_id, session_hash, vote_type) values (?, ?, 'upvote')"
+            return sql, [(row["issue_id"], row["session_hash"]) for row in rows]
+        columns = BULK_COLUMNS[kind]
+        # Upsert rather than "insert or replace", which would cascade-delete an issue's comments and votes.
+        sql = (
+            f"insert into {BULK_TABLES[kind]} ({', '.join(columns)}) values ({', '.join('?' * len(columns))}) "
+            f"on conflict(id) do update set {', '.join(f'{c} = excluded.{c}' for c in columns if c != 'id')}"
+        )
+        return sql, [tuple(json.dumps(row[c]) if c == "photos" else row[c] for c in columns) for row in rows]
+
+    def import_rows(self, kind, rows):
+        with self.transaction() as conn:
+            conn.executemany(*self.import_statement(kind, rows))
+
+
+SHARED_STATE_PATH = os.getenv("SHARED_STATE_PATH", "").strip()
+SHARED_POLL_SECONDS = float(os.getenv("SHARED_POLL_SECONDS", "0.2"))
+SHARED_EVENT_HISTORY = 1000
+
+
+class SharedState(SqliteDatabase):
+    """Settings and live events shared by all worker processes through one SQLite file.
+
+    With SHARED_STATE_PATH set, gunicorn workers keep the demo-mode switch,
+    the demo data (``SharedDemoRepository``) and SSE events here rather
+    than in module globals. ``pragma data_version`` moves whenever another
+    connection commits, so noticing other workers' writes costs one pragma.
+    """
+
+    SCHEMA = """
+create table if not exists shared_settings (key text primary key, value text not null);
+create table if not exists shared_events (id integer primary key autoincrement, origin integer not null, event text not null);
+"""
+
+    def __init__(self, path: str) -> None:
+        super().__init__(path)
+        self._settings: Dict[str, Any] = {}
+        self.connection().executescript(self.SCHEMA)
+
+    @property
+    def origin(self) -> int:
+        return os.getpid()
+
+    def changed(self) -> bool:
+        """Whether another connection has committed since this thread last asked."""
+        version = self.connection().execute("pragma data_version").fetchone()[0]
+        changed = version != getattr(self._local, "data_version", None)
+        self._local.data_version = version
+        return changed
+
+    def setting(self, key: str) -> Any:
+        if self.changed():
+            rows = self.connection().execute("select key, value from shared_settings")
+            self._settings = {row["key"]: json.loads(row["value"]) for row in rows}
+        return self._settings.get(key)
+
+    def set_setting(self, key: str, value: Any) -> None:
+        with self.transaction() as conn:
+            conn.execute(
+                "insert into shared_settings (key, value) values (?, ?) on conflict(key) do update set value = excluded.value",
+                (key, json.dumps(value)),
+            )
+        self._settings = {**self._settings, key: value}
+
+    def append_event(self, event: Dict[str, Any]) -> int:
+        """Store an event for the other workers and return its id, which is the same on every worker."""
+        payload = app.json.dumps({k: v for k, v in event.items() if k != "id"})
+        with self.transaction() as conn:
+            event_id = conn.execute(
+                "insert into shared_events (origin, event) values (?, ?)", (self.origin, payload)
+            ).lastrowid
+            if event_id % 100 == 0:
+                conn.execute("delete from shared_events where id <= ?", (event_id - SHARED_EVENT_HISTORY,))
+        return event_id
+
+    def events_after(self, after_id: int) -> List[Tuple[int, Dict[str, Any]]]:
+        """``(origin pid, event)`` for every stored event after ``after_id``, oldest first."""
+        rows = self.connection().execute(
+            "select id, origin, event from shared_events where id > ? order by id", (after_id,)
+        )
+        return [(row["origin"], {"id": row["id"], **json.loads(row["event"])}) for row in rows]
+
+    def last_event_id(self) -> int:
+        return self.connection().execute("select coalesce(max(id), 0) from shared_events").fetchone()[0]
+
+
+class SharedDemoRepository(SqliteIssueRepository):
+    """Demo data every worker reads and writes, seeded from the mock data once per file.
+
+    Replaces the per-process DemoStore under multiple workers, trading its
+    in-memory indexes for SQLite's so a vote on one worker is visible on all.
+    """
+
+    name = "shared-demo"
+
+    def __init__(self, path: str) -> None:
+        super().__init__(path)
+        issues = [Issue.from_api(i).to_row() for i in MOCK_ISSUES + MOCK_RESOLVED_ISSUES]
+        comments = [to_comment_row(c) for c in MOCK_COMMENTS]
+        # The immediate transaction serializes workers starting together; only the first one seeds.
+        with self.transaction() as conn:
+            if conn.execute("select 1 from shared_settings where key = 'demo_seeded'").fetchone():
+                return
+            conn.executemany(*self.import_statement("issues", issues))
+            conn.executemany(*self.import_statement("comments", comments))
+            conn.execute("insert into shared_settings (key, value) values ('demo_seeded', 'true')")
+
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "supabase").strip().lower()
+SQLITE_PATH = os.getenv("SQLITE_PATH", "civiclens.db")
+
+SHARED_STATE = Lazy(lambda: SharedState(SHARED_STATE_PATH) if SHARED_STATE_PATH else None)
+MEMORY_REPOSITORY = Lazy(lambda: InMemoryIssueRepository(DEMO_STORE.get()))
+SHARED_DEMO_REPOSITORY = Lazy(lambda: SharedDemoRepository(SHARED_STATE.get().path))
+SUPABASE_REPOSITORY = Lazy(lambda: SupabaseIssueRepository(client) if (client := SUPABASE_CLIENT.get()) else None)
+SQLITE_REPOSITORY = Lazy(lambda: SqliteIssueRepository(SQLITE_PATH) if STORAGE_BACKEND == "sqlite" else None)
+
+
+def get_repository() -> IssueRepository:
+    if is_demo_mode():
+        return SHARED_DEMO_REPOSITORY.get() if SHARED_STATE_PATH else MEMORY_REPOSITORY.get()
+    if STORAGE_BACKEND == "sqlite":
+        return SQLITE_REPOSITORY.get()
+    return SUPABASE_REPOSITORY.get() or MEMORY_REPOSITORY.get()
+
+
+def repository_name() -> str:
+    """Name of the backend get_repository() returns, without building it."""
+    if is_demo_mode():
+        return SharedDemoRepository.name if SHARED_STATE_PATH else "memory"
+    if STORAGE_BACKEND == "sqlite":
+        return "sqlite"
+    if SUPABASE_REPOSITORY.loaded:
+        return get_repository().name
+    configured = SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY and sdk_available("supabase")
+    return "supabase" if configured else "memory"
+
+
+def warm_up() -> Dict[str, float]:
+    """Build the active repository and the Gemini client ahead of traffic.
+
+    Call from a gunicorn ``post_worker_init`` hook or a platform warm-up
+    request, or set WARM_UP_ON_START. Returns per-step timings in ms.
+    """
+    timings: Dict[str, float] = {}
+    for name, step in (("repository", get_repository), ("gemini", GENAI.get)):
+        started = time.perf_counter()
+        step()
+        timings[name] = round((time.perf_counter() - started) * 1000, 2)
+    return timings
+
+
+class EventSubscription:
+    def __init__(
+        self,
+        issue_ids: Optional[set[str]] = None,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+        max_queue: int = 256,
+    ) -> None:
+        self.issue_ids = issue_ids or set()
+        self.bbox = bbox
+        self.queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_queue)
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        if not self.issue_ids and not self.bbox:
+            return True
+        if event.get("issueId") in self.issue_ids:
+            return True
+        coords = event.get("coordinates")
+        if self.bbox and coords:
+            min_lng, min_lat, max_lng, max_lat = self.bbox
+            return min_lat <= coords["lat"] <= max_lat and min_lng <= coords["lng"] <= max_lng
+        return False
+
+    def offer(self, event: Dict[str, Any]) -> None:
+        # Slow consumers lose their oldest events rather than blocking publishers.
+        while True:
+            try:
+                self.queue.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+
+class EventBroker:
+    """In-process pub/sub for issue change events.
+
+    Subscribers filter by issue id and/or a lng/lat bounding box. A shared
+    broker (Redis, Postgres LISTEN/NOTIFY, ...) can replace this by
+    providing the same ``publish``/``subscribe``/``unsubscribe``/``replay``
+    methods and fanning events in from the other processes.
+
+    Streams are long-lived, so production serves them from gevent workers
+    where each costs a greenlet rather than a thread. ``max_subscribers``
+    (0 = unlimited) keeps some of a worker's connections for ordinary
+    requests; ``subscribe`` returns None beyond it.
+    """
+
+    def __init__(self, history: int = 256, max_subscribers: int = 0) -> None:
+        self._lock = threading.Lock()
+        self._subscribers: set[EventSubscription] = set()
+        self._history: "deque[Dict[str, Any]]" = deque(maxlen=history)
+        self._next_id = 0
+        self.max_subscribers = max_subscribers
+
+    def subscribe(self, issue_ids=None, bbox=None) -> Optional[EventSubscription]:
+        sub = EventSubscription(issue_ids, bbox)
+        with self._lock:
+            if self.max_subscribers and len(self._subscribers) >= self.max_subscribers:
+                return None
+            self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: EventSubscription) -> None:
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def wants_locations(self) -> bool:
+        with self._lock:
+            return any(sub.bbox for sub in self._subscribers)
+
+    @staticmethod
+    def _event(
+        event_id: int,
+        event_type: str,
+        issue_id: str,
+        data: Dict[str, Any],
+        coordinates: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        return {
+            "id": event_id,
+            "type": event_type,
+            "issueId": issue_id,
+            "coordinates": coordinates,
+            "data": data,
+            "timestamp": now_iso(),
+        }
+
+    def _deliver(self, event: Dict[str, Any]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            if sub.matches(event):
+                sub.offer(event)
+
+    def publish(
+        self,
+        event_type: str,
+        issue_id: str,
+        data: Dict[str, Any],
+        coordinates: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        with self._lock:
+            self._next_id += 1
+            event = self._event(self._next_id, event_type, issue_id, data, coordinates)
+            self._history.append(event)
+        self._deliver(event)
+        return event
+
+    def replay(self, sub: EventSubscription, after_id: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [e for e in self._history if e["id"] > after_id and sub.matches(e)]
+
+
+class SharedEventBroker(EventBroker):
+    """EventBroker that fans events in from every worker through SharedState.
+
+    Published events are stored in ``shared_events`` and take its row id,
+    so Last-Event-ID means the same thing on every worker. The first
+    subscriber in a process starts a relay thread that polls for other
+    workers' events and delivers them locally.
+    """
+
+    def __init__(self, state: Lazy, max_subscribers: int = 0) -> None:
+        super().__init__(max_subscribers=max_subscribers)
+        self._state = state
+        self._relay: Optional[threading.Thread] = None
+
+    def subscribe(self, issue_ids=None, bbox=None) -> Optional[EventSubscription]:
+        with self._lock:
+            if self._relay is None:
+                self._relay = threading.Thread(target=self._run_relay, name="civiclens-event-relay", daemon=True)
+                self._relay.start()
+        return super().subscribe(issue_ids, bbox)
+
+    def publish(self, event_type, issue_id, data, coordinates=None):
+        event = self._event(0, event_type, issue_id, data, coordinates)
+        event["id"] = self._state.get().append_event(event)
+        self._deliver(event)
+        return event
+
+    def replay(self, sub, after_id):
+        return [event for _, event in self._state.get().events_after(after_id) if sub.matches(event)]
+
+    def _run_relay(self) -> None:
+        state = self._state.get()
+        last_id = state.last_event_id()
+        while True:
+            time.sleep(SHARED_POLL_SECONDS)
+            try:
+                if not state.changed():
+                    continue
+                for origin, event in state.events_after(last_id):
+                    last_id = event["id"]
+                    if origin != state.origin:
+                        self._deliver(event)
+            except sqlite3.Error:
+                METRICS.inc("event_errors_total", stage="relay")
+                app.logger.exception("Failed to relay shared events after id %s", last_id)
+                continue
+
+
+# Keep this below gunicorn's --worker-connections so streams never take every connection.
+SSE_MAX_SUBSCRIBERS = int(os.getenv("SSE_MAX_SUBSCRIBERS", "0"))
+SSE_RETRY_AFTER_SECONDS = 30
+EVENTS = (
+    SharedEventBroker(SHARED_STATE, max_subscribers=SSE_MAX_SUBSCRIBERS)
+    if SHARED_STATE_PATH
+    else EventBroker(max_subscribers=SSE_MAX_SUBSCRIBERS)
+)
+SSE_KEEPALIVE_SECONDS = float(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))
+
+
+def publish_issue_event(
+    event_type: str,
+    issue_id: str,
+    data: Dict[str, Any],
+    coordinates: Optional[Dict[str, Any]] = None,
+) -> None:
+    try:
+        if coordinates is None and EVENTS.wants_locations():
+            issue = get_repository().get_issue(issue_id)
+            coordinates = issue.coordinates if issue else None
+        EVENTS.publish(event_type, issue_id, data, coordinates)
+    except Exception:
+        # The write already succeeded; losing its event must not fail the request, but it must show.
+        METRICS.inc("event_errors_total", stage="publish")
+        app.logger.exception("Failed to publish %s for %s", event_type, issue_id)
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    payload = app.json.dumps(event)
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {payload}\n\n"
+
+
+CLASSIFY_MAX_PHOTOS = int(os.getenv("CLASSIFY_MAX_PHOTOS", "4"))
+CLASSIFY_DEADLINE_SECONDS = float(os.getenv("CLASSIFY_DEADLINE_SECONDS", "10"))
+CLASSIFY_WORKERS = int(os.getenv("CLASSIFY_WORKERS", "8"))
+# Separate from OUTBOUND_POOL so Supabase fan-out never queues ahead of Gemini calls.
+CLASSIFY_POOL = Lazy(lambda: ThreadPoolExecutor(max_workers=CLASSIFY_WORKERS, thread_name_prefix="civiclens-classify"))
+DEFAULT_SEVERITY_TEXT = "Severity appears moderate based on visible evidence."
+
+
+def classify_image_with_gemini(
+    photo_bytes: bytes, mime_type: str = "image/jpeg", timeout: Optional[float] = None
+) -> Optional[Dict[str, Any]]:
+    """Gemini's reading of one photo, or None if Gemini is unavailable or the call fails."""
+    genai = GENAI.get() if photo_bytes else None
+    if not genai:
+        return None
 
     try:
         model = genai.GenerativeModel("gemini-1.5-flash")
         image_part = {"mime_type": mime_type or "image/jpeg", "data": photo_bytes}
-        response = model.generate_content([GEMINI_PROMPT, image_part])
+        options = {"timeout": timeout} if timeout else None
+        with track_dependency("gemini", "generate_content"):
+            response = model.generate_content([GEMINI_PROMPT, image_part], request_options=options)
         text = (response.text or "").strip()
         if text.startswith("```"):
             text = text.strip("`").replace("json", "", 1).strip()
@@ -602,7 +3136,7 @@ def classify_image_with_gemini(photo_bytes: bytes, mime_type: str = "image/jpeg"
         category = str(payload.get("category", "other")).lower().strip()
         confidence = float(payload.get("confidence", 0.5))
         severity_score = int(payload.get("severity_score", 5))
-        severity_text = str(payload.get("severity_text", default_result["severity_text"]))
+        severity_text = str(payload.get("severity_text", DEFAULT_SEVERITY_TEXT))
 
         return {
             "category": category,
@@ -611,10 +3145,183 @@ def classify_image_with_gemini(photo_bytes: bytes, mime_type: str = "image/jpeg"
             "severity_text": severity_text,
         }
     except Exception:
-        return default_result
+        return None
+
+
+def aggregate_classifications(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine per-photo classifications, weighting each by its confidence.
+
+    Photos vote by normalized category and the one with the most total
+    confidence wins (ties go to the earlier photo). Its confidence is that
+    total over the number of photos, so disagreement between photos lowers
+    it; severity is the confidence-weighted mean over every photo. The
+    category label (Gemini's own, as a single photo would report it) and the
+    explanation come from the most confident photo of the winning category.
+    """
+    totals: Dict[str, float] = {}
+    for result in results:
+        category = normalize_category(result["category"])
+        totals[category] = totals.get(category, 0.0) + result["confidence"]
+    category = max(totals, key=totals.get)
+    weight = sum(r["confidence"] for r in results)
+    if weight:
+        severity = sum(r["confidence"] * r["severity_score"] for r in results) / weight
+    else:
+        severity = sum(r["severity_score"] for r in results) / len(results)
+    best = max(
+        (r for r in results if normalize_category(r["category"]) == category), key=lambda r: r["confidence"]
+    )
+    return {
+        "category": best["category"],
+        "confidence": totals[category] / len(results),
+        "severity_score": min(max(round(severity), 1), 10),
+        "severity_text": best["severity_text"],
+    }
+
+
+def classify_photos(photos: List[Tuple[bytes, str]]) -> Optional[Dict[str, Any]]:
+    """Classify up to CLASSIFY_MAX_PHOTOS photos at once and aggregate the results.
+
+    Calls run on CLASSIFY_POOL and share one CLASSIFY_DEADLINE_SECONDS
+    deadline, so the wait is the slowest call at most, never the sum. The
+    deadline includes any time spent queued when more than CLASSIFY_WORKERS
+    photos are in flight across requests.
+    Photos that fail or miss the deadline are left out; None means no photo
+    was classified and the caller keeps its defaults.
+    """
+    photos = [(data, mime) for data, mime in photos[:CLASSIFY_MAX_PHOTOS] if data]
+    if not photos or not GENAI.get():
+        return None
+    pool = CLASSIFY_POOL.get()
+    futures = [
+        pool.submit(contextvars.copy_context().run, classify_image_with_gemini, data, mime, CLASSIFY_DEADLINE_SECONDS)
+        for data, mime in photos
+    ]
+    with span("gemini.classify_photos", count=len(futures)):
+        done, pending = wait(futures, timeout=CLASSIFY_DEADLINE_SECONDS)
+    for future in pending:
+        # Calls already running finish in the background; their results are dropped.
+        future.cancel()
+        METRICS.inc("photo_classifications_total", result="timeout")
+    results = []
+    for future in futures:
+        if future not in done:
+            continue
+        result = future.result()
+        METRICS.inc("photo_classifications_total", result="ok" if result else "failed")
+        if result:
+            results.append(result)
+    return aggregate_classifications(results) if results else None
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson when it is installed.
+
+    Falls back to the stdlib encoder (still unsorted and UTF-8) when orjson
+    is missing or rejects a value, such as a dict with non-string keys.
+    Dates, dataclasses and enums go through ``default`` on both paths so
+    they encode the same way; NaN and infinity do not (orjson writes null).
+    """
+
+    sort_keys = False
+    ensure_ascii = False
+    ORJSON_OPTIONS = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS) if orjson else 0
+
+    @staticmethod
+    def default(o: Any) -> Any:
+        if isinstance(o, Issue):
+            return o.to_dict()
+        if isinstance(o, Enum):
+            return o.value
+        return DefaultJSONProvider.default(o)
+
+    def dumps_bytes(self, obj: Any, indent: bool = False) -> bytes:
+        if orjson is not None:
+            options = self.ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if indent else 0)
+            try:
+                return orjson.dumps(obj, default=self.default, option=options)
+            except TypeError:
+                pass
+        separators = None if indent else (",", ":")
+        return super().dumps(obj, indent=2 if indent else None, separators=separators).encode("utf-8")
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if orjson is not None and set(kwargs) <= {"indent", "separators"}:
+            return self.dumps_bytes(obj, indent=bool(kwargs.get("indent"))).decode("utf-8")
+        if not kwargs.get("indent"):
+            kwargs.setdefault("separators", (",", ":"))
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        with span("json.encode"):
+            body = self.dumps_bytes(obj, indent=indent)
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+
+
+STREAM_JSON_MIN_ITEMS = int(os.getenv("STREAM_JSON_MIN_ITEMS", "500"))
+STREAM_JSON_CHUNK_ITEMS = 256
+
+
+def iter_json_array(items: Iterable[Any]) -> Iterator[bytes]:
+    """Encode ``items`` as a JSON array in chunks of STREAM_JSON_CHUNK_ITEMS."""
+    encode = app.json.dumps_bytes
+    yield b"["
+    batch: List[bytes] = []
+    first = True
+    for item in items:
+        batch.append(encode(item))
+        if len(batch) >= STREAM_JSON_CHUNK_ITEMS:
+            yield (b"" if first else b",") + b",".join(batch)
+            first = False
+            batch = []
+    if batch:
+        yield (b"" if first else b",") + b",".join(batch)
+    yield b"]"
+
+
+def iter_json(obj: Any) -> Iterator[bytes]:
+    if isinstance(obj, dict):
+        yield b"{"
+        for idx, (key, value) in enumerate(obj.items()):
+            yield (b"," if idx else b"") + app.json.dumps_bytes(str(key)) + b":"
+            yield from iter_json(value)
+        yield b"}"
+    elif isinstance(obj, (list, tuple)) or hasattr(obj, "__next__"):
+        yield from iter_json_array(obj)
+    else:
+        yield app.json.dumps_bytes(obj)
+
+
+def json_response(obj: Any, status: int = 200) -> Response:
+    """jsonify for potentially large payloads.
+
+    Lists (or dicts of lists) with at least STREAM_JSON_MIN_ITEMS entries, and
+    any generator, are written incrementally instead of being built in memory.
+    """
+    if hasattr(obj, "__next__"):
+        size = STREAM_JSON_MIN_ITEMS
+    elif isinstance(obj, dict):
+        size = sum(len(v) for v in obj.values() if isinstance(v, (list, tuple)))
+    elif isinstance(obj, (list, tuple)):
+        size = len(obj)
+    else:
+        size = 0
+    if size < STREAM_JSON_MIN_ITEMS:
+        return app.json.response(obj), status
+    return Response(iter_json(obj), status=status, mimetype="application/json")
 
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
+# compact stays None, so responses are indented exactly when app.debug is on:
+# under `python app.py` (debug per FLASK_DEBUG, default on) but not gunicorn.
 
 allowed_origins = {"http://localhost:3000", "https://localhost:3000"}
 frontend_url = os.getenv("FRONTEND_URL")
@@ -641,6 +3348,253 @@ CORS(
 )
 
 
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_BUFFER_SIZE = int(os.getenv("PROFILE_BUFFER_SIZE", "50"))
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "1000"))
+PROFILE_TOP_FUNCTIONS = 40
+
+PROFILES: "deque[Dict[str, Any]]" = deque(maxlen=PROFILE_BUFFER_SIZE)
+_profiles_lock = threading.Lock()
+_profile_ids = itertools.count(1)
+
+
+def profile_authorized() -> bool:
+    # Like the admin endpoints, closed unless a token is configured.
+    value = request.headers.get("X-Profile", "")
+    return bool(PROFILE_TOKEN) and hmac.compare_digest(value, PROFILE_TOKEN)
+
+
+@app.before_request
+def start_request_trace() -> None:
+    g.spans = []
+    if not (profile_authorized() or (PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE)):
+        return
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Another thread is already profiling (only one profiler may be active on 3.12+).
+        return
+    g.profiler = profiler
+
+
+@app.after_request
+def finish_request_trace(response: Response) -> Response:
+    """Keep a trace of profiled or slow requests in the PROFILES ring buffer.
+
+    Registered before the metrics and compression hooks, so it runs last and
+    the recorded duration covers the whole request.
+    """
+    profiler = g.pop("profiler", None)
+    if profiler is not None:
+        profiler.disable()
+    started = g.get("request_started")
+    if started is None:
+        return response
+    duration_ms = (time.perf_counter() - started) * 1000
+    if profiler is None and duration_ms < SLOW_REQUEST_MS:
+        return response
+
+    profile_text = None
+    if profiler is not None:
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_TOP_FUNCTIONS)
+        profile_text = out.getvalue()
+
+    entry = {
+        "id": next(_profile_ids),
+        "timestamp": now_iso(),
+        "method": request.method,
+        # Query strings can carry user data (e.g. /api/contacts coordinates); keep the path only.
+        "path": request.path,
+        "route": request.url_rule.rule if request.url_rule else None,
+        "status": response.status_code,
+        "durationMs": round(duration_ms, 3),
+        "reason": "profiled" if profiler is not None else "slow",
+        "spans": g.get("spans") or [],
+        "profile": profile_text,
+    }
+    with _profiles_lock:
+        PROFILES.append(entry)
+    response.headers["X-Profile-Id"] = str(entry["id"])
+    return response
+
+
+@app.before_request
+def start_request_timer() -> None:
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def record_request_metrics(response: Response) -> Response:
+    # Registered before compress_response, so it runs after it and the timing includes compression.
+    started = g.get("request_started")
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        METRICS.observe("http_request_duration_seconds", time.perf_counter() - started, route=route, method=request.method)
+        METRICS.inc("http_requests_total", route=route, method=request.method, status=response.status_code)
+    return response
+
+
+def _demo_store_sizes() -> Dict[Tuple[Tuple[str, str], ...], float]:
+    # Scraping must not be what builds the demo store.
+    if not DEMO_STORE.loaded:
+        return {}
+    store = DEMO_STORE.get()
+    with store.lock.read():
+        return {
+            (("collection", "issues"),): len(store.issues_by_id),
+            (("collection", "comments"),): sum(len(c) for c in store.comments_by_issue.values()),
+            (("collection", "upvote_sessions"),): sum(len(s) for s in store.upvote_sessions.values()),
+            (("collection", "resolve_sessions"),): sum(len(s) for s in store.resolve_sessions.values()),
+        }
+
+
+METRICS.describe("demo_store_size", "gauge", "Entries held by the in-memory demo store.")
+METRICS.gauge("demo_store_size", _demo_store_sizes)
+METRICS.describe("sse_subscribers", "gauge", "Open /api/events streams.")
+METRICS.describe("event_errors_total", "counter", "Issue events that failed to publish or relay, by stage.")
+METRICS.describe("sse_rejected_total", "counter", "/api/events streams refused at SSE_MAX_SUBSCRIBERS.")
+METRICS.gauge("sse_subscribers", lambda: EVENTS.subscriber_count())
+
+
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+COMPRESS_CACHE_SIZE = int(os.getenv("COMPRESS_CACHE_SIZE", "256"))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+class CompressedBodyCache:
+    """Small LRU of compressed bodies keyed by (ETag, encoding).
+
+    Static payloads (contacts, hotlines) and unchanged lists hash to the same
+    ETag, so they are compressed once and then served from memory.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Tuple[str, str]) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, key: Tuple[str, str], body: bytes) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+COMPRESSED_BODIES = CompressedBodyCache(COMPRESS_CACHE_SIZE)
+METRICS.describe("compressed_body_cache_entries", "gauge", "Compressed response bodies cached by ETag.")
+METRICS.gauge("compressed_body_cache_entries", lambda: len(COMPRESSED_BODIES))
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    offered: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if token:
+            offered[token.strip().lower()] = q
+    for encoding in ("br", "gzip"):
+        if encoding == "br" and brotli is None:
+            continue
+        if offered.get(encoding, offered.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress_bytes(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL)
+
+
+def compress_stream(chunks: Iterable[Any], encoding: str) -> Iterator[bytes]:
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        compress, finish = compressor.process, compressor.finish
+    else:
+        zobj = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+        compress, finish = zobj.compress, zobj.flush
+    for chunk in chunks:
+        out = compress(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+        if out:
+            yield out
+    yield finish()
+
+
+@app.after_request
+def compress_response(response: Response) -> Response:
+    """Negotiate gzip/brotli for /api/* responses and answer If-None-Match.
+
+    Bodies under COMPRESS_MIN_BYTES are sent as-is, streamed bodies are
+    compressed chunk by chunk, and buffered GET bodies get an ETag so
+    repeated payloads are served from COMPRESSED_BODIES or as 304s.
+    """
+    if (
+        not request.path.startswith("/api/")
+        or response.status_code != 200
+        or response.mimetype == "text/event-stream"
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    encoding = choose_encoding(request.headers.get("Accept-Encoding", ""))
+
+    if response.is_streamed:
+        if encoding:
+            response.response = compress_stream(response.response, encoding)
+            response.headers["Content-Encoding"] = encoding
+            response.headers.pop("Content-Length", None)
+        return response
+
+    data = response.get_data()
+    etag = None
+    if request.method in ("GET", "HEAD"):
+        etag = hashlib.sha1(data).hexdigest()
+        tag = f"{etag}-{encoding}" if encoding and len(data) >= COMPRESS_MIN_BYTES else etag
+        response.set_etag(tag)
+        if tag in request.if_none_match:
+            response.status_code = 304
+            response.set_data(b"")
+            return response
+
+    if not encoding or len(data) < COMPRESS_MIN_BYTES:
+        return response
+
+    body = COMPRESSED_BODIES.get((etag, encoding)) if etag else None
+    if etag:
+        METRICS.inc("cache_requests_total", cache="compressed_body", result="hit" if body is not None else "miss")
+    if body is None:
+        body = compress_bytes(data, encoding)
+        if etag:
+            COMPRESSED_BODIES.put((etag, encoding), body)
+    response.set_data(body)
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
 @app.get("/api/health")
 def get_health():
     return jsonify(
@@ -649,32 +3603,62 @@ def get_health():
             "status": "healthy",
             "timestamp": now_iso(),
             "demo_mode": is_demo_mode(),
-            "supabase_enabled": bool(supabase),
-            "gemini_enabled": bool(genai and GEMINI_API_KEY),
+            "supabase_enabled": bool(SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY and sdk_available("supabase")),
+            "storage_backend": repository_name(),
+            "gemini_enabled": bool(GEMINI_API_KEY and sdk_available("google.generativeai")),
         }
     )
 
 
 @app.get("/api/mock-data")
 def get_mock_data_bundle():
-    return jsonify(
+    return json_response(
         {
-            "mockIssues": deepcopy(MOCK_ISSUES),
-            "mockResolvedIssues": deepcopy(MOCK_RESOLVED_ISSUES),
-            "mockComments": deepcopy(MOCK_COMMENTS),
-            "emergencyContacts": deepcopy(MOCK_EMERGENCY_CONTACTS),
-            "nationalHotlines": deepcopy(MOCK_NATIONAL_HOTLINES),
+            "mockIssues": MOCK_ISSUES,
+            "mockResolvedIssues": MOCK_RESOLVED_ISSUES,
+            "mockComments": MOCK_COMMENTS,
+            "emergencyContacts": MOCK_EMERGENCY_CONTACTS,
+            "nationalHotlines": MOCK_NATIONAL_HOTLINES,
         }
     )
 
 
+@app.get("/api/metrics")
+def get_metrics():
+    return Response(METRICS.render(), mimetype="text/plain; version=0.0.4")
+
+
+def admin_profiles_allowed() -> bool:
+    return profile_authorized() or admin_token_valid()
+
+
+@app.get("/api/admin/profiles")
+def list_profiles():
+    if not admin_profiles_allowed():
+        return jsonify({"error": "Forbidden"}), 403
+    with _profiles_lock:
+        entries = list(PROFILES)
+    return jsonify([{k: v for k, v in e.items() if k not in ("spans", "profile")} for e in reversed(entries)])
+
+
+@app.get("/api/admin/profiles/<int:profile_id>")
+def get_profile(profile_id: int):
+    if not admin_profiles_allowed():
+        return jsonify({"error": "Forbidden"}), 403
+    with _profiles_lock:
+        entry = next((e for e in PROFILES if e["id"] == profile_id), None)
+    if entry is None:
+        return jsonify({"error": "Profile not found"}), 404
+    return jsonify(entry)
+
+
 @app.get("/api/admin/demo-mode")
 def get_demo_mode_state():
     return jsonify(
         {
             "demo_mode": is_demo_mode(),
             "env_default": DEMO_MODE_ENV_DEFAULT,
-            "runtime_override": _demo_mode_override,
+            "runtime_override": demo_mode_override(),
         }
     )
 
@@ -695,74 +3679,219 @@ def set_demo_mode_state():
     )
 
 
-def apply_issue_filters(issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    status = request.args.get("status")
-    category = request.args.get("category")
-    sort_by = request.args.get("sort", "upvotes")
+class TTLCache:
+    """Time-based cache for aggregate responses that are expensive to recompute.
+
+    Lookups are counted under ``analytics_cache_total``, or under
+    ``cache_requests_total`` with the cache's ``name`` when it has one.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 256, name: Optional[str] = None) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.name = name
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _count(self, result: str) -> None:
+        if self.name:
+            METRICS.inc("cache_requests_total", cache=self.name, result=result)
+        else:
+            METRICS.inc("analytics_cache_total", result=result)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_or_compute(self, key: Any, compute: Any) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self._count("hit")
+                return entry[1]
+        self._count("miss")
+        value = compute()
+        with self._lock:
+            self._entries[key] = (now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+
+ANALYTICS_CACHE_SECONDS = float(os.getenv("ANALYTICS_CACHE_SECONDS", "60"))
+ANALYTICS_MAX_DAYS = 730
+ANALYTICS_CACHE = TTLCache(ANALYTICS_CACHE_SECONDS)
+
+
+def analytics_params() -> Tuple[datetime, str]:
+    """Parse ``days`` and ``groupBy``; the window starts at a UTC midnight so buckets are whole days."""
+    try:
+        days = min(max(int(request.args.get("days", "90")), 1), ANALYTICS_MAX_DAYS)
+    except ValueError:
+        raise ValueError("days must be an integer")
+    group_by = request.args.get("groupBy", "none")
+    if group_by not in ANALYTICS_GROUPS:
+        raise ValueError(f"groupBy must be one of {', '.join(ANALYTICS_GROUPS)}")
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    return today - timedelta(days=days - 1), group_by
+
+
+@app.get("/api/analytics/trends")
+def get_trends():
+    bucket = request.args.get("bucket", "day")
+    try:
+        if bucket not in ANALYTICS_BUCKETS:
+            raise ValueError("bucket must be day or week")
+        since, group_by = analytics_params()
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    repo = get_repository()
+    try:
+        series = ANALYTICS_CACHE.get_or_compute(
+            ("trends", repo.name, bucket, since, group_by), lambda: repo.trends(bucket, since, group_by)
+        )
+    except Exception as exc:
+        return jsonify({"error": f"Failed to compute trends: {exc}"}), 500
+    since_iso = since.isoformat().replace("+00:00", "Z")
+    return jsonify({"bucket": bucket, "groupBy": group_by, "since": since_iso, "series": series})
 
-    filtered = issues
-    if status:
-        filtered = [i for i in filtered if i.get("status") == status]
-    if category:
-        filtered = [i for i in filtered if i.get("category") == category]
 
-    if sort_by == "recent":
-        filtered.sort(key=lambda x: x.get("createdAt", ""), reverse=True)
-    else:
-        filtered.sort(key=lambda x: int(x.get("upvotes", 0)), reverse=True)
+@app.get("/api/analytics/resolution-times")
+def get_resolution_times():
+    try:
+        since, group_by = analytics_params()
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    repo = get_repository()
+    try:
+        items = ANALYTICS_CACHE.get_or_compute(
+            ("resolution", repo.name, since, group_by), lambda: repo.resolution_times(since, group_by)
+        )
+    except Exception as exc:
+        return jsonify({"error": f"Failed to compute resolution times: {exc}"}), 500
+    return jsonify({"groupBy": group_by, "since": since.isoformat().replace("+00:00", "Z"), "items": items})
+
 
-    limit = request.args.get("limit")
-    if limit:
+@app.get("/api/analytics/top-open")
+def get_top_open():
+    try:
+        per_district = min(max(int(request.args.get("perDistrict", "5")), 1), 50)
+    except ValueError:
+        return jsonify({"error": "perDistrict must be an integer"}), 400
+    repo = get_repository()
+    try:
+        districts = ANALYTICS_CACHE.get_or_compute(
+            ("top-open", repo.name, per_district), lambda: repo.top_open_by_district(per_district)
+        )
+    except Exception as exc:
+        return jsonify({"error": f"Failed to fetch top issues: {exc}"}), 500
+    return jsonify({"perDistrict": per_district, "districts": districts})
+
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+BULK_MIMETYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def admin_token_valid() -> bool:
+    supplied = request.headers.get("X-Admin-Token", "")
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(supplied, ADMIN_TOKEN)
+
+
+@app.get("/api/admin/export/<kind>")
+def export_bulk(kind: str):
+    if not admin_token_valid():
+        return jsonify({"error": "Forbidden"}), 403
+    fmt = request.args.get("format", "ndjson")
+    if kind not in BULK_COLUMNS or fmt not in BULK_MIMETYPES:
+        return jsonify({"error": f"kind must be one of {', '.join(BULK_COLUMNS)}; format ndjson or csv"}), 400
+    try:
+        after = parse_bulk_key(kind, request.args.get("after"))
+    except ValueError as exc:
+        return jsonify({"error": f"Invalid after cursor: {exc}"}), 400
+
+    rows = get_repository().export_rows(kind, after)
+    response = Response(stream_with_context(iter_bulk_export(kind, rows, fmt)), mimetype=BULK_MIMETYPES[fmt])
+    response.headers["Content-Disposition"] = f'attachment; filename="{kind}.{fmt}"'
+    return response
+
+
+@app.post("/api/admin/import/<kind>")
+def import_bulk_upload(kind: str):
+    if not admin_token_valid():
+        return jsonify({"error": "Forbidden"}), 403
+    fmt = request.args.get("format") or ("csv" if request.mimetype == "text/csv" else "ndjson")
+    if kind not in BULK_COLUMNS or fmt not in BULK_MIMETYPES:
+        return jsonify({"error": f"kind must be one of {', '.join(BULK_COLUMNS)}; format ndjson or csv"}), 400
+
+    # Read the body as a stream so memory stays flat however large the upload is.
+    lines = io.TextIOWrapper(io.BufferedReader(request.stream), encoding="utf-8", newline="")
+    try:
+        summary = import_bulk(get_repository(), kind, iter_bulk_records(lines, fmt))
+    except (UnicodeDecodeError, csv.Error) as exc:
+        return jsonify({"error": f"Unreadable {fmt} body: {exc}"}), 400
+    return jsonify(summary)
+
+
+def issue_query_from_request() -> Dict[str, Any]:
+    limit: Optional[int] = None
+    raw_limit = request.args.get("limit")
+    if raw_limit:
         try:
-            n = int(limit)
+            n = int(raw_limit)
             if n > 0:
-                filtered = filtered[:n]
+                limit = n
         except Exception:
             pass
-
-    return filtered
+    return {
+        "status": request.args.get("status") or None,
+        "category": request.args.get("category") or None,
+        "sort_by": request.args.get("sort", "upvotes"),
+        "limit": limit,
+    }
 
 
 @app.get("/api/issues")
 def get_issues():
-    if is_demo_mode() or not supabase:
-        with DEMO_STORE.lock:
-            issues = deepcopy(DEMO_STORE.all_issues())
-        return jsonify(apply_issue_filters(issues))
-
     try:
-        query = supabase.table("issues").select("*")
-        status = request.args.get("status")
-        category = request.args.get("category")
-        if status:
-            query = query.eq("status", status)
-        if category:
-            query = query.eq("category", category)
-
-        data = query.execute().data or []
-        issues = [to_issue_shape(row) for row in data]
-        issues = apply_issue_filters(issues)
-        return jsonify(issues)
+        return json_response(get_repository().list_issues(**issue_query_from_request()))
     except Exception as exc:
         return jsonify({"error": f"Failed to fetch issues: {exc}"}), 500
 
 
 @app.get("/api/issues/<issue_id>")
 def get_issue_by_id(issue_id: str):
-    if is_demo_mode() or not supabase:
-        with DEMO_STORE.lock:
-            issue = next((i for i in DEMO_STORE.all_issues() if i.get("id") == issue_id), None)
+    try:
+        issue = get_repository().get_issue(issue_id)
         if not issue:
             return jsonify({"error": "Issue not found"}), 404
-        return jsonify(deepcopy(issue))
+        return jsonify(issue)
+    except Exception as exc:
+        return jsonify({"error": f"Failed to fetch issue: {exc}"}), 500
+
+
+DETAIL_COMMENTS_PAGE = 20
+DETAIL_COMMENTS_MAX = 100
 
+
+@app.get("/api/issues/<issue_id>/full")
+def get_issue_full(issue_id: str):
     try:
-        data = supabase.table("issues").select("*").eq("id", issue_id).limit(1).execute().data
-        if not data:
-            return jsonify({"error": "Issue not found"}), 404
-        return jsonify(to_issue_shape(data[0]))
+        comment_limit = min(max(int(request.args.get("comments", str(DETAIL_COMMENTS_PAGE))), 1), DETAIL_COMMENTS_MAX)
+    except ValueError:
+        return jsonify({"error": "comments must be an integer"}), 400
+    sid_hash = session_hash(get_session_id())
+    try:
+        detail = get_repository().issue_detail(issue_id, sid_hash, comment_limit)
     except Exception as exc:
         return jsonify({"error": f"Failed to fetch issue: {exc}"}), 500
+    if detail is None:
+        return jsonify({"error": "Issue not found"}), 404
+    return jsonify(detail)
 
 
 @app.post("/api/issues")
@@ -783,24 +3912,25 @@ def create_issue():
 
     photos = request.files.getlist("photos")
     photo_urls: List[str] = []
-    first_photo = photos[0] if photos else None
 
     ai_result = {
         "category": category,
         "confidence": 0.5,
         "severity_score": 5,
-        "severity_text": "Severity appears moderate based on visible evidence.",
+        "severity_text": DEFAULT_SEVERITY_TEXT,
     }
 
-    if first_photo:
-        photo_bytes = first_photo.read()
-        first_photo.stream.seek(0)
-        ai_result = classify_image_with_gemini(photo_bytes, first_photo.mimetype or "image/jpeg")
-        category = normalize_category(ai_result.get("category", category))
+    uploads = []
+    for photo in photos[:CLASSIFY_MAX_PHOTOS]:
+        uploads.append((photo.read(), photo.mimetype or "image/jpeg"))
+        photo.stream.seek(0)
+    classified = classify_photos(uploads)
+    if classified:
+        ai_result = classified
+        category = normalize_category(ai_result["category"])
 
-    issue_id = f"CL-{datetime.now(timezone.utc).year}-{str(random.randint(1, 9999)).zfill(4)}"
     payload = {
-        "id": issue_id,
+        "id": None,
         "title": title,
         "description": description,
         "category": category,
@@ -817,91 +3947,31 @@ def create_issue():
         "aiConfidence": int(float(ai_result.get("confidence", 0.5)) * 100),
         "aiCategory": ai_result.get("category", "other"),
         "severityScore": int(ai_result.get("severity_score", 5)),
-        "severityText": ai_result.get("severity_text", "Severity appears moderate based on visible evidence."),
+        "severityText": ai_result.get("severity_text", DEFAULT_SEVERITY_TEXT),
         "resolutionConfirmations": 0,
     }
 
-    if is_demo_mode() or not supabase:
-        with DEMO_STORE.lock:
-            DEMO_STORE.issues.insert(0, deepcopy(payload))
-        return jsonify(payload), 201
-
     try:
-        db_payload = {
-            "id": issue_id,
-            "title": title,
-            "description": description,
-            "category": category,
-            "severity": severity,
-            "status": "open",
-            "location": location,
-            "lat": rounded_lat,
-            "lng": rounded_lng,
-            "photos": photo_urls,
-            "upvotes": 0,
-            "comment_count": 0,
-            "reporter": "Anonymous" if is_anonymous else "Citizen",
-            "is_anonymous": is_anonymous,
-            "ai_confidence": int(float(ai_result.get("confidence", 0.5)) * 100),
-            "ai_category": ai_result.get("category", "other"),
-            "severity_score": int(ai_result.get("severity_score", 5)),
-            "severity_text": ai_result.get("severity_text", "Severity appears moderate based on visible evidence."),
-            "resolution_confirmations": 0,
-        }
-        created = supabase.table("issues").insert(db_payload).execute().data
-        if not created:
-            return jsonify({"error": "Failed to create issue"}), 500
-        return jsonify(to_issue_shape(created[0])), 201
+        created = get_repository().create_issue(Issue.from_api(payload))
     except Exception as exc:
         return jsonify({"error": f"Failed to create issue: {exc}"}), 500
+    publish_issue_event("issue.created", created.id, created, created.coordinates)
+    return jsonify(created), 201
 
 
 @app.post("/api/issues/<issue_id>/upvote")
 def upvote_issue(issue_id: str):
     sid_hash = session_hash(get_session_id())
-
-    if is_demo_mode() or not supabase:
-        key = f"{issue_id}:{sid_hash}"
-        with DEMO_STORE.lock:
-            issue = next((i for i in DEMO_STORE.all_issues() if i.get("id") == issue_id), None)
-            if not issue:
-                return jsonify({"error": "Issue not found"}), 404
-            if key in DEMO_STORE.upvote_sessions:
-                return jsonify({"issueId": issue_id, "upvotes": issue.get("upvotes", 0), "duplicate": True})
-            DEMO_STORE.upvote_sessions.add(key)
-            issue["upvotes"] = int(issue.get("upvotes", 0)) + 1
-            return jsonify({"issueId": issue_id, "upvotes": issue["upvotes"], "duplicate": False})
-
     try:
-        existing_vote = (
-            supabase.table("issue_votes")
-            .select("id")
-            .eq("issue_id", issue_id)
-            .eq("session_hash", sid_hash)
-            .eq("vote_type", "upvote")
-            .limit(1)
-            .execute()
-            .data
-        )
-        if existing_vote:
-            issue = supabase.table("issues").select("upvotes").eq("id", issue_id).limit(1).execute().data
-            count = int(issue[0].get("upvotes", 0)) if issue else 0
-            return jsonify({"issueId": issue_id, "upvotes": count, "duplicate": True})
-
-        supabase.table("issue_votes").insert(
-            {"issue_id": issue_id, "session_hash": sid_hash, "vote_type": "upvote"}
-        ).execute()
-        issue = supabase.table("issues").select("upvotes").eq("id", issue_id).limit(1).execute().data
-        if not issue:
-            return jsonify({"error": "Issue not found"}), 404
-        new_count = int(issue[0].get("upvotes", 0)) + 1
-        updated = (
-            supabase.table("issues").update({"upvotes": new_count}).eq("id", issue_id).execute().data
-        )
-        final_count = int(updated[0].get("upvotes", new_count)) if updated else new_count
-        return jsonify({"issueId": issue_id, "upvotes": final_count, "duplicate": False})
+        result = get_repository().upvote(issue_id, sid_hash)
     except Exception as exc:
         return jsonify({"error": f"Failed to upvote: {exc}"}), 500
+    if result is None:
+        return jsonify({"error": "Issue not found"}), 404
+    METRICS.inc("votes_total", kind="upvote", duplicate=str(result["duplicate"]).lower())
+    if not result["duplicate"]:
+        publish_issue_event("issue.upvoted", issue_id, {"upvotes": result["upvotes"]})
+    return jsonify(result)
 
 
 @app.post("/api/issues/<issue_id>/resolve-vote")
@@ -912,101 +3982,24 @@ def resolve_vote(issue_id: str):
         return jsonify({"error": "vote must be 'yes' or 'no'"}), 400
 
     sid_hash = session_hash(get_session_id())
-
-    if is_demo_mode() or not supabase:
-        key = f"{issue_id}:{sid_hash}"
-        with DEMO_STORE.lock:
-            issue = next((i for i in DEMO_STORE.all_issues() if i.get("id") == issue_id), None)
-            if not issue:
-                return jsonify({"error": "Issue not found"}), 404
-
-            if issue_id not in DEMO_STORE.resolve_vote_counts:
-                DEMO_STORE.resolve_vote_counts[issue_id] = {
-                    "yes": int(issue.get("resolutionConfirmations", 0) or 0),
-                    "no": 0,
-                }
-
-            counts = DEMO_STORE.resolve_vote_counts[issue_id]
-            if key in DEMO_STORE.resolve_sessions:
-                return jsonify(
-                    {
-                        "issueId": issue_id,
-                        "yes": counts["yes"],
-                        "no": counts["no"],
-                        "total": counts["yes"] + counts["no"],
-                        "duplicate": True,
-                    }
-                )
-
-            DEMO_STORE.resolve_sessions.add(key)
-            counts[vote] = int(counts.get(vote, 0)) + 1
-            issue["resolutionConfirmations"] = counts["yes"]
-            return jsonify(
-                {
-                    "issueId": issue_id,
-                    "yes": counts["yes"],
-                    "no": counts["no"],
-                    "total": counts["yes"] + counts["no"],
-                    "duplicate": False,
-                }
-            )
-
     try:
-        existing = (
-            supabase.table("resolve_votes")
-            .select("id")
-            .eq("issue_id", issue_id)
-            .eq("session_hash", sid_hash)
-            .limit(1)
-            .execute()
-            .data
-        )
-        if existing:
-            yes_count = (
-                supabase.table("resolve_votes").select("id", count="exact").eq("issue_id", issue_id).eq("vote", "yes").execute().count
-            ) or 0
-            no_count = (
-                supabase.table("resolve_votes").select("id", count="exact").eq("issue_id", issue_id).eq("vote", "no").execute().count
-            ) or 0
-            return jsonify({"issueId": issue_id, "yes": yes_count, "no": no_count, "total": yes_count + no_count, "duplicate": True})
-
-        supabase.table("resolve_votes").insert(
-            {"issue_id": issue_id, "session_hash": sid_hash, "vote": vote}
-        ).execute()
-
-        yes_count = (
-            supabase.table("resolve_votes").select("id", count="exact").eq("issue_id", issue_id).eq("vote", "yes").execute().count
-        ) or 0
-        no_count = (
-            supabase.table("resolve_votes").select("id", count="exact").eq("issue_id", issue_id).eq("vote", "no").execute().count
-        ) or 0
-
-        supabase.table("issues").update({"resolution_confirmations": yes_count}).eq("id", issue_id).execute()
-
-        return jsonify({"issueId": issue_id, "yes": yes_count, "no": no_count, "total": yes_count + no_count, "duplicate": False})
+        result = get_repository().resolve_vote(issue_id, sid_hash, vote)
     except Exception as exc:
         return jsonify({"error": f"Failed to submit resolve vote: {exc}"}), 500
+    if result is None:
+        return jsonify({"error": "Issue not found"}), 404
+    METRICS.inc("votes_total", kind="resolve", duplicate=str(result["duplicate"]).lower())
+    if not result["duplicate"]:
+        publish_issue_event(
+            "issue.resolve_vote", issue_id, {"yes": result["yes"], "no": result["no"], "total": result["total"]}
+        )
+    return jsonify(result)
 
 
 @app.get("/api/issues/<issue_id>/comments")
 def get_comments(issue_id: str):
-    if is_demo_mode() or not supabase:
-        with DEMO_STORE.lock:
-            comments = [c for c in DEMO_STORE.comments if c.get("issueId") == issue_id]
-        comments.sort(key=lambda c: c.get("createdAt", ""), reverse=True)
-        return jsonify(deepcopy(comments))
-
     try:
-        data = (
-            supabase.table("comments")
-            .select("*")
-            .eq("issue_id", issue_id)
-            .order("created_at", desc=True)
-            .execute()
-            .data
-            or []
-        )
-        return jsonify([to_comment_shape(c) for c in data])
+        return jsonify(get_repository().list_comments(issue_id))
     except Exception as exc:
         return jsonify({"error": f"Failed to fetch comments: {exc}"}), 500
 
@@ -1021,7 +4014,7 @@ def post_comment(issue_id: str):
 
     sid_hash = session_hash(get_session_id())
     comment = {
-        "id": f"c-{int(datetime.now(timezone.utc).timestamp() * 1000)}",
+        "id": f"c-{uuid.uuid4().hex}",
         "issueId": issue_id,
         "text": text,
         "author": "Anonymous" if anonymous else "Citizen",
@@ -1029,98 +4022,204 @@ def post_comment(issue_id: str):
         "createdAt": now_iso(),
     }
 
-    if is_demo_mode() or not supabase:
-        with DEMO_STORE.lock:
-            DEMO_STORE.comments.insert(0, deepcopy(comment))
-            issue = next((i for i in DEMO_STORE.all_issues() if i.get("id") == issue_id), None)
-            if issue:
-                issue["commentCount"] = int(issue.get("commentCount", 0)) + 1
-        return jsonify(comment), 201
-
     try:
-        db_comment = {
-            "id": comment["id"],
-            "issue_id": issue_id,
-            "text": text,
-            "author": "Anonymous" if anonymous else "Citizen",
-            "is_anonymous": anonymous,
-            "session_hash": sid_hash,
-        }
-        created = supabase.table("comments").insert(db_comment).execute().data
-        existing_issue = supabase.table("issues").select("comment_count").eq("id", issue_id).limit(1).execute().data
-        if existing_issue:
-            count = int(existing_issue[0].get("comment_count", 0)) + 1
-            supabase.table("issues").update({"comment_count": count}).eq("id", issue_id).execute()
-        if not created:
-            return jsonify(comment), 201
-        return jsonify(to_comment_shape(created[0])), 201
+        created = get_repository().add_comment(comment, sid_hash)
     except Exception as exc:
         return jsonify({"error": f"Failed to post comment: {exc}"}), 500
+    if created is None:
+        return jsonify({"error": "Issue not found"}), 404
+    publish_issue_event("comment.created", issue_id, created)
+    return jsonify(created), 201
 
 
 @app.get("/api/stats")
 def get_stats():
-    if is_demo_mode() or not supabase:
-        with DEMO_STORE.lock:
-            all_issues = DEMO_STORE.all_issues()
-            total_reports = len(all_issues)
-            resolved_this_week = len([i for i in DEMO_STORE.resolved_issues])
-            active_issues = len([i for i in all_issues if i.get("status") != "resolved"])
-            category_counts: Dict[str, int] = {}
-            for issue in all_issues:
-                category = issue.get("category", "other")
-                category_counts[category] = category_counts.get(category, 0) + 1
-            top_category = max(category_counts.items(), key=lambda x: x[1])[0] if category_counts else "other"
-        return jsonify(
-            {
-                "totalReports": total_reports,
-                "resolvedThisWeek": resolved_this_week,
-                "activeIssues": active_issues,
-                "topCategory": top_category,
-            }
-        )
+    try:
+        return jsonify(get_repository().stats())
+    except Exception as exc:
+        return jsonify({"error": f"Failed to fetch stats: {exc}"}), 500
+
+
+CHANGES_PAGE_SIZE = 500
+CHANGES_MAX_PAGE_SIZE = 5000
+
+
+@app.get("/api/changes")
+def get_changes():
+    try:
+        since = int(request.args.get("since", "0"))
+        limit = min(max(int(request.args.get("limit", str(CHANGES_PAGE_SIZE))), 1), CHANGES_MAX_PAGE_SIZE)
+    except ValueError:
+        return jsonify({"error": "since and limit must be integers"}), 400
+    if since < 0:
+        return jsonify({"error": "since must not be negative"}), 400
+    try:
+        return json_response(get_repository().changes_since(since, limit))
+    except Exception as exc:
+        return jsonify({"error": f"Failed to fetch changes: {exc}"}), 500
+
+
+def parse_bbox(value: Optional[str]) -> Optional[Tuple[float, float, float, float]]:
+    if not value:
+        return None
+    parts = [float(p) for p in value.split(",")]
+    if len(parts) != 4:
+        raise ValueError("bbox must be minLng,minLat,maxLng,maxLat")
+    return parts[0], parts[1], parts[2], parts[3]
+
+
+@app.get("/api/events")
+def stream_events():
+    """Server-Sent Events stream of issue changes.
 
+    ``?issue=<id>`` (repeatable) and ``?bbox=minLng,minLat,maxLng,maxLat``
+    narrow the stream; with neither, every event is delivered.
+    """
     try:
-        all_rows = supabase.table("issues").select("id,status,category,resolved_at").execute().data or []
-        total_reports = len(all_rows)
-        active_issues = len([r for r in all_rows if r.get("status") != "resolved"])
-        now = datetime.now(timezone.utc)
-        resolved_this_week = 0
-        category_counts: Dict[str, int] = {}
-
-        for row in all_rows:
-            category = row.get("category", "other")
-            category_counts[category] = category_counts.get(category, 0) + 1
-            resolved_at = row.get("resolved_at")
-            if resolved_at:
+        bbox = parse_bbox(request.args.get("bbox"))
+    except ValueError as exc:
+        return jsonify({"error": f"Invalid bbox: {exc}"}), 400
+    issue_ids = set(request.args.getlist("issue"))
+    last_event_id = request.headers.get("Last-Event-ID") or request.args.get("lastEventId")
+
+    sub = EVENTS.subscribe(issue_ids, bbox)
+    if sub is None:
+        METRICS.inc("sse_rejected_total")
+        response = jsonify({"error": "Too many live update streams; retry later"})
+        response.headers["Retry-After"] = str(SSE_RETRY_AFTER_SECONDS)
+        return response, 503
+    backlog = EVENTS.replay(sub, int(last_event_id)) if last_event_id and last_event_id.isdigit() else []
+
+    def generate():
+        try:
+            yield "retry: 3000\n\n"
+            for event in backlog:
+                yield format_sse(event)
+            while True:
                 try:
-                    dt = datetime.fromisoformat(str(resolved_at).replace("Z", "+00:00"))
-                    if (now - dt).days <= 7:
-                        resolved_this_week += 1
-                except Exception:
-                    pass
+                    event = sub.queue.get(timeout=SSE_KEEPALIVE_SECONDS)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_sse(event)
+        finally:
+            EVENTS.unsubscribe(sub)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+CONTACT_SERVICE_TYPES = ("police", "medical", "utilities", "government")
+CONTACTS_CACHE_SECONDS = float(os.getenv("CONTACTS_CACHE_SECONDS", "300"))
+CONTACTS_PER_TYPE = 2
+CONTACTS_MAX_PER_TYPE = 10
+
+
+class ContactDirectory:
+    """Emergency contacts indexed for the lookups /api/contacts serves.
+
+    ``contacts`` keeps the source order for the unfiltered list. Every
+    (district, service type) filter, with None for "any", maps to its
+    contacts with 24/7 lines first, and every district centroid maps to
+    the districts that have contacts, nearest first. A request is then a dict
+    lookup plus at most a short walk down that list; nothing is filtered or
+    sorted per request.
+    """
+
+    def __init__(self, contacts: List[Dict[str, Any]]) -> None:
+        self.contacts = contacts
+        self._index: Dict[Tuple[Optional[str], Optional[str]], List[Dict[str, Any]]] = {}
+        for contact in sorted(contacts, key=lambda c: not c.get("is247")):
+            district = contact.get("district")
+            service = contact.get("serviceType")
+            for key in ((district, None), (None, service), (district, service)):
+                self._index.setdefault(key, []).append(contact)
+        centroids = {name: (lat, lng) for name, lat, lng in DISTRICT_CENTROIDS}
+        covered = [name for name in centroids if (name, None) in self._index]
+        self._nearest = {
+            home: sorted(covered, key=lambda d: (centroids[d][0] - lat) ** 2 + (centroids[d][1] - lng) ** 2)
+            for home, (lat, lng) in centroids.items()
+        }
+
+    def lookup(self, district: Optional[str] = None, service: Optional[str] = None) -> List[Dict[str, Any]]:
+        if district is None and service is None:
+            return self.contacts
+        return self._index.get((district, service), [])
+
+    def nearest(self, district: str, service: Optional[str], per_type: int) -> List[Dict[str, Any]]:
+        """The first ``per_type`` contacts of each service type from the nearest district that has one."""
+        found: List[Dict[str, Any]] = []
+        for stype in (service,) if service else CONTACT_SERVICE_TYPES:
+            for candidate in self._nearest.get(district, ()):
+                contacts = self._index.get((candidate, stype))
+                if contacts:
+                    found.extend(contacts[:per_type])
+                    break
+        return found
 
-        top_category = max(category_counts.items(), key=lambda x: x[1])[0] if category_counts else "other"
-        return jsonify(
-            {
-                "totalReports": total_reports,
-                "resolvedThisWeek": resolved_this_week,
-                "activeIssues": active_issues,
-                "topCategory": top_category,
-            }
-        )
-    except Exception as exc:
-        return jsonify({"error": f"Failed to fetch stats: {exc}"}), 500
+
+CONTACTS_CACHE = TTLCache(CONTACTS_CACHE_SECONDS, max_entries=8, name="contacts")
+
+
+def contacts_generation() -> int:
+    # Under multiple workers a reload bumps this shared counter so every process rebuilds.
+    shared = SHARED_STATE.get()
+    return (shared.setting("contacts_generation") or 0) if shared is not None else 0
+
+
+def contact_directory() -> ContactDirectory:
+    repo = get_repository()
+    return CONTACTS_CACHE.get_or_compute(
+        (repo.name, contacts_generation()), lambda: ContactDirectory(repo.list_contacts())
+    )
 
 
 @app.get("/api/contacts")
 def get_contacts():
-    return jsonify(deepcopy(MOCK_EMERGENCY_CONTACTS))
+    district = request.args.get("district") or None
+    service = request.args.get("type") or None
+    if service and service not in CONTACT_SERVICE_TYPES:
+        return jsonify({"error": f"type must be one of {', '.join(CONTACT_SERVICE_TYPES)}"}), 400
+    lat = request.args.get("lat")
+    lng = request.args.get("lng")
+    if (lat is None) != (lng is None):
+        return jsonify({"error": "lat and lng must be given together"}), 400
+    try:
+        per_type = min(max(int(request.args.get("limit", str(CONTACTS_PER_TYPE))), 1), CONTACTS_MAX_PER_TYPE)
+        if lat is not None:
+            district = district_for(float(lat), float(lng))
+    except ValueError:
+        return jsonify({"error": "lat and lng must be numbers and limit an integer"}), 400
+    try:
+        directory = contact_directory()
+    except Exception as exc:
+        return jsonify({"error": f"Failed to fetch contacts: {exc}"}), 500
+    if lat is not None:
+        return json_response(directory.nearest(district, service, per_type))
+    return json_response(directory.lookup(district, service))
+
+
+@app.post("/api/admin/contacts/reload")
+def reload_contacts():
+    if not admin_token_valid():
+        return jsonify({"error": "Forbidden"}), 403
+    CONTACTS_CACHE.invalidate()
+    shared = SHARED_STATE.get()
+    if shared is not None:
+        shared.set_setting("contacts_generation", contacts_generation() + 1)
+    return jsonify({"contacts": len(contact_directory().contacts)})
 
 
 @app.get("/api/hotlines")
 def get_hotlines():
-    return jsonify(deepcopy(MOCK_NATIONAL_HOTLINES))
+    return jsonify(MOCK_NATIONAL_HOTLINES)
+
+
+if _env_bool("WARM_UP_ON_START", False):
+    threading.Thread(target=warm_up, name="civiclens-warm-up", daemon=True).start()
 
 
 if __name__ == "__main__":
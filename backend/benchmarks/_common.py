@@ -0,0 +1,91 @@
+"""Result files and regression checks shared by the benchmark scripts.
+
+Each script builds a report ``{"meta": ..., "results": ...}``, writes it with
+``--out`` and compares it against an earlier report with ``--compare``.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def report_meta(**fields: Any) -> Dict[str, Any]:
+    """Where and when a report was produced, plus the script's own run parameters."""
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        **fields,
+    }
+
+
+def add_report_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--compare", help="baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown before a regression is flagged")
+
+
+def compare(current: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[str]:
+    """Print each metric against the baseline and return those slower by more than ``threshold``."""
+    regressions = []
+    for name, now in current.items():
+        before = baseline.get(name)
+        if not before or before <= 0:
+            continue
+        ratio = now / before
+        marker = ""
+        if ratio > 1 + threshold:
+            marker = "  REGRESSION"
+            regressions.append(name)
+        print(f"  {name:<40} {before:>9.3f} -> {now:>9.3f} ms ({ratio:5.2f}x){marker}")
+    return regressions
+
+
+def finish(
+    report: Dict[str, Any],
+    args: argparse.Namespace,
+    metrics: Callable[[Dict[str, Any]], Dict[str, float]],
+    same_meta: Iterable[str] = (),
+) -> int:
+    """Handle ``--out`` and ``--compare``; the exit status is 1 when a metric regressed.
+
+    ``metrics`` flattens a report into ``{name: milliseconds}``. Meta fields in
+    ``same_meta`` should match the baseline for the comparison to be fair, so
+    a mismatch is reported.
+    """
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.out}")
+
+    if not args.compare:
+        return 0
+    with open(args.compare) as f:
+        baseline = json.load(f)
+    for key in same_meta:
+        if baseline["meta"].get(key) != report["meta"].get(key):
+            print(f"\nWarning: baseline ran with {key}={baseline['meta'].get(key)}, this run with {report['meta'].get(key)}")
+    print(f"\nCompared with {baseline['meta'].get('commit')}:")
+    regressions = compare(metrics(report), metrics(baseline), args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
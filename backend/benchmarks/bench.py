@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Benchmark the CivicLens API against a seeded demo store.
+
+Seeds the in-memory DemoStore with synthetic issues, votes and comments from
+seed_data.py, then drives every /api/* route through the Flask test client
+(handler cost, single thread) and over HTTP with concurrent workers (full
+stack). Results are written as JSON so runs on different commits can be
+compared:
+
+    python benchmarks/bench.py --scale 100000 --out results/base.json
+    python benchmarks/bench.py --scale 100000 --compare results/base.json
+
+Run from the backend directory. DEMO_MODE is forced on, so no Supabase or
+Gemini credentials are needed.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import resource
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from _common import BACKEND_DIR, add_report_arguments, finish, report_meta
+
+sys.path.insert(0, BACKEND_DIR)
+os.environ["DEMO_MODE"] = "true"
+os.environ.setdefault("PROFILE_SAMPLE_RATE", "0")
+os.environ.setdefault("ADMIN_TOKEN", "bench")
+
+import app as civiclens  # noqa: E402
+import seed_data  # noqa: E402
+
+FULL_LIST_MAX = 100_000
+WARMUP_REQUESTS = 10
+
+# (name, method, path template, body kind). {id} is replaced by a seeded issue id.
+ROUTES = [
+    ("health", "GET", "/api/health", None),
+    ("mock_data", "GET", "/api/mock-data", None),
+    ("metrics", "GET", "/api/metrics", None),
+    ("demo_mode", "GET", "/api/admin/demo-mode", None),
+    ("profiles", "GET", "/api/admin/profiles", None),
+    ("issues_full", "GET", "/api/issues", None),
+    ("issues_top50", "GET", "/api/issues?limit=50", None),
+    ("issues_recent_open", "GET", "/api/issues?sort=recent&status=open&limit=50", None),
+    ("issues_trending", "GET", "/api/issues?sort=trending&limit=50", None),
+    ("issues_category", "GET", "/api/issues?category=potholes&limit=50", None),
+    ("issue_detail", "GET", "/api/issues/{id}", None),
+    ("issue_full", "GET", "/api/issues/{id}/full", None),
+    ("comments", "GET", "/api/issues/{id}/comments", None),
+    ("stats", "GET", "/api/stats", None),
+    ("changes", "GET", "/api/changes?since=0&limit=500", None),
+    ("trends", "GET", "/api/analytics/trends?bucket=week&groupBy=district", None),
+    ("resolution_times", "GET", "/api/analytics/resolution-times?groupBy=category", None),
+    ("top_open", "GET", "/api/analytics/top-open", None),
+    ("contacts", "GET", "/api/contacts", None),
+    ("contacts_nearest", "GET", "/api/contacts?lat=6.05&lng=80.22", None),
+    ("hotlines", "GET", "/api/hotlines", None),
+    ("create_issue", "POST", "/api/issues", "form"),
+    ("upvote", "POST", "/api/issues/{id}/upvote", None),
+    ("resolve_vote", "POST", "/api/issues/{id}/resolve-vote", "vote"),
+    ("post_comment", "POST", "/api/issues/{id}/comments", "comment"),
+]
+# /api/events is a long-lived stream and is not benchmarked here.
+
+
+def rss_mb() -> float:
+    """Current resident set size in MiB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+def seed_store(store: "civiclens.DemoStore", scale: int, seed: int) -> List[str]:
+    """Add ``scale`` synthetic issues (with votes and comments) and return their ids."""
+    ids: List[str] = []
+
+    def track(items):
+        for item in items:
+            ids.append(item.row["id"])
+            yield item
+
+    seed_data.write_demo_store(store, track(seed_data.generate(scale, seed=seed)))
+    return ids
+
+
+def build_request(route: Tuple[str, str, str, Optional[str]], ids: List[str], rng: random.Random, i: int):
+    """Return (method, path, headers, body, content_type) for one request of ``route``."""
+    _, method, template, kind = route
+    path = template.replace("{id}", rng.choice(ids)) if "{id}" in template else template
+    headers = {"X-Session-ID": f"bench-{i}", "Accept-Encoding": "gzip"}
+    if path.startswith("/api/admin/"):
+        headers["X-Admin-Token"] = os.environ["ADMIN_TOKEN"]
+    if kind == "form":
+        body = f"title=Bench+{i}&description=Load+test&category=garbage&lat=6.9&lng=79.86"
+        return method, path, headers, body.encode(), "application/x-www-form-urlencoded"
+    if kind == "vote":
+        return method, path, headers, json.dumps({"vote": rng.choice(["yes", "no"])}).encode(), "application/json"
+    if kind == "comment":
+        return method, path, headers, json.dumps({"text": f"Bench comment {i}"}).encode(), "application/json"
+    return method, path, headers, None, None
+
+
+def summarize(latencies: List[float], errors: int, wall: float) -> Dict[str, Any]:
+    latencies.sort()
+    count = len(latencies)
+
+    def pct(p: float) -> float:
+        return round(latencies[min(count - 1, int(p * count))] * 1000, 3) if count else 0.0
+
+    return {
+        "count": count,
+        "errors": errors,
+        "rps": round(count / wall, 1) if wall > 0 else 0.0,
+        "meanMs": round(sum(latencies) / count * 1000, 3) if count else 0.0,
+        "p50Ms": pct(0.50),
+        "p99Ms": pct(0.99),
+    }
+
+
+def run_test_client(routes, ids: List[str], requests: int, rng: random.Random) -> Dict[str, Dict[str, Any]]:
+    client = civiclens.app.test_client()
+    results = {}
+    for route in routes:
+        for i in range(WARMUP_REQUESTS):
+            method, path, headers, body, content_type = build_request(route, ids, rng, -1 - i)
+            client.open(path, method=method, headers=headers, data=body, content_type=content_type).get_data()
+        latencies: List[float] = []
+        errors = 0
+        wall_start = time.perf_counter()
+        for i in range(requests):
+            method, path, headers, body, content_type = build_request(route, ids, rng, i)
+            start = time.perf_counter()
+            response = client.open(path, method=method, headers=headers, data=body, content_type=content_type)
+            response.get_data()
+            latencies.append(time.perf_counter() - start)
+            errors += response.status_code >= 400
+        results[route[0]] = summarize(latencies, errors, time.perf_counter() - wall_start)
+        print(f"  {route[0]:<20} {results[route[0]]['p50Ms']:>9.3f} ms p50 {results[route[0]]['p99Ms']:>9.3f} ms p99")
+    return results
+
+
+def remote_issue_ids(base_url: str) -> List[str]:
+    """Issue ids to target on an external server, which has its own data."""
+    parts = urlsplit(base_url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=60)
+    conn.request("GET", "/api/issues?limit=1000")
+    ids = [issue["id"] for issue in json.loads(conn.getresponse().read())]
+    conn.close()
+    return ids
+
+
+def start_server() -> Tuple[str, Callable[[], None]]:
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args: Any, **kwargs: Any) -> None:
+            pass
+
+    server = make_server("127.0.0.1", 0, civiclens.app, threaded=True, request_handler=QuietHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return f"http://127.0.0.1:{server.server_port}", server.shutdown
+
+
+def run_http(routes, ids: List[str], requests: int, concurrency: int, base_url: str, seed: int):
+    parts = urlsplit(base_url)
+    results = {}
+
+    def worker(route, worker_id: int, count: int) -> Tuple[List[float], int]:
+        rng = random.Random(seed * 1000 + worker_id)
+        conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=60)
+        latencies: List[float] = []
+        errors = 0
+        for i in range(count):
+            method, path, headers, body, content_type = build_request(route, ids, rng, worker_id * count + i)
+            if content_type:
+                headers["Content-Type"] = content_type
+            start = time.perf_counter()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                errors += response.status >= 400
+                if response.getheader("Connection", "").lower() == "close" or response.version == 10:
+                    conn.close()
+            except (OSError, http.client.HTTPException):
+                errors += 1
+                conn.close()
+            latencies.append(time.perf_counter() - start)
+        conn.close()
+        return latencies, errors
+
+    per_worker = max(1, requests // concurrency)
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for route in routes:
+            wall_start = time.perf_counter()
+            outcomes = list(pool.map(lambda w: worker(route, w, per_worker), range(concurrency)))
+            wall = time.perf_counter() - wall_start
+            latencies = [lat for lats, _ in outcomes for lat in lats]
+            results[route[0]] = summarize(latencies, sum(e for _, e in outcomes), wall)
+            r = results[route[0]]
+            print(f"  {route[0]:<20} {r['rps']:>9.1f} req/s {r['p50Ms']:>9.3f} ms p50 {r['p99Ms']:>9.3f} ms p99")
+    return results
+
+
+def latencies(report: Dict[str, Any]) -> Dict[str, float]:
+    """p50 and p99 per mode and route, as compared between runs."""
+    return {
+        f"{mode}/{name} {metric}": route[metric]
+        for mode, routes in report.get("results", {}).items()
+        for name, route in routes.items()
+        for metric in ("p50Ms", "p99Ms")
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", type=int, default=1000, help="synthetic issues to seed (e.g. 1000, 100000, 1000000)")
+    parser.add_argument("--requests", type=int, default=500, help="requests per route and mode")
+    parser.add_argument("--concurrency", type=int, default=8, help="HTTP worker threads")
+    parser.add_argument("--mode", choices=["client", "http", "both"], default="both")
+    parser.add_argument(
+        "--url", help="benchmark an already running server (e.g. gunicorn) instead of seeding an in-process one"
+    )
+    parser.add_argument("--routes", help="comma-separated route names to run (default: all)")
+    parser.add_argument("--seed", type=int, default=1)
+    add_report_arguments(parser)
+    args = parser.parse_args()
+
+    routes = ROUTES
+    if args.routes:
+        wanted = set(args.routes.split(","))
+        routes = [r for r in ROUTES if r[0] in wanted]
+    if args.scale > FULL_LIST_MAX:
+        # Unpaginated lists at this size measure serialization of the whole table, not the API.
+        routes = [r for r in routes if r[0] != "issues_full"]
+
+    rng = random.Random(args.seed)
+    if args.url:
+        args.scale = 0
+    rss_before = rss_mb()
+    seed_start = time.perf_counter()
+    ids = seed_store(civiclens.DEMO_STORE.get(), args.scale, args.seed)
+    seed_seconds = time.perf_counter() - seed_start
+    rss_after = rss_mb()
+    print(f"Seeded {args.scale} issues in {seed_seconds:.1f}s, store RSS +{rss_after - rss_before:.1f} MiB")
+
+    report: Dict[str, Any] = {
+        "meta": report_meta(scale=args.scale, requests=args.requests, concurrency=args.concurrency, seed=args.seed),
+        "seed": {
+            "seconds": round(seed_seconds, 3),
+            "rssMb": round(rss_after, 1),
+            "storeMb": round(rss_after - rss_before, 1),
+            "bytesPerIssue": round((rss_after - rss_before) * 2**20 / max(args.scale, 1)),
+        },
+        "results": {},
+    }
+
+    if args.mode in ("client", "both") and not args.url:
+        print("\nFlask test client (single thread):")
+        report["results"]["client"] = run_test_client(routes, ids, args.requests, rng)
+
+    if args.mode in ("http", "both") or args.url:
+        stop = None
+        base_url = args.url
+        if base_url:
+            ids = remote_issue_ids(base_url)
+        else:
+            base_url, stop = start_server()
+        print(f"\nHTTP {base_url} ({args.concurrency} workers):")
+        try:
+            report["results"]["http"] = run_http(routes, ids, args.requests, args.concurrency, base_url, args.seed)
+        finally:
+            if stop:
+                stop()
+
+    report["seed"]["peakRssMb"] = round(peak_rss_mb(), 1)
+
+    return finish(report, args, latencies, same_meta=("scale",))
+
+if __name__ == "__main__":
+    sys.exit(main())
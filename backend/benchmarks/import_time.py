@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Measure CivicLens cold-start latency.
+
+Each run starts a fresh interpreter, imports app.py and serves the first
+requests through the Flask test client, which is what a new serverless or
+autoscaled instance pays before it can answer traffic. ``-X importtime``
+output from the same run names the slowest imports. Results are JSON so
+runs on different commits can be compared:
+
+    python benchmarks/import_time.py --out results/cold-base.json
+    python benchmarks/import_time.py --compare results/cold-base.json
+
+Run from the backend directory. Environment overrides such as
+--env DEMO_MODE=false --env STORAGE_BACKEND=sqlite select the startup path.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict
+
+from _common import BACKEND_DIR, add_report_arguments, finish, report_meta
+
+# Runs inside the child interpreter; prints one JSON line on stdout.
+CHILD = """
+import json, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+client = app.app.test_client()
+timings = {"importMs": (imported - started) * 1000}
+for name, path in PATHS:
+    t = time.perf_counter()
+    client.get(path)
+    timings[name + "Ms"] = (time.perf_counter() - t) * 1000
+timings["readyMs"] = (time.perf_counter() - started) * 1000
+print(json.dumps(timings))
+"""
+
+FIRST_REQUESTS = [("health", "/api/health"), ("contacts", "/api/contacts"), ("issues", "/api/issues?limit=50")]
+TOP_IMPORTS = 15
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """Cumulative microseconds per top-level package from ``-X importtime`` output."""
+    cumulative: Dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, total_us, name = line[len("import time:"):].split("|")
+        package = name.strip().split(".")[0]
+        # The outermost import of a package has the largest cumulative time and includes the rest.
+        cumulative[package] = max(cumulative.get(package, 0), int(total_us))
+    return cumulative
+
+
+def run_once(env: Dict[str, str]) -> Dict[str, Any]:
+    code = f"PATHS = {FIRST_REQUESTS!r}\n{CHILD}"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "child failed")
+    timings = json.loads(proc.stdout.strip().splitlines()[-1])
+    return {"timings": timings, "imports": parse_importtime(proc.stderr)}
+
+
+def medians(report: Dict[str, Any]) -> Dict[str, float]:
+    return {metric: r["medianMs"] for metric, r in report.get("results", {}).items()}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10, help="fresh interpreters to start")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="environment override")
+    add_report_arguments(parser)
+    args = parser.parse_args()
+
+    env = dict(os.environ, PROFILE_SAMPLE_RATE="0", WARM_UP_ON_START="false")
+    for item in args.env:
+        key, _, value = item.partition("=")
+        env[key] = value
+
+    runs = [run_once(env) for _ in range(args.runs)]
+    results: Dict[str, Dict[str, float]] = {}
+    for metric in runs[0]["timings"]:
+        values = [run["timings"][metric] for run in runs]
+        results[metric] = {
+            "medianMs": round(statistics.median(values), 2),
+            "minMs": round(min(values), 2),
+            "maxMs": round(max(values), 2),
+        }
+    imports: Dict[str, float] = {}
+    for package in runs[0]["imports"]:
+        imports[package] = round(statistics.median(run["imports"].get(package, 0) for run in runs) / 1000, 2)
+    slowest = dict(sorted(imports.items(), key=lambda item: item[1], reverse=True)[:TOP_IMPORTS])
+
+    print(f"Cold start over {args.runs} runs (median / min / max):")
+    for metric, r in results.items():
+        print(f"  {metric:<12} {r['medianMs']:>9.1f} {r['minMs']:>9.1f} {r['maxMs']:>9.1f} ms")
+    print("\nSlowest imports (cumulative, median):")
+    for package, ms in slowest.items():
+        print(f"  {package:<28} {ms:>9.1f} ms")
+
+    report = {
+        "meta": report_meta(runs=args.runs, env=args.env),
+        "results": results,
+        "imports": slowest,
+    }
+    return finish(report, args, medians, same_meta=("env",))
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Bulk import and export of CivicLens issues, comments and votes.
+
+Works directly against the configured storage backend (DEMO_MODE=false plus
+STORAGE_BACKEND=sqlite or the Supabase settings in .env). Files are NDJSON
+or CSV, chosen from the file extension unless --format is given.
+
+Usage:
+    python bulk.py export issues issues.ndjson
+    python bulk.py import issues issues.ndjson
+    python bulk.py import comments comments.csv
+
+Both directions save a checkpoint (<file>.checkpoint) after every batch, and
+re-running an interrupted command resumes from it. Import issues before
+their comments and votes.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from itertools import islice
+from typing import Any, Dict, Iterator, Optional
+
+import app as civiclens
+
+
+def checkpoint_path(path: str) -> str:
+    return f"{path}.checkpoint"
+
+
+def load_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(checkpoint_path(path), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_checkpoint(path: str, state: Dict[str, Any]) -> None:
+    tmp = checkpoint_path(path) + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, checkpoint_path(path))
+
+
+def export_file(repo: civiclens.IssueRepository, kind: str, path: str, fmt: str) -> Dict[str, Any]:
+    state = load_checkpoint(path)
+    if state and os.path.exists(path):
+        print(f"Resuming export at row {state['rows'] + 1}")
+        out = open(path, "r+b")
+        # Drop anything written after the last checkpoint; it is exported again.
+        out.truncate(state["offset"])
+        out.seek(state["offset"])
+        after = civiclens.parse_bulk_key(kind, state["lastKey"])
+    else:
+        state = {"kind": kind, "rows": 0, "lastKey": None, "offset": 0}
+        out = open(path, "wb")
+        if fmt == "csv":
+            out.write((",".join(civiclens.BULK_COLUMNS[kind]) + "\r\n").encode("utf-8"))
+        state["offset"] = out.tell()
+        save_checkpoint(path, state)
+        after = None
+
+    with out:
+        rows = repo.export_rows(kind, after)
+        while batch := list(islice(rows, civiclens.BULK_BATCH_SIZE)):
+            out.write("".join(civiclens.iter_bulk_export(kind, batch, fmt, header=False)).encode("utf-8"))
+            out.flush()
+            state["rows"] += len(batch)
+            state["lastKey"] = civiclens.format_bulk_key(civiclens.bulk_key(kind, batch[-1]))
+            state["offset"] = out.tell()
+            save_checkpoint(path, state)
+    return state
+
+
+def import_file(repo: civiclens.IssueRepository, kind: str, path: str, fmt: str) -> Dict[str, Any]:
+    state = load_checkpoint(path) or {"kind": kind, "rows": 0, "imported": 0, "skipped": 0, "offset": 0}
+    if state["offset"]:
+        print(f"Resuming import at row {state['rows'] + 1} (byte {state['offset']})")
+    base = dict(state)
+    position = state["offset"]
+
+    def lines(f: Any) -> Iterator[str]:
+        nonlocal position
+        if fmt == "csv" and position:
+            # The header names the columns; re-read it before jumping to the checkpoint.
+            yield f.readline().decode("utf-8")
+        f.seek(position)
+        for raw in iter(f.readline, b""):
+            position = f.tell()
+            yield raw.decode("utf-8")
+
+    def on_batch(summary: Dict[str, Any]) -> None:
+        for name in ("rows", "imported", "skipped"):
+            state[name] = base[name] + summary[name]
+        state["offset"] = position
+        state["lastKey"] = summary["lastKey"]
+        save_checkpoint(path, state)
+
+    with open(path, "rb") as f:
+        summary = civiclens.import_bulk(repo, kind, civiclens.iter_bulk_records(lines(f), fmt), on_batch=on_batch)
+    on_batch(summary)
+    state["errors"] = summary["errors"]
+    return state
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Bulk import/export of CivicLens data.")
+    parser.add_argument("action", choices=["import", "export"])
+    parser.add_argument("kind", choices=list(civiclens.BULK_COLUMNS))
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=list(civiclens.BULK_MIMETYPES), help="default: from the file extension")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+    repo = civiclens.get_repository()
+    if repo.name == "memory":
+        print("Error: no database configured. Set DEMO_MODE=false and STORAGE_BACKEND=sqlite or the Supabase keys")
+        return 1
+    if args.restart and os.path.exists(checkpoint_path(args.path)):
+        os.remove(checkpoint_path(args.path))
+
+    started = time.perf_counter()
+    if args.action == "export":
+        result = export_file(repo, args.kind, args.path, fmt)
+        print(f"Exported {result['rows']} {args.kind} from {repo.name} to {args.path}")
+    else:
+        result = import_file(repo, args.kind, args.path, fmt)
+        print(f"Imported {result['imported']} {args.kind} into {repo.name}, skipped {result['skipped']}")
+        for error in result["errors"]:
+            print(f"  {error}")
+    os.remove(checkpoint_path(args.path))
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,21 @@
 -- Enable UUID generation
 create extension if not exists pgcrypto;
 
+-- Trending feed score (sort=trending): log2 of upvotes, comments and severity
+-- plus the creation time in 48-hour half-lives. It only changes with the
+-- issue's own counters, so issues.trending_score is a stored generated column.
+-- Keep the weights in step with trending_score() in app.py.
+create or replace function public.issue_trending_score(
+  upvotes integer, comment_count integer, severity_score integer, created_at timestamptz
+)
+returns double precision
+language sql
+immutable
+as $$
+  select ln(1 + coalesce(upvotes, 0) + 2 * coalesce(comment_count, 0) + coalesce(severity_score, 0)) / ln(2)
+       + extract(epoch from created_at) / (48 * 3600)
+$$;
+
 -- Issues table
 create table if not exists public.issues (
   id text primary key,
@@ -28,12 +43,71 @@ create table if not exists public.issues (
   resolution_confirmations integer not null default 0,
   resolved_at timestamptz,
   resolved_by text check (resolved_by in ('community','reporter','official')),
-  metadata jsonb not null default '{}'::jsonb
+  district text,
+  metadata jsonb not null default '{}'::jsonb,
+  version bigint not null default 0,
+  counts_version bigint not null default 0,
+  trending_score double precision generated always as (
+    public.issue_trending_score(upvotes, comment_count, severity_score, created_at)
+  ) stored
 );
 
+-- Added after the first release; brings older databases up to date.
+alter table public.issues add column if not exists district text;
+alter table public.issues add column if not exists version bigint not null default 0;
+alter table public.issues add column if not exists counts_version bigint not null default 0;
+alter table public.issues add column if not exists trending_score double precision generated always as (
+  public.issue_trending_score(upvotes, comment_count, severity_score, created_at)
+) stored;
+
+-- Rows from before the district column get the nearest district centroid,
+-- the same rule (and list, in the same order for ties) as district_for() in app.py.
+update public.issues i
+set district = (
+  select c.name
+  from (values
+    (1, 'Colombo', 6.927, 79.861),
+    (2, 'Gampaha', 7.091, 79.999),
+    (3, 'Kalutara', 6.585, 79.960),
+    (4, 'Kandy', 7.291, 80.636),
+    (5, 'Matale', 7.467, 80.623),
+    (6, 'Nuwara Eliya', 6.970, 80.783),
+    (7, 'Galle', 6.053, 80.221),
+    (8, 'Matara', 5.949, 80.546),
+    (9, 'Hambantota', 6.124, 81.119),
+    (10, 'Jaffna', 9.662, 80.025),
+    (11, 'Kilinochchi', 9.380, 80.400),
+    (12, 'Mannar', 8.977, 79.904),
+    (13, 'Vavuniya', 8.751, 80.498),
+    (14, 'Mullaitivu', 9.267, 80.814),
+    (15, 'Batticaloa', 7.731, 81.674),
+    (16, 'Ampara', 7.298, 81.672),
+    (17, 'Trincomalee', 8.587, 81.215),
+    (18, 'Kurunegala', 7.487, 80.365),
+    (19, 'Puttalam', 8.036, 79.828),
+    (20, 'Anuradhapura', 8.311, 80.403),
+    (21, 'Polonnaruwa', 7.940, 81.000),
+    (22, 'Badulla', 6.990, 81.055),
+    (23, 'Monaragala', 6.873, 81.350),
+    (24, 'Ratnapura', 6.683, 80.399),
+    (25, 'Kegalle', 7.251, 80.346)
+  ) as c(ord, name, lat, lng)
+  order by (c.lat - i.lat) ^ 2 + (c.lng - i.lng) ^ 2, c.ord
+  limit 1
+)
+where i.district is null and i.lat is not null and i.lng is not null;
+
 create index if not exists idx_issues_status on public.issues(status);
 create index if not exists idx_issues_created_at on public.issues(created_at desc);
 create index if not exists idx_issues_category on public.issues(category);
+create index if not exists idx_issues_upvotes on public.issues(upvotes desc);
+create index if not exists idx_issues_status_upvotes on public.issues(status, upvotes desc);
+create index if not exists idx_issues_district_status_upvotes on public.issues(district, status, upvotes desc);
+create index if not exists idx_issues_resolved_at on public.issues(resolved_at);
+create index if not exists idx_issues_version on public.issues(version);
+create index if not exists idx_issues_counts_version on public.issues(counts_version);
+create index if not exists idx_issues_trending on public.issues(trending_score desc);
+create index if not exists idx_issues_status_trending on public.issues(status, trending_score desc);
 
 -- Issue votes table
 create table if not exists public.issue_votes (
@@ -63,13 +137,129 @@ create table if not exists public.comments (
   author text not null default 'Anonymous',
   is_anonymous boolean not null default true,
   session_hash text,
-  created_at timestamptz not null default now()
+  created_at timestamptz not null default now(),
+  version bigint not null default 0
 );
 
+alter table public.comments add column if not exists version bigint not null default 0;
+
 create index if not exists idx_comments_issue_id on public.comments(issue_id);
 create index if not exists idx_comments_created_at on public.comments(created_at desc);
+create index if not exists idx_comments_version on public.comments(version);
+
+-- Delta sync for /api/changes. Every insert or real change stamps the row
+-- from one sequence: issues.version when issue content changes,
+-- issues.counts_version when only its vote/comment counters do.
+create sequence if not exists public.change_seq;
+
+-- Number rows that predate the version columns (no-op once stamped).
+update public.issues set version = nextval('public.change_seq') where version = 0;
+update public.comments set version = nextval('public.change_seq') where version = 0;
+
+create or replace function public.stamp_issue_version()
+returns trigger
+language plpgsql
+as $$
+declare
+  counters constant text[] := array[
+    'upvotes', 'comment_count', 'resolution_confirmations', 'version', 'counts_version', 'trending_score'
+  ];
+begin
+  if tg_op = 'INSERT' then
+    new.version := nextval('public.change_seq');
+    new.counts_version := new.version;
+    return new;
+  end if;
+  if (to_jsonb(new) - counters) is distinct from (to_jsonb(old) - counters) then
+    new.version := nextval('public.change_seq');
+  end if;
+  if (new.upvotes, new.comment_count, new.resolution_confirmations)
+     is distinct from (old.upvotes, old.comment_count, old.resolution_confirmations) then
+    new.counts_version := nextval('public.change_seq');
+  end if;
+  return new;
+end;
+$$;
 
--- Optional emergency contacts table
+create or replace function public.stamp_comment_version()
+returns trigger
+language plpgsql
+as $$
+begin
+  if tg_op = 'INSERT' or (to_jsonb(new) - 'version') is distinct from (to_jsonb(old) - 'version') then
+    new.version := nextval('public.change_seq');
+  end if;
+  return new;
+end;
+$$;
+
+drop trigger if exists issues_stamp_version on public.issues;
+create trigger issues_stamp_version before insert or update on public.issues
+  for each row execute function public.stamp_issue_version();
+
+drop trigger if exists comments_stamp_version on public.comments;
+create trigger comments_stamp_version before insert or update on public.comments
+  for each row execute function public.stamp_comment_version();
+
+-- The newest change version handed out, the cursor for a caught-up client (0 before any change).
+create or replace function public.current_change_version()
+returns bigint
+language sql stable as $$
+  select case when is_called then last_value else 0 end from public.change_seq;
+$$;
+
+-- Analytics aggregates, called over RPC by /api/analytics/*
+create or replace function public.issue_trends(bucket text, since timestamptz, group_by text default 'none')
+returns table (bucket_start date, key text, created bigint, resolved bigint)
+language sql stable as $$
+  with events as (
+    select date_trunc(bucket, created_at)::date as bucket_start,
+           case group_by when 'category' then category when 'district' then coalesce(district, 'Unknown') else 'all' end as key,
+           1 as created, 0 as resolved
+    from public.issues
+    where created_at >= since
+    union all
+    select date_trunc(bucket, resolved_at)::date,
+           case group_by when 'category' then category when 'district' then coalesce(district, 'Unknown') else 'all' end,
+           0, 1
+    from public.issues
+    where resolved_at >= since
+  )
+  select bucket_start, key, sum(created)::bigint, sum(resolved)::bigint
+  from events
+  group by bucket_start, key
+  order by bucket_start, key;
+$$;
+
+create or replace function public.issue_resolution_times(since timestamptz, group_by text default 'none')
+returns table (key text, resolved bigint, median_hours double precision, p90_hours double precision)
+language sql stable as $$
+  select case group_by when 'category' then category when 'district' then coalesce(district, 'Unknown') else 'all' end,
+         count(*),
+         percentile_cont(0.5) within group (order by extract(epoch from resolved_at - created_at) / 3600),
+         percentile_disc(0.9) within group (order by extract(epoch from resolved_at - created_at) / 3600)
+  from public.issues
+  where resolved_at >= since
+  group by 1
+  order by 1;
+$$;
+
+create or replace function public.top_open_issues_by_district(per_district integer default 5)
+returns setof public.issues
+language sql stable as $$
+  select i.*
+  from public.issues i
+  join (
+    select id, row_number() over (partition by coalesce(district, 'Unknown') order by upvotes desc, created_at desc) as rn
+    from public.issues
+    where status <> 'resolved'
+  ) ranked on ranked.id = i.id
+  where ranked.rn <= per_district
+  order by i.district, i.upvotes desc;
+$$;
+
+-- Emergency contacts served by /api/contacts. Until it has rows the API
+-- falls back to its built-in directory.
 create table if not exists public.emergency_contacts (
   id text primary key,
   organization text not null,
@@ -78,3 +268,6 @@ create table if not exists public.emergency_contacts (
   service_type text not null check (service_type in ('police','medical','utilities','government')),
   is_247 boolean not null default false
 );
+
+create index if not exists idx_emergency_contacts_district_type on public.emergency_contacts(district, service_type);
+create index if not exists idx_emergency_contacts_service_type on public.emergency_contacts(service_type);
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Generate synthetic CivicLens data at Sri Lanka scale.
+
+Issues are spread across the 25 districts in proportion to population, with
+coordinates clustered around each district's towns. Upvotes follow a Zipf
+(power-law) distribution and comment threads grow with an issue's votes.
+The same seed always produces the same dataset.
+
+Usage:
+    python seed_data.py --count 1000000 --target sqlite --sqlite-path civiclens.db
+    python seed_data.py --count 1000000 --target postgres | psql "$DATABASE_URL"
+
+In-process callers (benchmarks, tests against the demo store) use
+``generate`` with ``write_demo_store``.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import shutil
+import sys
+import tempfile
+import time
+from bisect import bisect
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate, islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from app import (
+    DISTRICT_CENTROIDS,
+    ISSUE_COLUMNS,
+    DemoStore,
+    Issue,
+    SqliteIssueRepository,
+    round_coordinates,
+    to_comment_shape,
+)
+
+# Population in thousands (2012 census) and main towns per district; centroids
+# come from app.DISTRICT_CENTROIDS.
+DISTRICT_DETAILS: Dict[str, Tuple[int, List[str]]] = {
+    "Colombo": (2324, ["Colombo", "Dehiwala", "Moratuwa", "Kotte", "Maharagama"]),
+    "Gampaha": (2304, ["Gampaha", "Negombo", "Wattala", "Kadawatha", "Ja-Ela"]),
+    "Kalutara": (1222, ["Kalutara", "Panadura", "Horana", "Beruwala"]),
+    "Kandy": (1375, ["Kandy", "Peradeniya", "Katugastota", "Gampola"]),
+    "Matale": (485, ["Matale", "Dambulla", "Galewela"]),
+    "Nuwara Eliya": (712, ["Nuwara Eliya", "Hatton", "Talawakele"]),
+    "Galle": (1063, ["Galle", "Hikkaduwa", "Ambalangoda", "Elpitiya"]),
+    "Matara": (815, ["Matara", "Weligama", "Akuressa"]),
+    "Hambantota": (600, ["Hambantota", "Tangalle", "Tissamaharama"]),
+    "Jaffna": (584, ["Jaffna", "Chavakachcheri", "Point Pedro"]),
+    "Kilinochchi": (113, ["Kilinochchi", "Paranthan"]),
+    "Mannar": (100, ["Mannar", "Murunkan"]),
+    "Vavuniya": (172, ["Vavuniya", "Cheddikulam"]),
+    "Mullaitivu": (92, ["Mullaitivu", "Puthukkudiyiruppu"]),
+    "Batticaloa": (526, ["Batticaloa", "Eravur", "Kattankudy"]),
+    "Ampara": (649, ["Ampara", "Kalmunai", "Akkaraipattu"]),
+    "Trincomalee": (379, ["Trincomalee", "Kinniya", "Kantale"]),
+    "Kurunegala": (1611, ["Kurunegala", "Kuliyapitiya", "Pannala", "Polgahawela"]),
+    "Puttalam": (762, ["Puttalam", "Chilaw", "Wennappuwa"]),
+    "Anuradhapura": (856, ["Anuradhapura", "Kekirawa", "Medawachchiya"]),
+    "Polonnaruwa": (403, ["Polonnaruwa", "Hingurakgoda"]),
+    "Badulla": (811, ["Badulla", "Bandarawela", "Haputale"]),
+    "Monaragala": (449, ["Monaragala", "Wellawaya", "Bibile"]),
+    "Ratnapura": (1088, ["Ratnapura", "Balangoda", "Embilipitiya"]),
+    "Kegalle": (837, ["Kegalle", "Mawanella", "Warakapola"]),
+}
+DISTRICTS: List[Tuple[str, float, float, int, List[str]]] = [
+    (name, lat, lng, *DISTRICT_DETAILS[name]) for name, lat, lng in DISTRICT_CENTROIDS
+]
+
+# Category weights, title templates and severity weights (low, medium, high, critical).
+CATEGORIES: Dict[str, Tuple[int, List[str], Tuple[int, int, int, int]]] = {
+    "potholes": (24, ["Pothole on {road}", "Deep pothole near {landmark}", "Potholes along {road}"], (2, 4, 3, 1)),
+    "garbage": (20, ["Garbage not collected on {road}", "Waste dumped near {landmark}"], (3, 4, 2, 1)),
+    "streetLights": (14, ["Street light broken on {road}", "Dark stretch near {landmark}"], (3, 5, 2, 0)),
+    "drainage": (12, ["Blocked drain on {road}", "Flooding near {landmark} after rain"], (1, 4, 4, 1)),
+    "roadDamage": (10, ["Road surface damaged on {road}", "Collapsed road edge near {landmark}"], (1, 3, 4, 2)),
+    "waterSupply": (9, ["No water supply on {road}", "Burst water pipe near {landmark}"], (1, 3, 4, 2)),
+    "publicSafety": (6, ["Fallen tree blocking {road}", "Open manhole near {landmark}"], (0, 2, 4, 4)),
+    "other": (5, ["Issue reported on {road}", "Needs attention near {landmark}"], (4, 4, 1, 1)),
+}
+SEVERITIES = ("low", "medium", "high", "critical")
+ROADS = ["Main Street", "Station Road", "Temple Road", "Hospital Road", "Market Road", "Lake Road", "School Lane", "Church Road"]
+LANDMARKS = ["the bus stand", "the market", "the railway station", "the school", "the hospital", "the temple", "the junction"]
+COMMENTS = [
+    "Same problem here, it has been like this for weeks.",
+    "Reported this to the council already.",
+    "Please fix this soon, it is dangerous at night.",
+    "Still not fixed as of today.",
+    "Workers came yesterday but did not finish.",
+    "This affects the whole lane.",
+]
+
+ZIPF_EXPONENT = 2.0
+MAX_UPVOTES = 5000
+TOWN_SPREAD = 0.03
+DISTRICT_SPREAD = 0.12
+
+
+class GeneratedIssue:
+    """One synthetic issue with its comment rows and voter session hashes."""
+
+    __slots__ = ("row", "comments", "voters")
+
+    def __init__(self, row: Dict[str, Any], comments: List[Dict[str, Any]], voters: List[str]) -> None:
+        self.row = row
+        self.comments = comments
+        self.voters = voters
+
+
+def _iso(value: datetime) -> str:
+    return value.isoformat().replace("+00:00", "Z")
+
+
+def _weighted(weights: Iterable[float]):
+    cumulative = list(accumulate(weights))
+    total = cumulative[-1]
+    return lambda rng: bisect(cumulative, rng.random() * total)
+
+
+def generate(
+    count: int,
+    seed: int = 42,
+    days: int = 365,
+    now: Optional[datetime] = None,
+    with_votes: bool = False,
+) -> Iterator[GeneratedIssue]:
+    """Yield ``count`` issues (oldest first) created over the last ``days`` days.
+
+    Rows use the ``issues``/``comments`` column names. Voter session hashes
+    are only produced when ``with_votes`` is set, since they dominate output
+    size at scale; ``upvotes`` is populated either way.
+    """
+    rng = random.Random(seed)
+    now = now or datetime.now(timezone.utc)
+    start = now - timedelta(days=days)
+    span = days * 86400
+    pick_district = _weighted(d[3] for d in DISTRICTS)
+    category_names = list(CATEGORIES)
+    pick_category = _weighted(CATEGORIES[c][0] for c in category_names)
+    severity_pickers = {c: _weighted(CATEGORIES[c][2]) for c in category_names}
+    pick_resolver = _weighted((5, 4, 1))
+    # The first town sits on the district centroid, the rest on a ring around it.
+    town_centres = [
+        [
+            (
+                lat + DISTRICT_SPREAD * math.sin(2 * math.pi * i / len(towns)),
+                lng + DISTRICT_SPREAD * math.cos(2 * math.pi * i / len(towns)),
+            )
+            if i
+            else (lat, lng)
+            for i in range(len(towns))
+        ]
+        for _, lat, lng, _, towns in DISTRICTS
+    ]
+    year = now.year
+
+    # Creation times are sorted so ids and created_at increase together.
+    offsets = sorted(rng.random() * span for _ in range(count))
+    for n, offset in enumerate(offsets):
+        district = pick_district(rng)
+        name, _, _, _, towns = DISTRICTS[district]
+        town_index = rng.randrange(len(towns))
+        lat, lng = town_centres[district][town_index]
+        issue_lat, issue_lng = round_coordinates(rng.gauss(lat, TOWN_SPREAD), rng.gauss(lng, TOWN_SPREAD))
+
+        category = category_names[pick_category(rng)]
+        severity = SEVERITIES[severity_pickers[category](rng)]
+        created = start + timedelta(seconds=offset)
+        age_days = (now - created).days
+        # Older issues are more likely to have been dealt with.
+        roll = rng.random()
+        resolved_share = min(0.7, age_days / 200)
+        status = "resolved" if roll < resolved_share else "in-progress" if roll < resolved_share + 0.15 else "open"
+        resolved_at = None
+        resolved_by = None
+        if status == "resolved":
+            resolved_at = _iso(min(now, created + timedelta(hours=rng.expovariate(1 / 240))))
+            resolved_by = ("community", "official", "reporter")[pick_resolver(rng)]
+
+        upvotes = min(MAX_UPVOTES, int(rng.paretovariate(ZIPF_EXPONENT - 1)) - 1)
+        comment_total = min(200, int(upvotes * rng.random() * 0.3) + (rng.random() < 0.3))
+        issue_id = f"CL-{year}-{n:07d}"
+        town = towns[town_index]
+        title = rng.choice(CATEGORIES[category][1]).format(road=rng.choice(ROADS), landmark=rng.choice(LANDMARKS))
+        anonymous = rng.random() < 0.7
+        row = {
+            "id": issue_id,
+            "title": f"{title}, {town}",
+            "description": f"{title} in {town}, {name} District. Reported by residents.",
+            "category": category,
+            "severity": severity,
+            "status": status,
+            "location": f"{rng.choice(ROADS)}, {town}",
+            "lat": issue_lat,
+            "lng": issue_lng,
+            "photos": [],
+            "upvotes": upvotes,
+            "comment_count": comment_total,
+            "reporter": "Anonymous" if anonymous else "Citizen",
+            "is_anonymous": anonymous,
+            "created_at": _iso(created),
+            "ai_confidence": rng.randint(55, 98),
+            "ai_category": category,
+            "severity_score": SEVERITIES.index(severity) * 3 + rng.randint(1, 3),
+            "severity_text": None,
+            "resolution_confirmations": rng.randint(1, 12) if status == "resolved" else 0,
+            "resolved_at": resolved_at,
+            "resolved_by": resolved_by,
+            "district": name,
+        }
+
+        comments = []
+        comment_time = created
+        for c in range(comment_total):
+            comment_time = min(now, comment_time + timedelta(minutes=rng.expovariate(1 / 600)))
+            comments.append(
+                {
+                    "id": f"{issue_id}-c{c}",
+                    "issue_id": issue_id,
+                    "text": rng.choice(COMMENTS),
+                    "author": "Anonymous",
+                    "is_anonymous": True,
+                    "session_hash": None,
+                    "created_at": _iso(comment_time),
+                }
+            )
+
+        voters = []
+        if with_votes:
+            voters = [hashlib.sha256(f"{seed}:{issue_id}:{v}".encode()).hexdigest() for v in range(upvotes)]
+        yield GeneratedIssue(row, comments, voters)
+
+
+def _batches(items: Iterable[GeneratedIssue], size: int) -> Iterator[List[GeneratedIssue]]:
+    it = iter(items)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def write_demo_store(store: DemoStore, items: Iterable[GeneratedIssue]) -> int:
+    """Load generated issues into a demo store, replacing issues with the same id."""
+    written = 0
+    with store.lock.write():
+        for item in items:
+            issue = Issue.from_row(item.row)
+            store.add_issue(issue)
+            if item.comments:
+                store.comments_by_issue[issue.id] = [to_comment_shape(c) for c in item.comments]
+            store.upvote_sessions[issue.id].update(item.voters)
+            written += 1
+    return written
+
+
+def write_sqlite(path: str, items: Iterable[GeneratedIssue], batch_size: int = 5000) -> int:
+    """Bulk upsert generated issues into a SQLite database, one transaction per batch.
+
+    Uses the bulk import statements, so re-seeding an existing database
+    updates issues in place instead of cascade-deleting their comments and votes.
+    """
+    repo = SqliteIssueRepository(path)
+    written = 0
+    for batch in _batches(items, batch_size):
+        with repo.transaction() as conn:
+            conn.executemany(*repo.import_statement("issues", [item.row for item in batch]))
+            conn.executemany(*repo.import_statement("comments", [c for item in batch for c in item.comments]))
+            votes = [{"issue_id": item.row["id"], "session_hash": v} for item in batch for v in item.voters]
+            conn.executemany(*repo.import_statement("votes", votes))
+        written += len(batch)
+    return written
+
+
+def _copy_value(value: Any) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (list, dict)):
+        value = json.dumps(value)
+    text = str(value)
+    return text.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def write_postgres_copy(out: TextIO, items: Iterable[GeneratedIssue]) -> int:
+    """Write a psql script that loads the issues with COPY ... FROM stdin.
+
+    Issues stream straight to ``out``; comments and votes are spooled to
+    temporary files and appended afterwards, since each table needs its own
+    COPY block and foreign keys require issues first.
+    """
+    comment_columns = ("id", "issue_id", "text", "author", "is_anonymous", "session_hash", "created_at")
+    written = 0
+    with tempfile.TemporaryFile("w+") as comments, tempfile.TemporaryFile("w+") as votes:
+        out.write("begin;\n")
+        out.write(f"copy public.issues ({', '.join(ISSUE_COLUMNS)}) from stdin;\n")
+        for item in items:
+            out.write("\t".join(_copy_value(item.row[c]) for c in ISSUE_COLUMNS) + "\n")
+            for comment in item.comments:
+                comments.write("\t".join(_copy_value(comment[c]) for c in comment_columns) + "\n")
+            for voter in item.voters:
+                votes.write(f"{item.row['id']}\t{voter}\tupvote\n")
+            written += 1
+        out.write("\\.\n")
+
+        out.write(f"copy public.comments ({', '.join(comment_columns)}) from stdin;\n")
+        comments.seek(0)
+        shutil.copyfileobj(comments, out)
+        out.write("\\.\n")
+
+        out.write("copy public.issue_votes (issue_id, session_hash, vote_type) from stdin;\n")
+        votes.seek(0)
+        shutil.copyfileobj(votes, out)
+        out.write("\\.\ncommit;\n")
+    return written
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generate synthetic CivicLens issues, votes and comments.")
+    parser.add_argument("--count", type=int, default=100000, help="number of issues")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--days", type=int, default=365, help="spread creation times over this many days")
+    parser.add_argument("--with-votes", action="store_true", help="also write one issue_votes row per upvote")
+    parser.add_argument("--target", choices=["sqlite", "postgres"], default="sqlite")
+    parser.add_argument("--sqlite-path", default="civiclens.db")
+    parser.add_argument("--out", help="postgres target: write the COPY script here instead of stdout")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    items = generate(args.count, seed=args.seed, days=args.days, with_votes=args.with_votes)
+    if args.target == "sqlite":
+        written = write_sqlite(args.sqlite_path, items)
+        destination = args.sqlite_path
+    elif args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            written = write_postgres_copy(f, items)
+        destination = args.out
+    else:
+        written = write_postgres_copy(sys.stdout, items)
+        destination = "stdout"
+    print(f"Wrote {written} issues to {destination} in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+import os
+import sys
+
+import pytest
+
+# Never talk to the services configured in .env; load_dotenv keeps values already set.
+os.environ.update(
+    {
+        "DEMO_MODE": "true",
+        "SUPABASE_URL": "",
+        "SUPABASE_SERVICE_ROLE_KEY": "",
+        "GEMINI_API_KEY": "",
+        "STORAGE_BACKEND": "memory",
+        "SHARED_STATE_PATH": "",
+        "WARM_UP_ON_START": "false",
+        "ADMIN_TOKEN": "test-admin",
+        "PROFILE_TOKEN": "test-profile",
+    }
+)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as civiclens  # noqa: E402
+
+
+@pytest.fixture
+def memory_repo():
+    return civiclens.InMemoryIssueRepository(civiclens.DemoStore())
+
+
+@pytest.fixture
+def sqlite_repo(tmp_path):
+    repo = civiclens.SqliteIssueRepository(str(tmp_path / "civiclens.db"))
+    for kind in ("issues", "comments"):
+        repo.import_rows(kind, list(civiclens.InMemoryIssueRepository(civiclens.DemoStore()).export_rows(kind)))
+    return repo
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def repo(request):
+    """Each backend, seeded with the mock issues and comments."""
+    return request.getfixturevalue(f"{request.param}_repo")
+
+
+@pytest.fixture
+def client(repo, monkeypatch):
+    """A test client whose handlers use ``repo``."""
+    monkeypatch.setattr(civiclens, "get_repository", lambda: repo)
+    # Cached contact directories are keyed by backend name, not by instance.
+    civiclens.CONTACTS_CACHE.invalidate()
+    return civiclens.app.test_client()
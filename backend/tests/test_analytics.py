@@ -0,0 +1,45 @@
+"""Analytics rollups and the district assignment they group by."""
+
+import os
+import re
+from datetime import timedelta
+
+import pytest
+
+import app as civiclens
+
+SCHEMA = os.path.join(os.path.dirname(civiclens.__file__), "schema.sql")
+
+
+def test_schema_backfills_districts_like_the_api():
+    with open(SCHEMA) as f:
+        schema = f.read()
+    backfill = schema[schema.index("update public.issues i\nset district") :]
+    rows = re.findall(r"\((\d+), '([^']+)', ([\d.]+), ([\d.]+)\)", backfill)
+    assert [(name, float(lat), float(lng)) for _, name, lat, lng in rows] == list(civiclens.DISTRICT_CENTROIDS)
+    # Ties go to the earlier centroid, as with min() in district_for().
+    assert [int(order) for order, *_ in rows] == list(range(1, len(rows) + 1))
+
+
+@pytest.mark.parametrize("group_by", civiclens.ANALYTICS_GROUPS)
+def test_backends_agree_on_analytics(memory_repo, sqlite_repo, group_by):
+    since = civiclens.datetime.now(civiclens.timezone.utc) - timedelta(days=3650)
+    for bucket in civiclens.ANALYTICS_BUCKETS:
+        assert memory_repo.trends(bucket, since, group_by) == sqlite_repo.trends(bucket, since, group_by)
+    assert memory_repo.resolution_times(since, group_by) == sqlite_repo.resolution_times(since, group_by)
+
+
+def test_top_open_by_district(repo):
+    districts = repo.top_open_by_district(2)
+    assert districts
+    for issues in districts.values():
+        assert len(issues) <= 2
+        assert all(issue.status != "resolved" for issue in issues)
+        assert [i.upvotes for i in issues] == sorted((i.upvotes for i in issues), reverse=True)
+
+
+def test_analytics_reject_bad_parameters(client):
+    assert client.get("/api/analytics/trends?bucket=month").status_code == 400
+    assert client.get("/api/analytics/trends?groupBy=reporter").status_code == 400
+    assert client.get("/api/analytics/resolution-times?days=soon").status_code == 400
+    assert client.get("/api/analytics/top-open?perDistrict=many").status_code == 400
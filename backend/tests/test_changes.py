@@ -0,0 +1,82 @@
+import threading
+
+import app as civiclens
+
+
+def sync(client, since=0, limit=3):
+    """Page through /api/changes until caught up; returns (pages, issue ids, comment ids, cursor)."""
+    pages, issues, comments = 0, set(), set()
+    while True:
+        page = client.get(f"/api/changes?since={since}&limit={limit}").get_json()
+        pages += 1
+        issues.update(i["id"] for i in page["issues"])
+        comments.update(c["id"] for c in page["comments"])
+        assert page["version"] >= since
+        since = page["version"]
+        if not page["hasMore"]:
+            return pages, issues, comments, since
+
+
+def test_paging_returns_every_issue_and_comment_once(client, repo):
+    pages, issues, comments, cursor = sync(client)
+    assert pages > 1
+    assert issues == {i.id for i in repo.list_issues()}
+    assert comments == {c["id"] for i in issues for c in repo.list_comments(i)}
+    assert sync(client, cursor)[1:3] == (set(), set())
+
+
+def test_counter_changes_arrive_as_counts(client, repo):
+    cursor = sync(client)[3]
+    issue_id = repo.list_issues()[0].id
+    repo.upvote(issue_id, "session-a")
+    page = client.get(f"/api/changes?since={cursor}").get_json()
+    assert page["issues"] == []
+    assert [c["issueId"] for c in page["counts"]] == [issue_id]
+    assert page["counts"][0]["upvotes"] == repo.get_issue(issue_id).upvotes
+    assert page["version"] > cursor
+
+
+def test_cursor_ahead_of_the_log_resets(client, repo):
+    page = client.get("/api/changes?since=1000000000&limit=1000").get_json()
+    assert page["reset"] is True
+    assert {i["id"] for i in page["issues"]} == {i.id for i in repo.list_issues()}
+
+
+def test_changes_reject_bad_cursors(client):
+    assert client.get("/api/changes?since=-1").status_code == 400
+    assert client.get("/api/changes?since=abc").status_code == 400
+
+
+def test_caught_up_cursor_skips_superseded_counts(client, repo):
+    cursor = sync(client)[3]
+    created = client.post("/api/issues", data={"title": "Pothole", "description": "Deep"}).get_json()
+    repo.upvote(created["id"], "session-a")
+    page = client.get(f"/api/changes?since={cursor}").get_json()
+    assert [i["id"] for i in page["issues"]] == [created["id"]]
+    assert page["issues"][0]["upvotes"] == 1
+    # The counter change is folded into the issue above, so the cursor moves past it.
+    after = client.get(f"/api/changes?since={page['version']}").get_json()
+    assert (after["issues"], after["counts"], after["comments"]) == ([], [], [])
+
+
+def test_sqlite_page_is_one_snapshot(sqlite_repo):
+    cursor = sqlite_repo.changes_since(0, 10000)["version"]
+    voted, commented = [issue.id for issue in sqlite_repo.list_issues()[:2]]
+
+    def write():
+        sqlite_repo.upvote(voted, "session-a")
+        sqlite_repo.add_comment({"id": "c-late", "issueId": commented, "text": "x", "createdAt": civiclens.now_iso()}, "s")
+
+    def write_mid_read(statement):
+        # Land both writes after the counts query and before the comments query.
+        if statement.startswith("select * from comments"):
+            sqlite_repo.connection().set_trace_callback(None)
+            writer = threading.Thread(target=write)
+            writer.start()
+            writer.join()
+
+    sqlite_repo.connection().set_trace_callback(write_mid_read)
+    page = sqlite_repo.changes_since(cursor, 100)
+    later = sqlite_repo.changes_since(page["version"], 100)
+    assert [c["id"] for c in page["comments"] + later["comments"]] == ["c-late"]
+    assert {c["issueId"] for c in page["counts"] + later["counts"]} == {voted, commented}
@@ -0,0 +1,69 @@
+import io
+import json
+import time
+
+import pytest
+
+import app as civiclens
+
+# Photo body -> (delay seconds, Gemini reply or None to fail).
+REPLIES = {
+    b"pothole-a": (0.0, {"category": "pothole", "confidence": 0.9, "severity_score": 8, "severity_text": "deep"}),
+    b"pothole-b": (0.0, {"category": "pothole", "confidence": 0.6, "severity_score": 6, "severity_text": "mid"}),
+    b"garbage": (0.0, {"category": "garbage", "confidence": 0.8, "severity_score": 2, "severity_text": "bin"}),
+    b"slow": (2.0, {"category": "garbage", "confidence": 1.0, "severity_score": 10, "severity_text": "late"}),
+    b"broken": (0.0, None),
+}
+
+
+class FakeModel:
+    def __init__(self, name):
+        pass
+
+    def generate_content(self, parts, request_options=None):
+        delay, reply = REPLIES[parts[1]["data"]]
+        time.sleep(delay)
+        if reply is None:
+            raise RuntimeError("model error")
+        return type("Response", (), {"text": json.dumps(reply)})()
+
+
+class FakeGenai:
+    GenerativeModel = FakeModel
+
+
+@pytest.fixture
+def gemini(monkeypatch):
+    monkeypatch.setattr(civiclens, "GENAI", civiclens.Lazy(lambda: FakeGenai))
+    monkeypatch.setattr(civiclens, "CLASSIFY_DEADLINE_SECONDS", 0.5)
+
+
+def report(client, *photos):
+    data = {"title": "t", "description": "d", "category": "drainage"}
+    data["photos"] = [(io.BytesIO(photo), f"{n}.jpg") for n, photo in enumerate(photos)]
+    response = client.post("/api/issues", data=data, content_type="multipart/form-data")
+    assert response.status_code == 201
+    return response.get_json()
+
+
+def test_photos_vote_by_confidence(client, gemini):
+    issue = report(client, b"pothole-a", b"pothole-b", b"garbage")
+    assert issue["category"] == "potholes"
+    assert issue["aiCategory"] == "pothole"
+    assert issue["aiConfidence"] == 50
+    assert issue["severityScore"] == 5
+    assert issue["severityText"] == "deep"
+
+
+def test_failed_and_late_photos_are_left_out(client, gemini):
+    started = time.perf_counter()
+    issue = report(client, b"slow", b"broken", b"garbage")
+    assert time.perf_counter() - started < 1.5
+    assert issue["aiCategory"] == "garbage"
+    assert issue["aiConfidence"] == 80
+
+
+def test_reporter_category_kept_when_nothing_classifies(client, gemini):
+    issue = report(client, b"broken")
+    assert issue["category"] == "drainage"
+    assert issue["aiConfidence"] == 50
@@ -0,0 +1,21 @@
+def test_comment_on_unknown_issue_is_404(client):
+    response = client.post("/api/issues/CL-0000-0000/comments", json={"text": "hello"})
+    assert response.status_code == 404
+
+
+def test_rapid_comments_get_distinct_ids(client, repo):
+    issue_id = repo.list_issues()[0].id
+    before = repo.get_issue(issue_id).comment_count
+    ids = set()
+    for n in range(20):
+        response = client.post(f"/api/issues/{issue_id}/comments", json={"text": f"comment {n}"})
+        assert response.status_code == 201
+        ids.add(response.get_json()["id"])
+    assert len(ids) == 20
+    assert repo.get_issue(issue_id).comment_count == before + 20
+    assert ids <= {c["id"] for c in repo.list_comments(issue_id)}
+
+
+def test_comment_requires_text(client, repo):
+    issue_id = repo.list_issues()[0].id
+    assert client.post(f"/api/issues/{issue_id}/comments", json={"text": "  "}).status_code == 400
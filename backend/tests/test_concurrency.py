@@ -0,0 +1,77 @@
+import sys
+import threading
+import uuid
+
+import app as civiclens
+
+
+def test_export_during_concurrent_votes_and_comments(memory_repo):
+    issue_ids = [issue.id for issue in memory_repo.list_issues()]
+    # Large collections and frequent thread switches make a walk that races the writers fail reliably.
+    for n in range(20000):
+        memory_repo.upvote(issue_ids[n % len(issue_ids)], f"seed-{n}")
+    stop = threading.Event()
+    errors = []
+
+    def write(worker):
+        n = 0
+        try:
+            while not stop.is_set():
+                issue_id = issue_ids[n % len(issue_ids)]
+                memory_repo.upvote(issue_id, f"w{worker}-{n}")
+                memory_repo.resolve_vote(issue_id, f"w{worker}-{n}", "yes")
+                memory_repo.add_comment(
+                    {"id": str(uuid.uuid4()), "issueId": issue_id, "text": "x", "createdAt": civiclens.now_iso()},
+                    f"w{worker}",
+                )
+                n += 1
+        except Exception as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    writers = [threading.Thread(target=write, args=(w,)) for w in range(4)]
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    for thread in writers:
+        thread.start()
+    try:
+        for _ in range(5):
+            votes = list(memory_repo.export_rows("votes"))
+            comments = list(memory_repo.export_rows("comments"))
+            assert len({(r["issue_id"], r["session_hash"]) for r in votes}) == len(votes)
+            assert len({r["id"] for r in comments}) == len(comments)
+    finally:
+        stop.set()
+        sys.setswitchinterval(interval)
+        for thread in writers:
+            thread.join()
+    assert not errors
+
+
+def test_export_never_blocks_writers(memory_repo, monkeypatch):
+    for issue in memory_repo.list_issues()[:3]:
+        memory_repo.upvote(issue.id, "voter")
+
+    def write_lock():
+        raise AssertionError("export took the write lock")
+
+    monkeypatch.setattr(memory_repo.store.lock, "write", write_lock)
+    for kind in civiclens.BULK_KEYS:
+        keys = [tuple(row[k] for k in civiclens.BULK_KEYS[kind]) for row in memory_repo.export_rows(kind)]
+        assert keys and keys == sorted(keys)
+
+
+def test_concurrent_upvotes_count_once_per_session(repo):
+    issue_id = repo.list_issues()[0].id
+    before = repo.get_issue(issue_id).upvotes
+    sessions = [f"s{i}" for i in range(20)]
+
+    def vote():
+        for sid in sessions:
+            repo.upvote(issue_id, sid)
+
+    threads = [threading.Thread(target=vote) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert repo.get_issue(issue_id).upvotes == before + len(sessions)
@@ -0,0 +1,24 @@
+import app as civiclens
+
+
+def test_unfiltered_contacts_keep_source_order(client):
+    response = client.get("/api/contacts")
+    assert [c["id"] for c in response.get_json()] == [c["id"] for c in civiclens.MOCK_EMERGENCY_CONTACTS]
+
+
+def test_filtered_contacts_list_247_lines_first(client):
+    contacts = client.get("/api/contacts?district=Colombo").get_json()
+    assert {c["district"] for c in contacts} == {"Colombo"}
+    flags = [c["is247"] for c in contacts]
+    assert flags == sorted(flags, reverse=True)
+
+
+def test_nearest_contacts_come_from_the_closest_covered_district(client):
+    # Matara has no contacts of its own; Galle is the nearest district with police and hospitals.
+    contacts = client.get("/api/contacts?lat=5.95&lng=80.55&type=police").get_json()
+    assert [c["district"] for c in contacts] == ["Galle"]
+
+
+def test_contacts_reject_bad_parameters(client):
+    assert client.get("/api/contacts?type=fire").status_code == 400
+    assert client.get("/api/contacts?lat=6.9").status_code == 400
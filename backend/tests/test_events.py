@@ -0,0 +1,45 @@
+import app as civiclens
+
+
+def test_streams_beyond_the_cap_get_503(client, monkeypatch):
+    monkeypatch.setattr(civiclens, "EVENTS", civiclens.EventBroker(max_subscribers=2))
+    streams = [client.get("/api/events", buffered=False) for _ in range(2)]
+    try:
+        assert [s.status_code for s in streams] == [200, 200]
+        for stream in streams:
+            assert next(iter(stream.response)).startswith(b"retry:")
+        refused = client.get("/api/events")
+        assert refused.status_code == 503
+        assert refused.headers["Retry-After"] == str(civiclens.SSE_RETRY_AFTER_SECONDS)
+    finally:
+        # Each stream keeps its request context pushed; unwind them in reverse.
+        for stream in reversed(streams):
+            stream.close()
+
+
+def test_stream_receives_published_events(client, monkeypatch):
+    broker = civiclens.EventBroker(max_subscribers=1)
+    monkeypatch.setattr(civiclens, "EVENTS", broker)
+    stream = client.get("/api/events?issue=CL-2024-001", buffered=False)
+    try:
+        chunks = iter(stream.response)
+        assert next(chunks).startswith(b"retry:")
+        broker.publish("issue.upvoted", "CL-2024-002", {"upvotes": 1})
+        broker.publish("issue.upvoted", "CL-2024-001", {"upvotes": 2})
+        assert b'"issueId":"CL-2024-001"' in next(chunks)
+    finally:
+        stream.close()
+    assert broker.subscriber_count() == 0
+
+
+def test_publish_failures_are_logged_and_counted(client, monkeypatch, caplog):
+    class BrokenBroker(civiclens.EventBroker):
+        def publish(self, *args, **kwargs):
+            raise RuntimeError("relay down")
+
+    monkeypatch.setattr(civiclens, "EVENTS", BrokenBroker())
+    before = civiclens.METRICS.render()
+    assert client.post("/api/issues/CL-2024-002/upvote").status_code == 200
+    assert "Failed to publish issue.upvoted for CL-2024-002" in caplog.text
+    counted = [line for line in civiclens.METRICS.render().splitlines() if line.startswith('event_errors_total{stage="publish"}')]
+    assert counted and counted[0] not in before
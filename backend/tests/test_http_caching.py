@@ -0,0 +1,58 @@
+import gzip
+
+import brotli
+
+import app as civiclens
+
+
+def test_unchanged_response_is_304(client):
+    first = client.get("/api/issues")
+    etag = first.headers["ETag"]
+    again = client.get("/api/issues", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.data == b""
+    assert again.headers["ETag"] == etag
+
+
+def test_etag_changes_with_the_data(client, repo):
+    etag = client.get("/api/issues").headers["ETag"]
+    repo.upvote(repo.list_issues()[0].id, "session-a")
+    response = client.get("/api/issues", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_compressed_responses_have_their_own_etag(client):
+    plain = client.get("/api/issues")
+    zipped = client.get("/api/issues", headers={"Accept-Encoding": "gzip"})
+    assert zipped.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(zipped.data) == plain.data
+    assert zipped.headers["ETag"] != plain.headers["ETag"]
+    cached = client.get("/api/issues", headers={"Accept-Encoding": "gzip", "If-None-Match": zipped.headers["ETag"]})
+    assert cached.status_code == 304
+
+
+def test_writes_carry_no_etag(client, repo):
+    response = client.post(f"/api/issues/{repo.list_issues()[0].id}/upvote")
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+
+
+def test_brotli_is_preferred_and_small_bodies_stay_plain(client):
+    plain = client.get("/api/issues")
+    squeezed = client.get("/api/issues", headers={"Accept-Encoding": "gzip, br"})
+    assert squeezed.headers["Content-Encoding"] == "br"
+    assert brotli.decompress(squeezed.data) == plain.data
+    assert "Accept-Encoding" in squeezed.headers["Vary"]
+    refused = client.get("/api/issues", headers={"Accept-Encoding": "br;q=0, gzip"})
+    assert refused.headers["Content-Encoding"] == "gzip"
+    small = client.get("/api/health", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in small.headers
+
+
+def test_streamed_lists_are_compressed_chunk_by_chunk(client, monkeypatch):
+    monkeypatch.setattr(civiclens, "STREAM_JSON_MIN_ITEMS", 1)
+    plain = client.get("/api/issues")
+    zipped = client.get("/api/issues", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Length" not in zipped.headers
+    assert gzip.decompress(zipped.data) == plain.data
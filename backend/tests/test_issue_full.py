@@ -0,0 +1,18 @@
+def test_full_matches_the_separate_endpoints(client, repo):
+    issue_id = "CL-2024-001"
+    client.post(f"/api/issues/{issue_id}/upvote")
+    client.post(f"/api/issues/{issue_id}/resolve-vote", json={"vote": "no"})
+    full = client.get(f"/api/issues/{issue_id}/full?comments=2").get_json()
+    assert full["issue"] == client.get(f"/api/issues/{issue_id}").get_json()
+    comments = client.get(f"/api/issues/{issue_id}/comments").get_json()
+    assert full["comments"] == comments[:2]
+    assert full["hasMoreComments"] == (len(comments) > 2)
+    assert full["resolveTally"]["no"] >= 1
+    assert full["viewer"] == {"upvoted": True, "resolveVote": "no"}
+
+
+def test_full_for_a_new_viewer_and_an_unknown_issue(client):
+    full = client.get("/api/issues/CL-2024-001/full").get_json()
+    assert full["viewer"] == {"upvoted": False, "resolveVote": None}
+    assert client.get("/api/issues/CL-0000-0000/full").status_code == 404
+    assert client.get("/api/issues/CL-2024-001/full?comments=all").status_code == 400
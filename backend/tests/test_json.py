@@ -0,0 +1,39 @@
+import app as civiclens
+
+
+def test_responses_are_compact_unless_debugging(client, monkeypatch):
+    assert b"\n  " not in client.get("/api/hotlines").data
+    monkeypatch.setattr(civiclens.app, "debug", True)
+    assert b"\n  " in client.get("/api/hotlines").data
+
+
+def test_orjson_and_stdlib_encode_the_same(monkeypatch):
+    import dataclasses
+    import enum
+    import uuid
+    from datetime import date, datetime, timezone
+    from decimal import Decimal
+
+    @dataclasses.dataclass
+    class Point:
+        lat: float
+        lng: float
+
+    class Status(enum.Enum):
+        OPEN = "open"
+
+    value = {
+        "at": datetime(2026, 3, 1, 8, 30, tzinfo=timezone.utc),
+        "on": date(2026, 3, 1),
+        "id": uuid.UUID(int=1),
+        "point": Point(6.9, 79.8),
+        "status": Status.OPEN,
+        "amount": Decimal("1.50"),
+        "text": "කොළඹ",
+        "issue": civiclens.Issue.from_api(civiclens.MOCK_ISSUES[0]),
+        "byDistrict": {1: "Colombo"},
+    }
+    provider = civiclens.app.json
+    fast = provider.dumps_bytes(value)
+    monkeypatch.setattr(civiclens, "orjson", None)
+    assert provider.dumps_bytes(value) == fast
@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import app as civiclens
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_factory_runs_once_across_threads():
+    calls = []
+
+    def build():
+        calls.append(1)
+        time.sleep(0.01)
+        return object()
+
+    lazy = civiclens.Lazy(build)
+    values = []
+    threads = [threading.Thread(target=lambda: values.append(lazy.get())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert len({id(v) for v in values}) == 1
+
+
+def test_import_leaves_sdks_and_demo_data_unloaded():
+    code = (
+        "import sys, app\n"
+        "print(any(m.split('.')[0] in ('supabase', 'google') for m in sys.modules),"
+        " app.DEMO_STORE.loaded, app.SUPABASE_CLIENT.loaded, app.GENAI.loaded)"
+    )
+    env = dict(os.environ, SUPABASE_URL="https://example.invalid", SUPABASE_SERVICE_ROLE_KEY="x", GEMINI_API_KEY="x")
+    out = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True)
+    assert out.stdout.split() == ["False", "False", "False", "False"]
@@ -0,0 +1,45 @@
+import re
+
+import app as civiclens
+
+
+def sample(text, series):
+    match = re.search(rf"^{re.escape(series)} (\S+)$", text, re.M)
+    return float(match.group(1)) if match else 0.0
+
+
+def test_requests_are_counted_per_route_template(client, repo):
+    issue_id = repo.list_issues()[0].id
+    series = 'http_requests_total{method="GET",route="/api/issues/<issue_id>",status="200"}'
+    before = sample(client.get("/api/metrics").get_data(as_text=True), series)
+    client.get(f"/api/issues/{issue_id}")
+    client.get(f"/api/issues/{issue_id}")
+    text = client.get("/api/metrics").get_data(as_text=True)
+    assert sample(text, series) == before + 2
+    assert "# TYPE http_request_duration_seconds histogram" in text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/api/issues/<issue_id>",le="+Inf"}' in text
+
+
+def test_histogram_buckets_are_cumulative():
+    metrics = civiclens.Metrics()
+    metrics.describe("wait_seconds", "histogram", "Test waits.")
+    for value in (0.002, 0.002, 0.3, 20.0):
+        metrics.observe("wait_seconds", value)
+    text = metrics.render()
+    assert "# HELP wait_seconds Test waits." in text
+    assert sample(text, 'wait_seconds_bucket{le="0.005"}') == 2
+    assert sample(text, 'wait_seconds_bucket{le="0.5"}') == 3
+    assert sample(text, 'wait_seconds_bucket{le="+Inf"}') == 4
+    assert sample(text, "wait_seconds_count") == 4
+    assert abs(sample(text, "wait_seconds_sum") - 20.304) < 1e-6
+
+
+def test_gauges_are_read_at_scrape_time():
+    metrics = civiclens.Metrics()
+    size = [1]
+    metrics.gauge("queue_size", lambda: size[0])
+    metrics.gauge("broken", lambda: 1 / 0)
+    size[0] = 7
+    text = metrics.render()
+    assert sample(text, "queue_size") == 7
+    assert "broken" not in text
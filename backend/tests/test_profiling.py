@@ -0,0 +1,27 @@
+import pytest
+
+import app as civiclens
+
+
+@pytest.fixture
+def memory_client(memory_repo, monkeypatch):
+    monkeypatch.setattr(civiclens, "get_repository", lambda: memory_repo)
+    monkeypatch.setattr(civiclens, "PROFILES", civiclens.deque(maxlen=10))
+    return civiclens.app.test_client()
+
+
+def test_profiling_is_closed_without_a_token(memory_client, monkeypatch):
+    monkeypatch.setattr(civiclens, "PROFILE_TOKEN", "")
+    monkeypatch.setattr(civiclens, "ADMIN_TOKEN", "")
+    response = memory_client.get("/api/stats", headers={"X-Profile": "anything"})
+    assert "X-Profile-Id" not in response.headers
+    assert memory_client.get("/api/admin/profiles", headers={"X-Profile": "anything"}).status_code == 403
+
+
+def test_profiled_trace_drops_the_query_string(memory_client):
+    response = memory_client.get("/api/contacts?lat=6.05&lng=80.22", headers={"X-Profile": "test-profile"})
+    profile_id = response.headers["X-Profile-Id"]
+    assert memory_client.get("/api/admin/profiles").status_code == 403
+    entry = memory_client.get(f"/api/admin/profiles/{profile_id}", headers={"X-Admin-Token": "test-admin"}).get_json()
+    assert entry["path"] == "/api/contacts"
+    assert entry["profile"]
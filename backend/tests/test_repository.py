@@ -0,0 +1,190 @@
+"""The IssueRepository contract, run against the memory and SQLite backends."""
+
+import pytest
+
+import app as civiclens
+
+
+def new_issue(issue_id="CL-2026-9001", **fields):
+    data = {
+        "id": issue_id,
+        "title": "Broken drain",
+        "description": "Overflowing after rain",
+        "category": "drainage",
+        "severity": "high",
+        "location": "Galle Road",
+        "coordinates": {"lat": 6.05, "lng": 80.22},
+        "upvotes": 0,
+        "commentCount": 0,
+        "createdAt": civiclens.now_iso(),
+        "district": "Galle",
+    }
+    data.update(fields)
+    return civiclens.Issue.from_api(data)
+
+
+def test_create_get_and_list(repo):
+    repo.insert_issue(new_issue())
+    issue = repo.get_issue("CL-2026-9001")
+    assert issue.title == "Broken drain"
+    assert issue.district == "Galle"
+    assert repo.get_issue("CL-0000-0000") is None
+    assert "CL-2026-9001" in [i.id for i in repo.list_issues(category="drainage")]
+    assert "CL-2026-9001" not in [i.id for i in repo.list_issues(status="resolved")]
+    assert repo.list_issues(sort_by="recent", limit=1)[0].id == "CL-2026-9001"
+
+
+def test_list_orders_and_limits(repo):
+    upvotes = [i.upvotes for i in repo.list_issues()]
+    assert upvotes == sorted(upvotes, reverse=True)
+    assert len(repo.list_issues(limit=3)) == 3
+
+
+def test_upvote_counts_each_session_once(repo):
+    issue_id = repo.list_issues()[0].id
+    before = repo.get_issue(issue_id).upvotes
+    first = repo.upvote(issue_id, "session-a")
+    again = repo.upvote(issue_id, "session-a")
+    assert (first["duplicate"], again["duplicate"]) == (False, True)
+    assert first["upvotes"] == again["upvotes"] == before + 1
+    assert repo.upvote("CL-0000-0000", "session-a") is None
+    assert repo.vote_state(issue_id, "session-a")["upvoted"] is True
+    assert repo.vote_state(issue_id, "session-b")["upvoted"] is False
+
+
+def test_resolve_vote_counts_each_session_once(repo):
+    issue_id = repo.list_issues()[0].id
+    yes, no = repo.resolve_counts(issue_id)
+    first = repo.resolve_vote(issue_id, "session-a", "no")
+    again = repo.resolve_vote(issue_id, "session-a", "yes")
+    assert again["duplicate"] is True
+    assert repo.resolve_counts(issue_id) == (yes, no + 1)
+    assert first["duplicate"] is False
+    assert repo.vote_state(issue_id, "session-a")["resolveVote"] == "no"
+    assert repo.resolve_vote("CL-0000-0000", "session-a", "yes") is None
+
+
+def test_comments(repo):
+    issue_id = repo.list_issues()[0].id
+    before = repo.get_issue(issue_id).comment_count
+    comment = {"id": "c-test", "issueId": issue_id, "text": "Seen it too", "createdAt": civiclens.now_iso()}
+    assert repo.add_comment(comment, "session-a")["id"] == "c-test"
+    assert repo.get_issue(issue_id).comment_count == before + 1
+    assert repo.list_comments(issue_id, limit=1)[0]["id"] == "c-test"
+    missing = dict(comment, id="c-missing", issueId="CL-0000-0000")
+    assert repo.add_comment(missing, "session-a") is None
+    assert repo.list_comments("CL-0000-0000") == []
+
+
+def test_issue_detail(repo):
+    issue_id = repo.list_issues()[0].id
+    repo.upvote(issue_id, "viewer")
+    detail = repo.issue_detail(issue_id, "viewer", 1)
+    assert detail["issue"].id == issue_id
+    assert len(detail["comments"]) <= 1
+    assert detail["viewer"] == {"upvoted": True, "resolveVote": None}
+    assert repo.issue_detail("CL-0000-0000", "viewer", 1) is None
+
+
+def test_backends_agree(memory_repo, sqlite_repo):
+    for repo in (memory_repo, sqlite_repo):
+        repo.insert_issue(new_issue())
+        repo.upvote("CL-2026-9001", "session-a")
+        repo.add_comment({"id": "c-x", "issueId": "CL-2026-9001", "text": "x", "createdAt": civiclens.now_iso()}, "s")
+
+    def snapshot(repo):
+        return (
+            sorted((i.id, i.upvotes, i.comment_count, i.status) for i in repo.list_issues()),
+            [i.upvotes for i in repo.list_issues()],
+            repo.stats(),
+            sorted(c["id"] for c in repo.list_comments("CL-2026-9001")),
+        )
+
+    assert snapshot(memory_repo) == snapshot(sqlite_repo)
+
+
+@pytest.mark.parametrize("sort_by", civiclens.FEED_SORTS)
+def test_every_feed_sort_is_served(repo, sort_by):
+    assert len(repo.list_issues(sort_by=sort_by)) == len(repo.list_issues())
+
+
+def test_create_issue_retries_a_taken_id(repo, monkeypatch):
+    draws = iter([1, 1, 2])
+    monkeypatch.setattr(civiclens.random, "randint", lambda a, b: next(draws))
+    first = repo.create_issue(new_issue(None))
+    second = repo.create_issue(new_issue(None, title="Fallen tree"))
+    year = civiclens.datetime.now(civiclens.timezone.utc).year
+    assert (first.id, second.id) == (f"CL-{year}-0001", f"CL-{year}-0002")
+    assert repo.get_issue(first.id).title == "Broken drain"
+    with pytest.raises(civiclens.IssueIdTaken):
+        repo.insert_issue(new_issue(first.id))
+
+
+def test_reports_never_take_over_an_existing_issue(client, monkeypatch):
+    draws = iter([42, 42, 43])
+    monkeypatch.setattr(civiclens.random, "randint", lambda a, b: next(draws))
+    report = {"title": "Pothole", "description": "Deep", "category": "roads"}
+    first = client.post("/api/issues", data=report).get_json()
+    client.post(f"/api/issues/{first['id']}/comments", json={"text": "Still there"})
+    second = client.post("/api/issues", data={**report, "title": "Streetlight"}).get_json()
+
+    assert first["id"] != second["id"]
+    assert client.get(f"/api/issues/{first['id']}").get_json()["title"] == "Pothole"
+    assert len(client.get(f"/api/issues/{first['id']}/comments").get_json()) == 1
+    assert client.get(f"/api/issues/{second['id']}/comments").get_json() == []
+
+
+def test_backend_missing_a_method_fails_to_build():
+    methods = {name: lambda self, *args, **kwargs: None for name in civiclens.IssueRepository.__abstractmethods__}
+    complete = type("Complete", (civiclens.IssueRepository,), methods)
+    del methods["changes_since"]
+    incomplete = type("Incomplete", (civiclens.IssueRepository,), methods)
+
+    complete()
+    with pytest.raises(TypeError, match="changes_since"):
+        incomplete()
+
+
+def test_demo_stats_counters_match_a_full_recount(memory_repo):
+    def recount():
+        return civiclens.build_stats([(i.status, i.category, i.resolved_at) for i in memory_repo.list_issues()])
+
+    assert memory_repo.stats() == recount()
+    memory_repo.create_issue(new_issue(None, category="garbage"))
+    memory_repo.create_issue(new_issue(None, category="garbage"))
+    assert memory_repo.stats() == recount()
+    # Bulk import replaces an issue in place; its old status and category must be un-counted.
+    row = memory_repo.list_issues(status="open")[0].to_row()
+    row.update(status="resolved", category="drainage", resolved_at=civiclens.now_iso(), resolved_by="official")
+    memory_repo.import_rows("issues", [row])
+    assert memory_repo.stats() == recount()
+
+
+@pytest.mark.parametrize("status", [None, "open", "resolved"])
+@pytest.mark.parametrize("category", [None, "potholes"])
+def test_demo_feed_index_matches_a_full_sort(memory_repo, status, category):
+    issue_ids = [i.id for i in memory_repo.list_issues()]
+    for n, issue_id in enumerate(issue_ids[::2]):
+        for voter in range(n):
+            memory_repo.upvote(issue_id, f"voter-{voter}")
+    everything = [
+        i for i in memory_repo.list_issues() if (status is None or i.status == status) and (category is None or i.category == category)
+    ]
+    keys = {
+        "upvotes": lambda i: i.upvotes,
+        "recent": lambda i: civiclens.parse_iso(i.created_at),
+        "trending": lambda i: civiclens.issue_trending_score(i.upvotes, i.comment_count, i.severity_score, i.created_at),
+    }
+    for sort_by, key in keys.items():
+        feed = memory_repo.list_issues(status=status, category=category, sort_by=sort_by, limit=5)
+        assert [key(i) for i in feed] == sorted((key(i) for i in everything), reverse=True)[:5]
+
+
+def test_issue_records_round_trip_through_api_and_row_shapes():
+    for data in civiclens.MOCK_ISSUES + civiclens.MOCK_RESOLVED_ISSUES:
+        issue = civiclens.Issue.from_api(data)
+        assert civiclens.Issue.from_row(issue.to_row()).to_dict() == issue.to_dict()
+        copy = issue.copy()
+        copy.upvotes += 1
+        assert copy.to_dict()["upvotes"] == issue.to_dict()["upvotes"] + 1
+    assert not hasattr(issue, "__dict__")
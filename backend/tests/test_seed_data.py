@@ -0,0 +1,18 @@
+import seed_data
+
+import app as civiclens
+
+
+def test_reseeding_sqlite_keeps_existing_comments(tmp_path):
+    path = str(tmp_path / "seed.db")
+    assert seed_data.write_sqlite(path, seed_data.generate(20, seed=7)) == 20
+    repo = civiclens.SqliteIssueRepository(path)
+    issue_id = repo.list_issues(limit=1)[0].id
+    comment = {"id": "c-extra", "issueId": issue_id, "text": "still here", "createdAt": civiclens.now_iso()}
+    assert repo.add_comment(comment, "session") is not None
+    before = {c["id"] for c in repo.list_comments(issue_id)}
+
+    seed_data.write_sqlite(path, seed_data.generate(20, seed=7))
+
+    assert {c["id"] for c in repo.list_comments(issue_id)} == before
+    assert repo.connection().execute("select count(*) from issues").fetchone()[0] == 20
@@ -0,0 +1,53 @@
+"""Demo state shared by worker processes through SHARED_STATE_PATH."""
+
+import os
+import subprocess
+import sys
+
+import app as civiclens
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def in_other_worker(path, code):
+    """Run ``code`` in a separate process with ``state`` open on ``path``, as another gunicorn worker would."""
+    script = f"import app\nstate = app.SharedState({path!r})\n{code}"
+    subprocess.run([sys.executable, "-c", script], cwd=BACKEND_DIR, check=True, capture_output=True, text=True)
+
+
+def test_workers_seed_once_and_see_each_others_votes(tmp_path):
+    path = str(tmp_path / "shared.db")
+    civiclens.SharedState(path)
+    first = civiclens.SharedDemoRepository(path)
+    second = civiclens.SharedDemoRepository(path)
+    assert len(second.list_issues()) == len(civiclens.MOCK_ISSUES) + len(civiclens.MOCK_RESOLVED_ISSUES)
+    issue_id = first.list_issues()[0].id
+    before = second.get_issue(issue_id).upvotes
+    first.upvote(issue_id, "session-a")
+    assert second.get_issue(issue_id).upvotes == before + 1
+
+
+def test_demo_mode_switch_reaches_every_worker(tmp_path):
+    path = str(tmp_path / "shared.db")
+    state = civiclens.SharedState(path)
+    assert state.setting("demo_mode_override") is None
+    in_other_worker(path, "state.set_setting('demo_mode_override', False)")
+    assert state.setting("demo_mode_override") is False
+
+
+def test_events_from_other_workers_are_relayed_and_replayable(tmp_path):
+    path = str(tmp_path / "shared.db")
+    state = civiclens.Lazy(lambda: civiclens.SharedState(path))
+    broker = civiclens.SharedEventBroker(state)
+    sub = broker.subscribe()
+    try:
+        in_other_worker(
+            path,
+            "broker = app.SharedEventBroker(app.Lazy(lambda: state))\n"
+            "broker.publish('issue.upvoted', 'CL-2024-001', {'upvotes': 5})",
+        )
+        event = sub.queue.get(timeout=5)
+        assert (event["type"], event["issueId"], event["data"]) == ("issue.upvoted", "CL-2024-001", {"upvotes": 5})
+        assert broker.replay(sub, event["id"] - 1) == [event]
+    finally:
+        broker.unsubscribe(sub)
@@ -0,0 +1,32 @@
+import pytest
+
+import app as civiclens
+
+HALF_LIFE = civiclens.TRENDING_HALF_LIFE_HOURS * 3600
+
+
+def test_an_issue_half_a_life_older_needs_twice_the_weight():
+    now = 1_800_000_000.0
+    # weight = 1 + upvotes, so 3 upvotes weigh 4 and 7 upvotes weigh 8.
+    fresh = civiclens.trending_score(3, 0, 0, now)
+    older = civiclens.trending_score(7, 0, 0, now - HALF_LIFE)
+    assert older == pytest.approx(fresh)
+    assert civiclens.trending_score(3, 0, 0, now + 1) > fresh
+    assert civiclens.trending_score(0, 2, 0, now) == civiclens.trending_score(2 * civiclens.TRENDING_COMMENT_WEIGHT, 0, 0, now)
+
+
+def test_backends_rank_trending_alike(memory_repo, sqlite_repo):
+    for repo in (memory_repo, sqlite_repo):
+        repo.upvote(repo.list_issues(sort_by="trending")[-1].id, "session-a")
+    ranked = [[i.id for i in repo.list_issues(sort_by="trending")] for repo in (memory_repo, sqlite_repo)]
+    assert ranked[0] == ranked[1]
+
+
+def test_votes_move_an_issue_up_the_trending_feed(client, repo):
+    report = {"title": "Pothole", "description": "Deep"}
+    first = client.post("/api/issues", data=report).get_json()["id"]
+    second = client.post("/api/issues", data=report).get_json()["id"]
+    assert [i.id for i in repo.list_issues(sort_by="trending", limit=2)] == [second, first]
+    for n in range(3):
+        repo.upvote(first, f"session-{n}")
+    assert [i.id for i in repo.list_issues(sort_by="trending", limit=2)] == [first, second]